@@ -0,0 +1,8 @@
+"""
+Micro-benchmarks of the UI's hot paths: ApiClient overhead (pooled vs unpooled), JSON decoding,
+QC frame build/filter/sort/export, admin table filters, multipart packing, mock backend lookups.
+
+    python -m benchmarks                  # run, compare with the stored baseline
+    python -m benchmarks --save           # run and store the results as the new baseline
+    python -m benchmarks -k qc/ --quick   # only matching cases, without the 1M-row sizes
+"""
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Optional
+
+from benchmarks import bench_admin, bench_http, bench_mock, bench_qc  # noqa: F401  (register cases)
+from benchmarks.harness import CASES, compare, environment, load_baseline, run_cases, save_baseline
+
+DEFAULT_BASELINE = ".cache/benchmarks/baseline.json"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m benchmarks", description="Micro-benchmarks with baseline comparison")
+    p.add_argument("-k", dest="select", help="only cases whose name contains this")
+    p.add_argument("--quick", action="store_true", help="skip the 1M-row sizes")
+    p.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON (per machine, not committed)")
+    p.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    p.add_argument("--tolerance", type=float, default=0.25, help="slower by more than this = regression")
+    p.add_argument("--out", help="also write the results of this run as JSON")
+    p.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = p.parse_args(argv)
+
+    if args.list:
+        for case in CASES:
+            for param in case.params:
+                print(case.key(param))
+        return 0
+
+    results = run_cases(CASES, select=args.select, max_param=100_000 if args.quick else None)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+
+    baseline = load_baseline(args.baseline)
+    regressions: list[str] = []
+    if baseline is not None:
+        lines, regressions = compare(baseline, results, args.tolerance)
+        print()
+        print("\n".join(lines))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+
+    if args.save or baseline is None:
+        save_baseline(args.baseline, results, merge_into=baseline)
+        print(f"\nBaseline {'updated' if baseline is not None else 'stored'}: {args.baseline}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from benchmarks.harness import ROWS, benchmark
+from core.admin_filters import apply_filters, make_select_labels
+from core.mock_data import SyntheticConfig, iter_requests
+
+# key candidates as used by pages/30_admin_panel.py for the requests table
+_ID_KEYS = ["id", "request_id"]
+_TITLE_KEYS = ["title", "request_title"]
+
+
+def _rows(n: int) -> list[dict[str, Any]]:
+    return list(iter_requests(SyntheticConfig(requests=n)))
+
+
+@benchmark("admin/apply_filters", params=ROWS)
+def filters(n: int) -> Callable[[], Any]:
+    rows = _rows(n)
+    return lambda: apply_filters(rows, "winter", ["new", "qc"], _ID_KEYS, _TITLE_KEYS)
+
+
+@benchmark("admin/make_select_labels", params=ROWS)
+def select_labels(n: int) -> Callable[[], Any]:
+    rows = _rows(n)
+    return lambda: make_select_labels(rows, _ID_KEYS, _TITLE_KEYS)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+import httpx
+
+from benchmarks.harness import benchmark
+from core.api_client import ApiClient
+from core.mock_data import SyntheticConfig, iter_tasks
+
+_BASE = "http://bench.local"
+_server = None
+
+
+def _transport(handler: Callable[[httpx.Request], httpx.Response]) -> httpx.Client:
+    # no sockets: only the client side (request building, decoding) is measured
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def _stand_in() -> Any:
+    """Local stand-in backend (core/mock_server.py), started once per run."""
+    global _server
+    if _server is None:
+        from core.mock_server import Faults, MockServer
+
+        _server = MockServer(("127.0.0.1", 0), faults=Faults(latency_ms=0, jitter_ms=0, error_rate=0)).start()
+    return _server
+
+
+def _tasks_json(n: int) -> bytes:
+    return json.dumps(list(iter_tasks(SyntheticConfig(requests=max(n // 10, 1), tasks=n)))).encode("utf-8")
+
+
+@benchmark("http/request_overhead")
+def request_overhead(_: Any) -> Callable[[], Any]:
+    body = _tasks_json(1)
+    c = ApiClient(_BASE, token="t", http=_transport(lambda r: httpx.Response(200, content=body, headers={"content-type": "application/json"})))
+    return c.list_tasks
+
+
+def _progress_call(pooled: bool) -> Callable[[], Any]:
+    server = _stand_in()
+    token = ApiClient(server.url).login("labeler1", "pass")["access_token"]
+    if pooled:
+        c = ApiClient(server.url, token=token)
+        return lambda: c.task_progress("task-5001")
+
+    def op() -> Any:
+        # what every call did before core/http_pool.py: own client, new TCP connection
+        with httpx.Client() as http:
+            return ApiClient(server.url, token=token, http=http).task_progress("task-5001")
+
+    return op
+
+
+@benchmark("http/stand_in_roundtrip", params=("pooled", "unpooled"))
+def stand_in_roundtrip(mode: str) -> Callable[[], Any]:
+    return _progress_call(mode == "pooled")
+
+
+@benchmark("http/json_decode_list", params=(10_000, 100_000))
+def json_decode_list(n: int) -> Callable[[], Any]:
+    body = _tasks_json(n)
+    c = ApiClient(_BASE)
+
+    def op() -> Any:
+        return c._decode(httpx.Response(200, content=body, headers={"content-type": "application/json"}))
+
+    return op
+
+
+@benchmark("http/multipart_pack", params=(10, 100))
+def multipart_pack(files: int) -> Callable[[], Any]:
+    # upload_files_mvp: multipart body of `files` x 256 KB built and consumed by the transport
+    payload = bytes(range(256)) * 1024
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        return httpx.Response(200, json={"uploaded": files, "skipped": 0, "errors": []})
+
+    c = ApiClient(_BASE, token="t", http=_transport(handler))
+    packed = [(f"img_{i:04d}.jpg", payload, "image/jpeg") for i in range(files)]
+    return lambda: c.upload_files_mvp("req-1001", packed)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from itertools import cycle
+from typing import Any, Callable
+
+from benchmarks.harness import benchmark
+from core import mock_backend
+from core.mock_data import SyntheticConfig, iter_requests, iter_tasks, task_id
+from core.mock_store import MockStore
+
+_TASKS = (10_000, 100_000)
+
+
+def _store(n: int) -> MockStore:
+    cfg = SyntheticConfig(requests=max(n // 10, 1), tasks=n)
+    store = MockStore()
+    for req in iter_requests(cfg):
+        store.add_request(req)
+    for task in iter_tasks(cfg):
+        store.add_task(task)
+    return store
+
+
+@benchmark("mock/store_get_task", params=_TASKS)
+def store_get_task(n: int) -> Callable[[], Any]:
+    store = _store(n)
+    ids = cycle([task_id(i) for i in range(0, n, max(n // 1000, 1))])
+    return lambda: store.get_task(next(ids))
+
+
+@benchmark("mock/store_tasks_by_assignee", params=_TASKS)
+def store_tasks_by_assignee(n: int) -> Callable[[], Any]:
+    store = _store(n)
+    return lambda: store.list_tasks(assignee="labeler1")
+
+
+@benchmark("mock/store_tasks_by_request", params=_TASKS)
+def store_tasks_by_request(n: int) -> Callable[[], Any]:
+    store = _store(n)
+    return lambda: store.list_tasks(request_id="req-1001")
+
+
+@benchmark("mock/store_update_task", params=_TASKS)
+def store_update_task(n: int) -> Callable[[], Any]:
+    store = _store(n)
+    statuses = cycle(["assigned", "done"])
+    return lambda: store.update_task("task-5001", status=next(statuses))
+
+
+# mock backend entry points as the pages call them (data set size from MOCK_* settings)
+@benchmark("mock/list_tasks")
+def list_tasks(_: Any) -> Callable[[], Any]:
+    return mock_backend.mock_list_tasks
+
+
+@benchmark("mock/get_task")
+def get_task(_: Any) -> Callable[[], Any]:
+    return lambda: mock_backend.mock_get_task("task-5001")
+
+
+@benchmark("mock/task_progress")
+def task_progress(_: Any) -> Callable[[], Any]:
+    return lambda: mock_backend.mock_task_progress("task-5001")
+
+
+@benchmark("mock/save_labels_batch")
+def save_labels_batch(_: Any) -> Callable[[], Any]:
+    items = [{"image_id": f"task-5001_img_{i:03d}", "labels": ["pothole"]} for i in range(1, 11)]
+    return lambda: mock_backend.mock_save_labels_batch("task-5001", items)
+
+
+@benchmark("mock/qc_results_page")
+def qc_results_page(_: Any) -> Callable[[], Any]:
+    return lambda: mock_backend.mock_qc_results("req-1001")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import pandas as pd
+
+from benchmarks.harness import ROWS, benchmark, needs_pyarrow
+from core.mock_data import SyntheticConfig, synthetic_qc_frame
+from core.qc import QcQuery, query_qc_rows
+from core.qc_columnar import arrow_to_frame, filter_qc_frame, query_qc_frame, rows_to_arrow, summarize_qc_frame
+from core.qc_export import frame_chunks, spooled_file, write_export
+
+# what the QC review page (pages/12_customer_qc_review.py) does with a loaded result set
+_PAGE = QcQuery(limit=200)
+_FLAGGED = QcQuery(dup_thr=0.5, ai_thr=0.5, only_flagged=True)
+
+
+def _frame(n: int) -> pd.DataFrame:
+    return synthetic_qc_frame(SyntheticConfig(qc_rows=n), "req-bench")
+
+
+@benchmark("qc/build_frame", params=ROWS)
+def build_frame(n: int) -> Callable[[], Any]:
+    return lambda: _frame(n)
+
+
+@benchmark("qc/arrow_decode", params=ROWS, skip=needs_pyarrow)
+def arrow_decode(n: int) -> Callable[[], Any]:
+    data = rows_to_arrow(_frame(n), "1")
+    return lambda: arrow_to_frame(data)
+
+
+@benchmark("qc/summary", params=ROWS)
+def summary(n: int) -> Callable[[], Any]:
+    df = _frame(n)
+    return lambda: summarize_qc_frame(df, _FLAGGED.dup_thr, _FLAGGED.ai_thr)
+
+
+@benchmark("qc/query_page", params=ROWS)
+def query_page(n: int) -> Callable[[], Any]:
+    df = _frame(n)
+    return lambda: query_qc_frame(df, _PAGE)
+
+
+@benchmark("qc/filter_sort", params=ROWS)
+def filter_sort(n: int) -> Callable[[], Any]:
+    df = _frame(n)
+    return lambda: filter_qc_frame(df, _FLAGGED)
+
+
+@benchmark("qc/query_rows_list", params=ROWS[:2])
+def query_rows_list(n: int) -> Callable[[], Any]:
+    # list-of-dicts path (legacy backends returning a plain list)
+    rows = _frame(n).to_dict("records")
+    return lambda: query_qc_rows(rows, _PAGE)
+
+
+def _export(fmt: str, n: int) -> Callable[[], Any]:
+    filtered = filter_qc_frame(_frame(n), QcQuery())
+
+    def op() -> int:
+        with spooled_file() as f:
+            return write_export(frame_chunks(filtered), fmt, f)
+
+    return op
+
+
+@benchmark("qc/export_csv", params=ROWS)
+def export_csv(n: int) -> Callable[[], Any]:
+    return _export("csv", n)
+
+
+@benchmark("qc/export_csv_gz", params=ROWS)
+def export_csv_gz(n: int) -> Callable[[], Any]:
+    return _export("csv.gz", n)
+
+
+@benchmark("qc/export_parquet", params=ROWS, skip=needs_pyarrow)
+def export_parquet(n: int) -> Callable[[], Any]:
+    return _export("parquet", n)
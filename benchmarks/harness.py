@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+# factory(param) does the setup (not timed) and returns the operation to time
+Factory = Callable[[Any], Callable[[], Any]]
+
+# row counts of the data-size parametrized cases
+ROWS = (10_000, 100_000, 1_000_000)
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    factory: Factory
+    params: tuple[Any, ...] = (None,)
+    # skipped when it returns a reason (e.g. optional dependency missing)
+    skip: Optional[Callable[[], Optional[str]]] = None
+
+    def key(self, param: Any) -> str:
+        return self.name if param is None else f"{self.name}[{_fmt_param(param)}]"
+
+
+CASES: list[Case] = []
+
+
+def benchmark(
+    name: str, params: Sequence[Any] = (None,), skip: Optional[Callable[[], Optional[str]]] = None
+) -> Callable[[Factory], Factory]:
+    def register(factory: Factory) -> Factory:
+        CASES.append(Case(name, factory, tuple(params), skip))
+        return factory
+
+    return register
+
+
+def _fmt_param(param: Any) -> str:
+    if isinstance(param, int) and param >= 1000 and param % 1000 == 0:
+        return f"{param // 1_000_000}M" if param % 1_000_000 == 0 else f"{param // 1000}k"
+    return str(param)
+
+
+def measure(op: Callable[[], Any], *, min_time_s: float = 0.2, repeat: int = 5, budget_s: float = 10.0) -> dict[str, Any]:
+    """
+    timeit-style: calls per round are raised until one round takes `min_time_s`, then up to `repeat`
+    rounds (at least 3, fewer if over `budget_s`). Times are per call; the median is compared.
+    """
+    number = 1
+    while True:
+        t = _round(op, number)
+        if t >= min_time_s or number >= 1_000_000:
+            break
+        number *= 10 if t < min_time_s / 10 else 2
+    times = [t / number]
+    started = time.perf_counter()
+    while len(times) < repeat and (len(times) < 3 or time.perf_counter() - started < budget_s):
+        times.append(_round(op, number) / number)
+    times.sort()
+    return {
+        "median_s": times[len(times) // 2],
+        "min_s": times[0],
+        "max_s": times[-1],
+        "number": number,
+        "rounds": len(times),
+    }
+
+
+def _round(op: Callable[[], Any], number: int) -> float:
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            op()
+        return time.perf_counter() - t0
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def run_cases(
+    cases: Iterable[Case], *, select: Optional[str] = None, max_param: Optional[int] = None, log: Callable[[str], None] = print
+) -> dict[str, dict[str, Any]]:
+    results: dict[str, dict[str, Any]] = {}
+    for case in cases:
+        reason = case.skip() if case.skip else None
+        for param in case.params:
+            key = case.key(param)
+            if select and select not in key:
+                continue
+            if max_param is not None and isinstance(param, int) and param > max_param:
+                continue
+            if reason:
+                log(f"{key:<48} skipped: {reason}")
+                continue
+            op = case.factory(param)
+            results[key] = measure(op)
+            log(f"{key:<48} {format_time(results[key]['median_s']):>12}")
+            # setup data of big cases (1M-row frames) is not kept for the next one
+            del op
+            gc.collect()
+    return results
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def environment() -> dict[str, Any]:
+    import httpx
+    import numpy
+    import pandas
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "httpx": httpx.__version__,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def load_baseline(path: str) -> Optional[dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: dict[str, dict[str, Any]], merge_into: Optional[dict[str, Any]] = None) -> None:
+    """Writes results as the new baseline; cases not run this time keep their old numbers."""
+    old = (merge_into or {}).get("results", {})
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": {**old, **results}}, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def compare(baseline: dict[str, Any], results: dict[str, dict[str, Any]], tolerance: float) -> tuple[list[str], list[str]]:
+    """(table lines, regressions): median time per call vs the baseline, slower by more than `tolerance` = regression."""
+    old = baseline.get("results", {})
+    lines = [f"{'benchmark':<48}{'baseline':>12}{'now':>12}{'ratio':>8}"]
+    regressions = []
+    for key, new in results.items():
+        prev = old.get(key)
+        if prev is None:
+            lines.append(f"{key:<48}{'—':>12}{format_time(new['median_s']):>12}{'new':>8}")
+            continue
+        ratio = new["median_s"] / prev["median_s"] if prev["median_s"] > 0 else float("inf")
+        mark = ""
+        if ratio > 1 + tolerance:
+            mark = "  SLOWER"
+            regressions.append(f"{key}: {format_time(prev['median_s'])} -> {format_time(new['median_s'])} (x{ratio:.2f})")
+        elif ratio < 1 / (1 + tolerance):
+            mark = "  faster"
+        lines.append(f"{key:<48}{format_time(prev['median_s']):>12}{format_time(new['median_s']):>12}{ratio:>8.2f}{mark}")
+    return lines, regressions
+
+
+def needs_pyarrow() -> Optional[str]:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "pyarrow not installed"
+    return None
+
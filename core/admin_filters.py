@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+# Search / status filtering and selectbox labels of the admin panel tables
+# (plain functions, no Streamlit: also used by benchmarks).
+
+
+def apply_filters(rows: list[dict], search: str, status_filter: list[str], id_key_candidates: list[str], title_key_candidates: list[str]) -> list[dict]:
+    s = (search or "").strip().lower()
+
+    def get_first(d: dict, keys: list[str]) -> str:
+        for k in keys:
+            v = d.get(k)
+            if v is not None and str(v).strip():
+                return str(v)
+        return ""
+
+    out = rows
+
+    if status_filter:
+        out = [r for r in out if str(r.get("status", "")).strip() in status_filter]
+
+    if s:
+        filtered = []
+        for r in out:
+            rid = get_first(r, id_key_candidates)
+            title = get_first(r, title_key_candidates)
+            blob = f"{rid} {title} {str(r.get('status',''))}".lower()
+            if s in blob:
+                filtered.append(r)
+        out = filtered
+
+    return out
+
+
+def make_select_labels(rows: list[dict], id_keys: list[str], title_keys: list[str]) -> tuple[list[str], dict[str, str]]:
+    labels: list[str] = []
+    label_to_id: dict[str, str] = {}
+
+    for r in rows:
+        rid = ""
+        for k in id_keys:
+            rid = str(r.get(k, "")).strip()
+            if rid:
+                break
+        if not rid:
+            continue
+
+        title = ""
+        for k in title_keys:
+            title = str(r.get(k, "")).strip()
+            if title:
+                break
+
+        status = str(r.get("status", "")).strip()
+        meta = " | ".join([x for x in [title, status] if x])
+        label = f"{rid} — {meta}" if meta else rid
+
+        labels.append(label)
+        label_to_id[label] = rid
+
+    return labels, label_to_id
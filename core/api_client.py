@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import IO, Any, Awaitable, Optional, Union
 
 import httpx
 
+from core.http_pool import run_async, shared_async_client, shared_client
+from core.qc import ARROW_STREAM, QcQuery, query_qc_rows
+
+
+# file content for multipart uploads: bytes or a readable binary file object
+# (file objects are streamed by httpx in chunks instead of being loaded whole)
+UploadContent = Union[bytes, IO[bytes]]
+
 
 @dataclass
 class ApiError(Exception):
@@ -16,7 +25,18 @@ class ApiError(Exception):
         return f"{self.status_code}: {self.message}"
 
 
-class ApiClient:
+def _qc_page(data: Any, query: QcQuery) -> dict[str, Any]:
+    if isinstance(data, list):
+        # legacy backend: full list, query applied locally
+        return query_qc_rows(data, query)
+    if not isinstance(data, dict):
+        return {"items": [], "next_cursor": None, "total": 0}
+    return {"items": data.get("items") or [], "next_cursor": data.get("next_cursor"), "total": data.get("total")}
+
+
+class _ApiClientBase:
+    """URL/header building and response decoding shared by ApiClient and AsyncApiClient."""
+
     def __init__(self, base_url: str, token: Optional[str] = None, timeout_s: float = 20.0) -> None:
         self.base_url = (base_url or "").rstrip("/")
         self.token = token
@@ -52,35 +72,17 @@ class ApiClient:
 
         raise ApiError(status_code=resp.status_code, message=msg, payload=payload)
 
-    def _request(
-        self,
-        method: str,
-        path: str,
-        *,
-        params: dict[str, Any] | None = None,
-        json: Any | None = None,
-        data: dict[str, Any] | None = None,
-        files: Any | None = None,
-    ) -> Any:
+    def _check_configured(self) -> None:
         if not self.base_url:
             raise ApiError(status_code=0, message="BACKEND_URL is empty or not configured.")
 
-        timeout = httpx.Timeout(self.timeout_s, connect=10.0)
-        url = self._url(path)
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout_s, connect=10.0)
 
-        try:
-            with httpx.Client(timeout=timeout) as client:
-                resp = client.request(
-                    method=method.upper(),
-                    url=url,
-                    headers=self._headers(),
-                    params=params,
-                    json=json,
-                    data=data,
-                    files=files,
-                )
-        except httpx.RequestError as e:
-            raise ApiError(status_code=0, message=f"Network error: {e!s}") from e
+    def _decode(self, resp: httpx.Response) -> Any:
+        # conditional request (If-None-Match) and nothing changed
+        if resp.status_code == 304:
+            return None
 
         self._raise_for_status(resp)
 
@@ -88,6 +90,8 @@ class ApiClient:
             return None
 
         content_type = resp.headers.get("content-type", "")
+        if ARROW_STREAM in content_type:
+            return resp.content
         if "application/json" in content_type:
             try:
                 return resp.json()
@@ -96,6 +100,68 @@ class ApiClient:
 
         return resp.text
 
+
+class ApiClient(_ApiClientBase):
+    def __init__(
+        self,
+        base_url: str,
+        token: Optional[str] = None,
+        timeout_s: float = 20.0,
+        http: Optional[httpx.Client] = None,
+    ) -> None:
+        super().__init__(base_url, token=token, timeout_s=timeout_s)
+        # None = process-wide pooled client (see core/http_pool.py)
+        self._http = http
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json: Any | None = None,
+        data: dict[str, Any] | None = None,
+        files: Any | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Any:
+        self._check_configured()
+        client = self._http or shared_client()
+
+        try:
+            resp = client.request(
+                method=method.upper(),
+                url=self._url(path),
+                headers={**self._headers(), **(headers or {})},
+                params=params,
+                json=json,
+                data=data,
+                files=files,
+                timeout=self._timeout(),
+            )
+        except httpx.RequestError as e:
+            raise ApiError(status_code=0, message=f"Network error: {e!s}") from e
+
+        return self._decode(resp)
+
+    def _download(self, path: str, out: IO[bytes], *, params: dict[str, Any] | None = None) -> int:
+        """GET streamed into `out` chunk by chunk (body is never held in memory); returns bytes written."""
+        self._check_configured()
+        client = self._http or shared_client()
+        written = 0
+        try:
+            with client.stream(
+                "GET", self._url(path), headers={**self._headers(), "Accept": "*/*"}, params=params, timeout=self._timeout()
+            ) as resp:
+                if not 200 <= resp.status_code < 300:
+                    resp.read()
+                    self._raise_for_status(resp)
+                for chunk in resp.iter_bytes():
+                    out.write(chunk)
+                    written += len(chunk)
+        except httpx.RequestError as e:
+            raise ApiError(status_code=0, message=f"Network error: {e!s}") from e
+        return written
+
     # ---------- Auth ----------
     def login(self, username: str, password: str) -> dict[str, Any]:
         return self._request("POST", "/auth/login", json={"username": username, "password": password})
@@ -109,9 +175,11 @@ class ApiClient:
         return data if isinstance(data, list) else []
 
     # ---------- Uploads (MVP multipart) ----------
-    def upload_files_mvp(self, request_id: str, packed_files: list[tuple[str, bytes, str]]) -> dict[str, Any]:
-        multipart: list[tuple[str, tuple[str, bytes, str]]] = []
+    def upload_files_mvp(self, request_id: str, packed_files: list[tuple[str, UploadContent, str]]) -> dict[str, Any]:
+        multipart: list[tuple[str, tuple[str, UploadContent, str]]] = []
         for fname, content, mime in packed_files:
+            if hasattr(content, "seek"):
+                content.seek(0)
             multipart.append(("files", (fname, content, mime)))
         return self._request("POST", f"/requests/{request_id}/uploads", files=multipart)
 
@@ -127,12 +195,44 @@ class ApiClient:
         return self._request("POST", "/uploads/complete", json={"request_id": request_id, "uploaded": uploaded})
 
     # ---------- QC ----------
-    def run_qc(self, request_id: str) -> dict[str, Any]:
-        return self._request("POST", f"/requests/{request_id}/qc/run")
+    def run_qc(self, request_id: str, keys: Optional[list[str]] = None) -> dict[str, Any]:
+        """keys = incremental run: only these upload keys (added since the last run) are scored."""
+        payload = {"keys": keys} if keys is not None else None
+        return self._request("POST", f"/requests/{request_id}/qc/run", json=payload)
 
-    def qc_results(self, request_id: str) -> list[dict[str, Any]]:
-        data = self._request("GET", f"/requests/{request_id}/qc/results")
-        return data if isinstance(data, list) else []
+    def qc_job(self, request_id: str, job_id: str) -> dict[str, Any]:
+        data = self._request("GET", f"/requests/{request_id}/qc/jobs/{job_id}")
+        return data if isinstance(data, dict) else {}
+
+    def qc_results(self, request_id: str, query: Optional[QcQuery] = None) -> dict[str, Any]:
+        """One page: {"items", "next_cursor", "total"}."""
+        query = query or QcQuery()
+        data = self._request("GET", f"/requests/{request_id}/qc/results", params=query.params())
+        return _qc_page(data, query)
+
+    def qc_results_columnar(self, request_id: str, if_run: Optional[str] = None) -> Any:
+        """
+        Full QC result set as Arrow IPC stream bytes (negotiated via Accept).
+        None = QC run `if_run` is still the latest (304); anything else = backend has no columnar format.
+        """
+        headers = {"Accept": f"{ARROW_STREAM}, application/json;q=0.5"}
+        if if_run:
+            headers["If-None-Match"] = f'"{if_run}"'
+        data = self._request("GET", f"/requests/{request_id}/qc/results", params={"format": "arrow"}, headers=headers)
+        if data is None and if_run:
+            return None
+        return data
+
+    def qc_export(self, request_id: str, fmt: str, query: QcQuery, out: IO[bytes]) -> int:
+        """Full filtered result set (csv | csv.gz | parquet) streamed into `out`; cursor/limit are ignored."""
+        params = {k: v for k, v in query.params().items() if k not in ("cursor", "limit")}
+        return self._download(f"/requests/{request_id}/qc/export", out, params={**params, "format": fmt})
+
+    def qc_summary(self, request_id: str, dup_thr: float, ai_thr: float) -> dict[str, Any]:
+        data = self._request(
+            "GET", f"/requests/{request_id}/qc/summary", params={"dup_thr": dup_thr, "ai_thr": ai_thr}
+        )
+        return data if isinstance(data, dict) else {}
 
     # ---------- Labeler: tasks ----------
     def list_tasks(self) -> list[dict[str, Any]]:
@@ -145,9 +245,21 @@ class ApiClient:
 
     def save_labels(self, task_id: str, image_id: str, labels: list[str]) -> dict[str, Any]:
         return self._request("POST", f"/tasks/{task_id}/labels", json={"image_id": image_id, "labels": labels})
+
+    def save_labels_batch(
+        self, task_id: str, items: list[dict[str, Any]], client_id: Optional[str] = None
+    ) -> dict[str, Any]:
+        payload: dict[str, Any] = {"items": items}
+        if client_id:
+            payload["client_id"] = client_id
+        return self._request("POST", f"/tasks/{task_id}/labels:batch", json=payload)
     
-    def task_progress(self, task_id: str) -> dict[str, Any]:
-        data = self._request("GET", f"/tasks/{task_id}/progress")
+    def task_progress(self, task_id: str, if_version: Optional[int] = None) -> Optional[dict[str, Any]]:
+        """With if_version: None if progress has not changed since that version (304)."""
+        headers = {"If-None-Match": f'"{if_version}"'} if if_version is not None else None
+        data = self._request("GET", f"/tasks/{task_id}/progress", headers=headers)
+        if data is None and if_version is not None:
+            return None
         return data if isinstance(data, dict) else {}
 
     def complete_task(self, task_id: str) -> dict[str, Any]:
@@ -174,3 +286,213 @@ class ApiClient:
             "/admin/assign",
             json={"request_id": request_id, "labeler_username": labeler_username},
         )
+
+
+class AsyncApiClient(_ApiClientBase):
+    """
+    Async mirror of ApiClient (same methods, awaitable) on top of httpx.AsyncClient.
+    From Streamlit scripts use run_concurrently(...) to await several calls at once.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: Optional[str] = None,
+        timeout_s: float = 20.0,
+        http: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        super().__init__(base_url, token=token, timeout_s=timeout_s)
+        # None = pooled AsyncClient living on the background loop (see core/http_pool.py)
+        self._http = http
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json: Any | None = None,
+        data: dict[str, Any] | None = None,
+        files: Any | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Any:
+        self._check_configured()
+        client = self._http or shared_async_client()
+
+        try:
+            resp = await client.request(
+                method=method.upper(),
+                url=self._url(path),
+                headers={**self._headers(), **(headers or {})},
+                params=params,
+                json=json,
+                data=data,
+                files=files,
+                timeout=self._timeout(),
+            )
+        except httpx.RequestError as e:
+            raise ApiError(status_code=0, message=f"Network error: {e!s}") from e
+
+        return self._decode(resp)
+
+    async def _download(self, path: str, out: IO[bytes], *, params: dict[str, Any] | None = None) -> int:
+        self._check_configured()
+        client = self._http or shared_async_client()
+        written = 0
+        try:
+            async with client.stream(
+                "GET", self._url(path), headers={**self._headers(), "Accept": "*/*"}, params=params, timeout=self._timeout()
+            ) as resp:
+                if not 200 <= resp.status_code < 300:
+                    await resp.aread()
+                    self._raise_for_status(resp)
+                async for chunk in resp.aiter_bytes():
+                    out.write(chunk)
+                    written += len(chunk)
+        except httpx.RequestError as e:
+            raise ApiError(status_code=0, message=f"Network error: {e!s}") from e
+        return written
+
+    # ---------- Auth ----------
+    async def login(self, username: str, password: str) -> dict[str, Any]:
+        return await self._request("POST", "/auth/login", json={"username": username, "password": password})
+
+    # ---------- Customer: requests ----------
+    async def create_request(self, title: str, description: str, classes: list[str]) -> dict[str, Any]:
+        return await self._request("POST", "/requests", json={"title": title, "description": description, "classes": classes})
+
+    async def list_requests(self) -> list[dict[str, Any]]:
+        data = await self._request("GET", "/requests")
+        return data if isinstance(data, list) else []
+
+    # ---------- Uploads (MVP multipart) ----------
+    async def upload_files_mvp(self, request_id: str, packed_files: list[tuple[str, UploadContent, str]]) -> dict[str, Any]:
+        multipart: list[tuple[str, tuple[str, UploadContent, str]]] = []
+        for fname, content, mime in packed_files:
+            if hasattr(content, "seek"):
+                content.seek(0)
+            multipart.append(("files", (fname, content, mime)))
+        return await self._request("POST", f"/requests/{request_id}/uploads", files=multipart)
+
+    async def list_uploads(self, request_id: str) -> list[dict[str, Any]]:
+        data = await self._request("GET", f"/requests/{request_id}/uploads")
+        return data if isinstance(data, list) else []
+
+    # ---------- Uploads (presigned) ----------
+    async def presign_uploads(self, request_id: str, files: list[dict[str, Any]]) -> dict[str, Any]:
+        return await self._request("POST", "/uploads/presign", json={"request_id": request_id, "files": files})
+
+    async def complete_uploads(self, request_id: str, uploaded: list[dict[str, Any]]) -> dict[str, Any]:
+        return await self._request("POST", "/uploads/complete", json={"request_id": request_id, "uploaded": uploaded})
+
+    # ---------- QC ----------
+    async def run_qc(self, request_id: str, keys: Optional[list[str]] = None) -> dict[str, Any]:
+        """keys = incremental run: only these upload keys (added since the last run) are scored."""
+        payload = {"keys": keys} if keys is not None else None
+        return await self._request("POST", f"/requests/{request_id}/qc/run", json=payload)
+
+    async def qc_job(self, request_id: str, job_id: str) -> dict[str, Any]:
+        data = await self._request("GET", f"/requests/{request_id}/qc/jobs/{job_id}")
+        return data if isinstance(data, dict) else {}
+
+    async def qc_results(self, request_id: str, query: Optional[QcQuery] = None) -> dict[str, Any]:
+        """One page: {"items", "next_cursor", "total"}."""
+        query = query or QcQuery()
+        data = await self._request("GET", f"/requests/{request_id}/qc/results", params=query.params())
+        return _qc_page(data, query)
+
+    async def qc_results_columnar(self, request_id: str, if_run: Optional[str] = None) -> Any:
+        """
+        Full QC result set as Arrow IPC stream bytes (negotiated via Accept).
+        None = QC run `if_run` is still the latest (304); anything else = backend has no columnar format.
+        """
+        headers = {"Accept": f"{ARROW_STREAM}, application/json;q=0.5"}
+        if if_run:
+            headers["If-None-Match"] = f'"{if_run}"'
+        data = await self._request("GET", f"/requests/{request_id}/qc/results", params={"format": "arrow"}, headers=headers)
+        if data is None and if_run:
+            return None
+        return data
+
+    async def qc_export(self, request_id: str, fmt: str, query: QcQuery, out: IO[bytes]) -> int:
+        """Full filtered result set (csv | csv.gz | parquet) streamed into `out`; cursor/limit are ignored."""
+        params = {k: v for k, v in query.params().items() if k not in ("cursor", "limit")}
+        return await self._download(f"/requests/{request_id}/qc/export", out, params={**params, "format": fmt})
+
+    async def qc_summary(self, request_id: str, dup_thr: float, ai_thr: float) -> dict[str, Any]:
+        data = await self._request(
+            "GET", f"/requests/{request_id}/qc/summary", params={"dup_thr": dup_thr, "ai_thr": ai_thr}
+        )
+        return data if isinstance(data, dict) else {}
+
+    # ---------- Labeler: tasks ----------
+    async def list_tasks(self) -> list[dict[str, Any]]:
+        data = await self._request("GET", "/tasks")
+        return data if isinstance(data, list) else []
+
+    async def get_task(self, task_id: str) -> dict[str, Any]:
+        data = await self._request("GET", f"/tasks/{task_id}")
+        return data if isinstance(data, dict) else {}
+
+    async def save_labels(self, task_id: str, image_id: str, labels: list[str]) -> dict[str, Any]:
+        return await self._request("POST", f"/tasks/{task_id}/labels", json={"image_id": image_id, "labels": labels})
+
+    async def save_labels_batch(
+        self, task_id: str, items: list[dict[str, Any]], client_id: Optional[str] = None
+    ) -> dict[str, Any]:
+        payload: dict[str, Any] = {"items": items}
+        if client_id:
+            payload["client_id"] = client_id
+        return await self._request("POST", f"/tasks/{task_id}/labels:batch", json=payload)
+
+    async def task_progress(self, task_id: str, if_version: Optional[int] = None) -> Optional[dict[str, Any]]:
+        """With if_version: None if progress has not changed since that version (304)."""
+        headers = {"If-None-Match": f'"{if_version}"'} if if_version is not None else None
+        data = await self._request("GET", f"/tasks/{task_id}/progress", headers=headers)
+        if data is None and if_version is not None:
+            return None
+        return data if isinstance(data, dict) else {}
+
+    async def complete_task(self, task_id: str) -> dict[str, Any]:
+        data = await self._request("POST", f"/tasks/{task_id}/complete")
+        return data if isinstance(data, dict) else {"status": "ok"}
+
+    # ---------- Admin ----------
+    async def admin_list_requests(self) -> list[dict[str, Any]]:
+        data = await self._request("GET", "/admin/requests")
+        return data if isinstance(data, list) else []
+
+    async def admin_list_tasks(self) -> list[dict[str, Any]]:
+        data = await self._request("GET", "/admin/tasks")
+        return data if isinstance(data, list) else []
+
+    async def admin_list_users(self) -> list[dict[str, Any]]:
+        data = await self._request("GET", "/admin/users")
+        return data if isinstance(data, list) else []
+
+    async def admin_assign_task(self, request_id: str, labeler_username: str) -> dict[str, Any]:
+        return await self._request(
+            "POST",
+            "/admin/assign",
+            json={"request_id": request_id, "labeler_username": labeler_username},
+        )
+
+
+def run_concurrently(*calls: Awaitable[Any], return_exceptions: bool = False) -> list[Any]:
+    """
+    Await several AsyncApiClient calls at once from synchronous (Streamlit) code.
+    Total latency is the slowest call, not the sum. With return_exceptions=True
+    errors are returned in place of results; pass them through unwrap().
+    """
+
+    async def _gather() -> list[Any]:
+        return list(await asyncio.gather(*calls, return_exceptions=return_exceptions))
+
+    return run_async(_gather())
+
+
+def unwrap(result: Any) -> Any:
+    """Re-raise an exception captured by run_concurrently(return_exceptions=True)."""
+    if isinstance(result, BaseException):
+        raise result
+    return result
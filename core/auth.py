@@ -10,7 +10,7 @@ def get_client() -> ApiClient | None:
     return ApiClient(settings.backend_url, token=token)
 
 def logout():
-    for k in ["token", "role", "user_id"]:
+    for k in ["token", "role", "user_id", "username"]:
         if k in st.session_state:
             del st.session_state[k]
     st.success("Вы вышли из системы.")
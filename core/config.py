@@ -14,6 +14,88 @@ class Settings:
     # "mvp" = multipart upload via backend
     # "presigned" = presign -> direct upload to storage -> complete
     upload_mode: str = os.getenv("UPLOAD_MODE", "mvp").strip().lower()
+    # max parallel PUTs to storage in presigned mode
+    upload_concurrency: int = int(os.getenv("UPLOAD_CONCURRENCY", "8"))
+    # read buffer for streaming file content to backend/storage (bytes)
+    upload_chunk_size: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+    # MVP multipart: split selection into several POSTs
+    mvp_batch_max_bytes: int = int(os.getenv("MVP_BATCH_MAX_BYTES", str(32 * 1024 * 1024)))
+    mvp_batch_max_files: int = int(os.getenv("MVP_BATCH_MAX_FILES", "100"))
+    mvp_batch_concurrency: int = int(os.getenv("MVP_BATCH_CONCURRENCY", "2"))
+    # presigned: files >= threshold use S3-style multipart (mock backend decides with these)
+    multipart_threshold_bytes: int = int(os.getenv("MULTIPART_THRESHOLD_BYTES", str(64 * 1024 * 1024)))
+    multipart_part_size: int = int(os.getenv("MULTIPART_PART_SIZE", str(8 * 1024 * 1024)))
+    # presigned: SQLite journal of files/parts already in storage (resume after rerun/reload)
+    upload_journal_path: str = os.getenv("UPLOAD_JOURNAL_PATH", ".cache/upload_journal.sqlite3")
+    # parallel sha256 hashing of selected files (dedupe before upload)
+    hash_workers: int = int(os.getenv("HASH_WORKERS", "4"))
+    # thumbnails: disk cache (LRU by size) + process pool for downscaling
+    thumbnail_dir: str = os.getenv("THUMBNAIL_DIR", ".cache/thumbnails")
+    thumbnail_cache_max_mb: int = int(os.getenv("THUMBNAIL_CACHE_MAX_MB", "512"))
+    thumbnail_size: int = int(os.getenv("THUMBNAIL_SIZE", "256"))
+    thumbnail_workers: int = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+    # images handed to the pool at a time (each is held in memory until its thumbnail is done)
+    thumbnail_max_inflight: int = int(os.getenv("THUMBNAIL_MAX_INFLIGHT", "8"))
+    # annotate page shows images downscaled to this max side (px)
+    preview_max_side: int = int(os.getenv("PREVIEW_MAX_SIDE", "1280"))
+    # annotate previews: own disk cache (LRU by size), separate from gallery thumbnails
+    preview_dir: str = os.getenv("PREVIEW_DIR", ".cache/previews")
+    preview_cache_max_mb: int = int(os.getenv("PREVIEW_CACHE_MAX_MB", "1024"))
+    # annotate page: images to prefetch ahead of the current one, in-memory cache size (images)
+    prefetch_ahead: int = int(os.getenv("PREFETCH_AHEAD", "3"))
+    prefetch_cache_items: int = int(os.getenv("PREFETCH_CACHE_ITEMS", "16"))
+    # annotate: labels are saved write-behind, flushed in batches via /tasks/{id}/labels:batch
+    label_batch_size: int = int(os.getenv("LABEL_BATCH_SIZE", "50"))
+    label_flush_interval_s: float = float(os.getenv("LABEL_FLUSH_INTERVAL_S", "2"))
+    # annotate: progress is tracked locally, reconciled with backend at most this often
+    progress_sync_interval_s: float = float(os.getenv("PROGRESS_SYNC_INTERVAL_S", "30"))
+    # durable label journal (SQLite): unsent decisions are replayed after outages/restarts
+    label_journal_path: str = os.getenv("LABEL_JOURNAL_PATH", ".cache/label_journal.sqlite3")
+    # QC review: rows per page fetched from backend (filtering/sorting happen server-side)
+    qc_page_size: int = int(os.getenv("QC_PAGE_SIZE", "200"))
+    # QC review: full result set as Arrow IPC (needs `pyarrow`), cached on disk per request and QC run
+    qc_columnar: bool = os.getenv("QC_COLUMNAR", "1") == "1"
+    qc_cache_dir: str = os.getenv("QC_CACHE_DIR", ".cache/qc")
+    # QC review: parsed QC frames kept in memory (LRU, items) and reused without revalidation for TTL seconds
+    qc_frame_cache_items: int = int(os.getenv("QC_FRAME_CACHE_ITEMS", "4"))
+    qc_frame_ttl_s: float = float(os.getenv("QC_FRAME_TTL_S", "300"))
+    # QC export: rows per written chunk / page, size kept in memory before spilling to a temp file
+    qc_export_chunk_rows: int = int(os.getenv("QC_EXPORT_CHUNK_ROWS", "50000"))
+    qc_export_spool_mb: int = int(os.getenv("QC_EXPORT_SPOOL_MB", "32"))
+    # QC jobs: status polling interval, grows (backoff) up to the max while the job runs
+    qc_poll_interval_s: float = float(os.getenv("QC_POLL_INTERVAL_S", "1"))
+    qc_poll_max_interval_s: float = float(os.getenv("QC_POLL_MAX_INTERVAL_S", "10"))
+    # QC jobs: reported as failed after this many failed status checks in a row / seconds without a result
+    qc_poll_max_failures: int = int(os.getenv("QC_POLL_MAX_FAILURES", "10"))
+    qc_poll_timeout_s: float = float(os.getenv("QC_POLL_TIMEOUT_S", "3600"))
+    # mock backend: how long a simulated QC job runs
+    mock_qc_job_s: float = float(os.getenv("MOCK_QC_JOB_S", "5"))
+    # mock backend: generated data set (deterministic from the seed; defaults = small demo set)
+    mock_seed: int = int(os.getenv("MOCK_SEED", "42"))
+    mock_requests: int = int(os.getenv("MOCK_REQUESTS", "2"))
+    mock_tasks: int = int(os.getenv("MOCK_TASKS", "2"))
+    mock_images_per_task: int = int(os.getenv("MOCK_IMAGES_PER_TASK", "10"))
+    mock_uploads_per_request: int = int(os.getenv("MOCK_UPLOADS_PER_REQUEST", "0"))
+    mock_qc_rows: int = int(os.getenv("MOCK_QC_ROWS", "25"))
+    # mock QC engine: perceptual hash (dhash | phash) and max Hamming distance searched for duplicates
+    qc_hash: str = os.getenv("QC_HASH", "dhash").strip().lower()
+    qc_dup_radius: int = int(os.getenv("QC_DUP_RADIUS", "4"))
+    # local HTTP stand-in backend (python -m core.mock_server): added latency per request (base + random
+    # jitter, ms), share of requests answered with an injected error, their status codes, max request body
+    mock_server_latency_ms: float = float(os.getenv("MOCK_SERVER_LATENCY_MS", "0"))
+    mock_server_jitter_ms: float = float(os.getenv("MOCK_SERVER_JITTER_MS", "0"))
+    mock_server_error_rate: float = float(os.getenv("MOCK_SERVER_ERROR_RATE", "0"))
+    mock_server_error_statuses: str = os.getenv("MOCK_SERVER_ERROR_STATUSES", "500,502,503")
+    mock_server_max_body_mb: int = int(os.getenv("MOCK_SERVER_MAX_BODY_MB", "64"))
+    # retries for a failed MVP batch / presigned PUT (network errors, 408, 429, 5xx)
+    upload_retries: int = int(os.getenv("UPLOAD_RETRIES", "2"))
+
+    # Shared HTTP connection pool (core/http_pool.py)
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    http_max_keepalive: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+    http_keepalive_expiry_s: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_S", "30"))
+    # 1 = enable HTTP/2 (needs `pip install "httpx[http2]"`, falls back to HTTP/1.1 otherwise)
+    http2: bool = os.getenv("HTTP2", "0") == "1"
 
 
 settings = Settings()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+import httpx
+
+from core.config import settings
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_client: Optional[httpx.Client] = None
+
+# Async side: one event loop in a daemon thread owns the pooled AsyncClient,
+# so every Streamlit script thread can submit coroutines to it.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    # HTTP/2 needs the optional `h2` package (pip install "httpx[http2]")
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive,
+        keepalive_expiry=settings.http_keepalive_expiry_s,
+    )
+
+
+def _default_timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.request_timeout_s, connect=10.0)
+
+
+def shared_client() -> httpx.Client:
+    """
+    Process-wide pooled httpx.Client (keep-alive) shared by all Streamlit sessions.
+    httpx.Client is safe to use from several script threads; only creation is locked.
+    """
+    global _client
+
+    c = _client
+    if c is not None and not c.is_closed:
+        return c
+
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(
+                limits=_limits(),
+                timeout=_default_timeout(),
+                http2=settings.http2 and _http2_available(),
+            )
+        return _client
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+
+    loop = _loop
+    if loop is not None and loop.is_running():
+        return loop
+
+    with _lock:
+        if _loop is None or not _loop.is_running():
+            new_loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(new_loop)
+                new_loop.call_soon(started.set)
+                new_loop.run_forever()
+
+            threading.Thread(target=_run, name="http-pool-loop", daemon=True).start()
+            started.wait()
+            _loop = new_loop
+        return _loop
+
+
+def shared_async_client() -> httpx.AsyncClient:
+    """
+    Pooled httpx.AsyncClient bound to the background loop.
+    Only await it from coroutines submitted through run_async().
+    """
+    global _async_client
+
+    c = _async_client
+    if c is not None and not c.is_closed:
+        return c
+
+    with _lock:
+        if _async_client is None or _async_client.is_closed:
+            _async_client = httpx.AsyncClient(
+                limits=_limits(),
+                timeout=_default_timeout(),
+                http2=settings.http2 and _http2_available(),
+            )
+        return _async_client
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared background loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+def close_shared_client() -> None:
+    global _client, _async_client, _loop
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+        loop, ac = _loop, _async_client
+        _loop, _async_client = None, None
+
+    if loop is not None and loop.is_running():
+        if ac is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(ac.aclose(), loop).result(timeout=5)
+            except Exception:
+                pass
+        loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(close_shared_client)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from core.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner      TEXT NOT NULL,
+    task_id    TEXT NOT NULL,
+    image_id   TEXT NOT NULL,
+    labels     TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    sent       INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_unsent ON entries (owner, sent, seq);
+CREATE INDEX IF NOT EXISTS entries_image ON entries (owner, task_id, image_id, seq);
+"""
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class LabelJournal:
+    """
+    Append-only, crash-safe log of label decisions (SQLite, WAL).
+    Every decision gets a monotonically increasing `seq`; entries stay `sent = 0`
+    until the backend acknowledged them, so they are replayed in order after a
+    backend outage or a UI restart. The backend dedupes replays by (client_id, seq).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.executescript(_SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'client_id'").fetchone()
+            if row is None:
+                self.client_id = uuid.uuid4().hex
+                self._conn.execute("INSERT INTO meta (name, value) VALUES ('client_id', ?)", (self.client_id,))
+            else:
+                self.client_id = str(row["value"])
+
+    def append(self, owner: str, task_id: str, image_id: str, labels: list[str]) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO entries (owner, task_id, image_id, labels, created_at) VALUES (?, ?, ?, ?, ?)",
+                (owner, str(task_id), str(image_id), json.dumps(list(labels)), _now_iso()),
+            )
+            return int(cur.lastrowid)
+
+    def unsent(self, owner: str) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, task_id, image_id, labels FROM entries WHERE owner = ? AND sent = 0 ORDER BY seq",
+                (owner,),
+            ).fetchall()
+        return [
+            {"seq": int(r["seq"]), "task_id": r["task_id"], "image_id": r["image_id"], "labels": json.loads(r["labels"])}
+            for r in rows
+        ]
+
+    def mark_sent(self, owner: str, task_id: str, image_id: str, up_to_seq: int) -> None:
+        """Acknowledge an entry and every older (superseded) entry for the same image."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET sent = 1 WHERE owner = ? AND task_id = ? AND image_id = ? AND seq <= ? AND sent = 0",
+                (owner, str(task_id), str(image_id), int(up_to_seq)),
+            )
+
+    def latest(self, owner: str, task_id: str, image_id: str) -> Optional[list[str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT labels FROM entries WHERE owner = ? AND task_id = ? AND image_id = ? ORDER BY seq DESC LIMIT 1",
+                (owner, str(task_id), str(image_id)),
+            ).fetchone()
+        return json.loads(row["labels"]) if row else None
+
+    def prune_sent(self, keep_per_image: int = 1) -> None:
+        """Drop acknowledged history, keeping the newest `keep_per_image` entries of each image."""
+        with self._lock:
+            self._conn.execute(
+                """
+                DELETE FROM entries WHERE sent = 1 AND seq NOT IN (
+                    SELECT seq FROM (
+                        SELECT seq, ROW_NUMBER() OVER (
+                            PARTITION BY owner, task_id, image_id ORDER BY seq DESC
+                        ) AS rn FROM entries
+                    ) WHERE rn <= ?
+                )
+                """,
+                (int(keep_per_image),),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_journal: Optional[LabelJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_label_journal() -> LabelJournal:
+    """Process-wide journal at LABEL_JOURNAL_PATH (entries are separated by owner)."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = LabelJournal(settings.label_journal_path)
+            _journal.prune_sent()
+        return _journal
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from core.config import settings
+
+if TYPE_CHECKING:
+    from core.label_journal import LabelJournal
+
+# send_batch(task_id, [{"image_id": ..., "labels": [...], "seq": 1}, ...]) -> backend response
+SendBatch = Callable[[str, list[dict[str, Any]]], Any]
+
+
+@dataclass
+class _Pending:
+    labels: list[str]
+    version: int
+
+
+class LabelWriteBehind:
+    """
+    Write-behind queue for label saves.
+    put() returns immediately; a daemon thread flushes pending labels in batches
+    (one bulk request per task). Repeated edits of one image are coalesced (the last
+    one wins), and failed batches stay queued and are retried with backoff.
+
+    With a `journal`, every put() is first appended to the durable LabelJournal
+    (its seq orders and identifies the decision), entries still unsent from a
+    previous run of the same `owner` are replayed in seq order, and entries are
+    acknowledged in the journal only after the backend accepted them.
+    """
+
+    def __init__(
+        self,
+        send_batch: SendBatch,
+        *,
+        journal: Optional["LabelJournal"] = None,
+        owner: str = "",
+        batch_size: int | None = None,
+        flush_interval_s: float | None = None,
+    ) -> None:
+        self._send_batch = send_batch
+        self.batch_size = int(batch_size or settings.label_batch_size)
+        self.flush_interval_s = float(flush_interval_s or settings.label_flush_interval_s)
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Condition(self._lock)
+        self._pending: dict[tuple[str, str], _Pending] = {}
+        self._saved: dict[tuple[str, str], list[str]] = {}
+        self._version = 0
+        self._in_flight = 0
+        self._failures = 0
+        self.last_error: Optional[str] = None
+        self._closed = False
+
+        self._journal = journal
+        self.owner = owner
+        if journal is not None:
+            for e in journal.unsent(owner):
+                self._pending[(e["task_id"], e["image_id"])] = _Pending(e["labels"], e["seq"])
+                self._version = max(self._version, e["seq"])
+
+        self._thread = threading.Thread(target=self._run, name="label-write-behind", daemon=True)
+        self._thread.start()
+
+    # ---------- API ----------
+    def put(self, task_id: str, image_id: str, labels: list[str]) -> None:
+        # journal first: the decision survives a crash before it is flushed
+        seq = self._journal.append(self.owner, task_id, image_id, labels) if self._journal is not None else None
+        with self._lock:
+            self._version = seq if seq is not None else self._version + 1
+            self._pending[(str(task_id), str(image_id))] = _Pending(list(labels), self._version)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def local_labels(self, task_id: str, image_id: str) -> Optional[list[str]]:
+        """Last labels known locally (pending or already flushed), None if never saved here."""
+        key = (str(task_id), str(image_id))
+        with self._lock:
+            p = self._pending.get(key)
+            if p is not None:
+                return list(p.labels)
+            saved = self._saved.get(key)
+            if saved is not None:
+                return list(saved)
+        if self._journal is not None:
+            return self._journal.latest(self.owner, task_id, image_id)
+        return None
+
+    def pending_count(self, task_id: str | None = None) -> int:
+        with self._lock:
+            if task_id is None:
+                return len(self._pending)
+            return sum(1 for (t, _) in self._pending if t == str(task_id))
+
+    def flush(self, timeout_s: float | None = None) -> bool:
+        """Ask for an immediate flush and wait until nothing is pending. False on timeout."""
+        deadline = time.monotonic() + (timeout_s if timeout_s is not None else settings.request_timeout_s)
+        self._wake.set()
+        with self._lock:
+            while self._pending or self._in_flight:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                # failures are retried on the backoff schedule, not re-triggered here
+                self._idle.wait(timeout=min(left, 0.5))
+        return True
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+
+    # ---------- background ----------
+    def _take_batch(self) -> tuple[str, list[tuple[str, _Pending]]]:
+        # oldest-first batch for a single task
+        with self._lock:
+            if not self._pending:
+                return "", []
+            items = sorted(self._pending.items(), key=lambda kv: kv[1].version)
+            task_id = items[0][0][0]
+            batch = [(image_id, p) for (t, image_id), p in items if t == task_id][: self.batch_size]
+            self._in_flight += 1
+            return task_id, batch
+
+    def _run(self) -> None:
+        while not self._closed:
+            backoff = min(30.0, self.flush_interval_s * (2 ** min(self._failures, 10)))
+            if self._failures:
+                backoff *= 0.5 + random.random()  # jitter
+            self._wake.wait(timeout=backoff)
+            self._wake.clear()
+
+            while not self._closed:
+                task_id, batch = self._take_batch()
+                if not batch:
+                    break
+                try:
+                    self._send_batch(
+                        task_id,
+                        [{"image_id": image_id, "labels": p.labels, "seq": p.version} for image_id, p in batch],
+                    )
+                except Exception as e:
+                    with self._lock:
+                        self._in_flight -= 1
+                        self._failures += 1
+                        self.last_error = str(e)
+                        self._idle.notify_all()
+                    break
+
+                if self._journal is not None:
+                    for image_id, p in batch:
+                        self._journal.mark_sent(self.owner, task_id, image_id, p.version)
+
+                with self._lock:
+                    self._in_flight -= 1
+                    self._failures = 0
+                    self.last_error = None
+                    for image_id, p in batch:
+                        key = (task_id, image_id)
+                        self._saved[key] = p.labels
+                        # keep entries edited again while the batch was in flight
+                        cur = self._pending.get(key)
+                        if cur is not None and cur.version == p.version:
+                            del self._pending[key]
+                    self._idle.notify_all()
@@ -0,0 +1,379 @@
+"""
+Load generator: concurrent simulated UI sessions against a backend (the local stand-in from
+core/mock_server.py or a real one), through ApiClient and the shared connection pool like the pages.
+
+    python -m core.load_test --local --concurrency 32 --duration-s 60 --mix labeler=3,customer=1 --out load.json
+    python -m core.load_test --url http://127.0.0.1:8000 --compare load.json
+
+Flows (one session = one role, repeated until the time is up):
+- labeler: login -> list tasks -> get task -> save N labels (write-behind batches) -> progress -> complete
+- customer: login -> create request -> upload K images -> run QC -> wait for the job -> summary + first page
+
+Reports throughput and p50/p95/p99 latency per endpoint and per flow; --out writes them as JSON,
+--compare checks them against an earlier run (exit code 1 on regression).
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import IO, Any, Callable, Optional
+
+import numpy as np
+from PIL import Image
+
+from core.api_client import ApiClient, ApiError
+from core.config import settings
+from core.qc import QcQuery
+from core.qc_jobs import QcJobPoller
+
+_ID_SEGMENT = re.compile(r"/(requests|tasks|jobs)/[^/]+")
+
+USERS = {"labeler": ("labeler1", "pass"), "customer": ("customer1", "pass")}
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """Request grouped by route: ids replaced, e.g. "POST /tasks/{id}/labels:batch"."""
+    return f"{method.upper()} {_ID_SEGMENT.sub(lambda m: f'/{m[1]}/{{id}}', path)}"
+
+
+class Recorder:
+    """Latencies (ms) and error statuses per name, shared by all session threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latencies: dict[str, list[float]] = {}
+        self._errors: dict[str, dict[str, int]] = {}
+
+    def record(self, name: str, elapsed_ms: float, error: Optional[int] = None) -> None:
+        with self._lock:
+            self._latencies.setdefault(name, []).append(elapsed_ms)
+            if error is not None:
+                errors = self._errors.setdefault(name, {})
+                errors[str(error)] = errors.get(str(error), 0) + 1
+
+    def timed(self, name: str, fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        try:
+            result = fn()
+        except ApiError as e:
+            self.record(name, (time.perf_counter() - t0) * 1000, error=e.status_code)
+            raise
+        except Exception:
+            self.record(name, (time.perf_counter() - t0) * 1000, error=-1)
+            raise
+        self.record(name, (time.perf_counter() - t0) * 1000)
+        return result
+
+    def stats(self, elapsed_s: float) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            items = {name: (list(lat), dict(self._errors.get(name, {}))) for name, lat in self._latencies.items()}
+        out = {}
+        for name, (lat, errors) in sorted(items.items()):
+            a = np.asarray(lat)
+            p50, p95, p99 = np.percentile(a, [50, 95, 99])
+            out[name] = {
+                "count": len(a),
+                "errors": sum(errors.values()),
+                "statuses": errors,
+                "rps": round(len(a) / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+                "mean_ms": round(float(a.mean()), 2),
+                "p50_ms": round(float(p50), 2),
+                "p95_ms": round(float(p95), 2),
+                "p99_ms": round(float(p99), 2),
+                "max_ms": round(float(a.max()), 2),
+            }
+        return out
+
+
+class TimedApiClient(ApiClient):
+    """ApiClient that records every call in a Recorder, grouped by endpoint."""
+
+    def __init__(self, base_url: str, recorder: Recorder, token: Optional[str] = None, timeout_s: float = 20.0) -> None:
+        super().__init__(base_url, token=token, timeout_s=timeout_s)
+        self.recorder = recorder
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> Any:
+        return self.recorder.timed(endpoint_name(method, path), lambda: super(TimedApiClient, self)._request(method, path, **kwargs))
+
+    def _download(self, path: str, out: IO[bytes], *, params: dict[str, Any] | None = None) -> int:
+        return self.recorder.timed(endpoint_name("GET", path), lambda: super(TimedApiClient, self)._download(path, out, params=params))
+
+
+@dataclass
+class LoadConfig:
+    url: str = settings.backend_url
+    concurrency: int = 8
+    duration_s: float = 30.0
+    # role -> weight; sessions are split between roles in this proportion
+    mix: dict[str, int] = field(default_factory=lambda: {"labeler": 3, "customer": 1})
+    labels_per_task: int = 20
+    uploads_per_request: int = 5
+    image_px: int = 256
+    think_ms: float = 0.0
+    qc_timeout_s: float = 120.0
+    seed: int = 0
+
+
+def session_roles(cfg: LoadConfig) -> list[str]:
+    """Role of every session, in the `mix` proportion (largest remainder)."""
+    total = sum(cfg.mix.values())
+    if total <= 0:
+        raise ValueError("mix needs a positive weight")
+    shares = {role: cfg.concurrency * w / total for role, w in cfg.mix.items()}
+    counts = {role: int(s) for role, s in shares.items()}
+    for role in sorted(shares, key=lambda r: shares[r] - counts[r], reverse=True)[: cfg.concurrency - sum(counts.values())]:
+        counts[role] += 1
+    return [role for role, n in counts.items() for _ in range(n)]
+
+
+class Session:
+    """One simulated user running its role's flow in a loop."""
+
+    def __init__(self, cfg: LoadConfig, recorder: Recorder, role: str, index: int, deadline: float) -> None:
+        self.cfg = cfg
+        self.recorder = recorder
+        self.role = role
+        self.index = index
+        self.deadline = deadline
+        self.rng = np.random.default_rng([cfg.seed, index])
+        self.client = TimedApiClient(cfg.url, recorder, timeout_s=settings.request_timeout_s)
+        self.seq = 0
+        self.flows = 0
+        self.failed = 0
+
+    def run(self) -> None:
+        flow = {"labeler": self.labeler_flow, "customer": self.customer_flow}[self.role]
+        while time.monotonic() < self.deadline:
+            try:
+                self.recorder.timed(f"flow {self.role}", flow)
+                self.flows += 1
+            except Exception:
+                self.failed += 1
+                # do not hammer a failing backend in a tight loop
+                time.sleep(0.1)
+
+    def think(self) -> None:
+        if self.cfg.think_ms > 0:
+            time.sleep(self.rng.exponential(self.cfg.think_ms) / 1000)
+
+    def login(self) -> None:
+        username, password = USERS[self.role]
+        self.client.token = self.client.login(username, password)["access_token"]
+
+    # ---------- Flows ----------
+    def labeler_flow(self) -> None:
+        self.login()
+        self.think()
+        tasks = self.client.list_tasks()
+        if not tasks:
+            raise RuntimeError("No tasks assigned to the labeler")
+        task = tasks[int(self.rng.integers(len(tasks)))]
+        self.think()
+        detail = self.client.get_task(str(task["id"]))
+        images = detail.get("images") or []
+        classes = detail.get("classes") or ["label"]
+        client_id = f"load-{self.index}"
+
+        pending: list[dict[str, Any]] = []
+        for img in images[: self.cfg.labels_per_task]:
+            self.think()
+            self.seq += 1
+            labels = [str(c) for c in self.rng.choice(classes, size=int(self.rng.integers(1, 3)), replace=False)]
+            pending.append({"image_id": img["image_id"], "labels": labels, "seq": self.seq})
+            # write-behind like the annotate page: flushed in LABEL_BATCH_SIZE batches
+            if len(pending) >= settings.label_batch_size:
+                self.client.save_labels_batch(str(task["id"]), pending, client_id=client_id)
+                pending = []
+        if pending:
+            self.client.save_labels_batch(str(task["id"]), pending, client_id=client_id)
+
+        progress = self.client.task_progress(str(task["id"]))
+        self.client.task_progress(str(task["id"]), if_version=progress.get("version"))
+        self.client.complete_task(str(task["id"]))
+
+    def _image(self) -> bytes:
+        # random pixels: every upload is distinct content (no dedupe skips)
+        px = self.rng.integers(0, 256, size=(self.cfg.image_px, self.cfg.image_px, 3), dtype=np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(px).save(buf, format="JPEG", quality=80)
+        return buf.getvalue()
+
+    def customer_flow(self) -> None:
+        self.login()
+        self.think()
+        req = self.client.create_request(f"Load test {self.index}", "load test", ["car", "truck"])
+        rid = str(req["id"])
+        packed = [(f"img_{i:04d}.jpg", self._image(), "image/jpeg") for i in range(self.cfg.uploads_per_request)]
+        self.client.upload_files_mvp(rid, packed)
+        self.think()
+
+        job = self.client.run_qc(rid)
+        if job.get("job_id"):
+            client = self.client
+            poller = QcJobPoller(lambda: client.qc_job(rid, str(job["job_id"])), request_id=rid, job_id=str(job["job_id"]))
+            give_up = time.monotonic() + self.cfg.qc_timeout_s
+            try:
+                t0 = time.perf_counter()
+                state = poller.state
+                while not state.done and time.monotonic() < give_up:
+                    state = poller.wait(timeout_s=1.0)
+                if not state.done:
+                    raise RuntimeError(f"QC job {job['job_id']} not done after {self.cfg.qc_timeout_s}s")
+                if state.status == "failed":
+                    raise RuntimeError(f"QC job {job['job_id']} failed: {state.error}")
+                self.recorder.record("qc job wait", (time.perf_counter() - t0) * 1000)
+            finally:
+                poller.stop()
+
+        query = QcQuery(limit=settings.qc_page_size)
+        self.client.qc_summary(rid, query.dup_thr, query.ai_thr)
+        self.client.qc_results(rid, query)
+
+
+def run_load(cfg: LoadConfig) -> dict[str, Any]:
+    recorder = Recorder()
+    roles = session_roles(cfg)
+    started = datetime.now(timezone.utc)
+    t0 = time.monotonic()
+    sessions = [Session(cfg, recorder, role, i, t0 + cfg.duration_s) for i, role in enumerate(roles)]
+    with ThreadPoolExecutor(max_workers=len(sessions), thread_name_prefix="load-session") as pool:
+        for fut in [pool.submit(s.run) for s in sessions]:
+            fut.result()
+    elapsed = time.monotonic() - t0
+
+    stats = recorder.stats(elapsed)
+    endpoints = {k: v for k, v in stats.items() if k.split(" ", 1)[0] in ("GET", "POST", "PUT")}
+    requests_total = sum(s["count"] for s in endpoints.values())
+    return {
+        "meta": {**asdict(cfg), "started_at": started.isoformat(), "elapsed_s": round(elapsed, 2), "sessions": len(sessions)},
+        "totals": {
+            "requests": requests_total,
+            "errors": sum(s["errors"] for s in endpoints.values()),
+            "rps": round(requests_total / elapsed, 2) if elapsed > 0 else 0.0,
+            "flows": {role: sum(s.flows for s in sessions if s.role == role) for role in cfg.mix},
+            "failed_flows": {role: sum(s.failed for s in sessions if s.role == role) for role in cfg.mix},
+        },
+        "endpoints": endpoints,
+        "flows": {k: v for k, v in stats.items() if k not in endpoints},
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], tolerance: float = 0.2) -> list[str]:
+    """Regressions of `current` vs `baseline`: p95 latency or error rate worse by more than `tolerance`."""
+    problems = []
+    for section in ("endpoints", "flows"):
+        for name, old in baseline.get(section, {}).items():
+            new = current.get(section, {}).get(name)
+            if new is None:
+                continue
+            if new["p95_ms"] > old["p95_ms"] * (1 + tolerance) and new["p95_ms"] - old["p95_ms"] > 1.0:
+                problems.append(f"{name}: p95 {old['p95_ms']:.1f} -> {new['p95_ms']:.1f} ms")
+            old_rate = old["errors"] / max(old["count"], 1)
+            new_rate = new["errors"] / max(new["count"], 1)
+            if new_rate > old_rate * (1 + tolerance) and new_rate - old_rate > 0.001:
+                problems.append(f"{name}: errors {old_rate:.2%} -> {new_rate:.2%}")
+    old_rps = baseline.get("totals", {}).get("rps") or 0
+    new_rps = current.get("totals", {}).get("rps") or 0
+    if old_rps and new_rps < old_rps * (1 - tolerance):
+        problems.append(f"throughput {old_rps:.1f} -> {new_rps:.1f} req/s")
+    return problems
+
+
+def format_report(result: dict[str, Any]) -> str:
+    totals = result["totals"]
+    lines = [
+        f"{result['meta']['sessions']} sessions, {result['meta']['elapsed_s']} s: "
+        f"{totals['requests']} requests ({totals['rps']} req/s), {totals['errors']} errors, "
+        f"flows {totals['flows']} (failed {totals['failed_flows']})",
+        "",
+        f"{'name':<44}{'count':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}",
+    ]
+    for section in ("endpoints", "flows"):
+        for name, s in result[section].items():
+            lines.append(
+                f"{name:<44}{s['count']:>8}{s['errors']:>6}{s['rps']:>9.1f}"
+                f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}{s['max_ms']:>9.1f}"
+            )
+    return "\n".join(lines)
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        role, _, weight = part.partition("=")
+        role = role.strip()
+        if role not in USERS:
+            raise argparse.ArgumentTypeError(f"unknown role: {role} (expected {', '.join(USERS)})")
+        mix[role] = int(weight or 1)
+    return mix
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Load test: concurrent labeler/customer sessions through ApiClient")
+    p.add_argument("--url", default=settings.backend_url)
+    p.add_argument("--local", action="store_true", help="start the stand-in backend (core/mock_server.py) in this process")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--duration-s", type=float, default=30.0)
+    p.add_argument("--mix", type=_parse_mix, default="labeler=3,customer=1")
+    p.add_argument("--labels-per-task", type=int, default=20)
+    p.add_argument("--uploads-per-request", type=int, default=5)
+    p.add_argument("--image-px", type=int, default=256)
+    p.add_argument("--think-ms", type=float, default=0.0, help="mean pause between user steps")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", help="write results as JSON")
+    p.add_argument("--compare", help="JSON of an earlier run: report regressions, exit code 1 if any")
+    p.add_argument("--tolerance", type=float, default=0.2)
+    args = p.parse_args(argv)
+
+    server = None
+    url = args.url
+    if args.local:
+        # local import: the stand-in is only needed here
+        from core.mock_server import MockServer
+
+        server = MockServer(("127.0.0.1", 0)).start()
+        url = server.url
+
+    cfg = LoadConfig(
+        url=url,
+        concurrency=args.concurrency,
+        duration_s=args.duration_s,
+        mix=args.mix,
+        labels_per_task=args.labels_per_task,
+        uploads_per_request=args.uploads_per_request,
+        image_px=args.image_px,
+        think_ms=args.think_ms,
+        seed=args.seed,
+    )
+    try:
+        result = run_load(cfg)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    print(format_report(result))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            problems = compare(json.load(f), result, args.tolerance)
+        print("\nRegressions vs " + args.compare + (":" if problems else ": none"))
+        for line in problems:
+            print(f"  {line}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,46 @@
 from __future__ import annotations
 
+import hashlib
 import itertools
 import random
+import time
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable, MutableSequence, Sequence
+from urllib.parse import quote
 
-from core.api_client import ApiError
+import pandas as pd
 
-_random = random.Random(42)
+from core.api_client import ApiError, UploadContent
+from core.config import settings
+from core.mock_data import SyntheticConfig, SyntheticUploads, image_ids, iter_requests, iter_tasks, synthetic_qc_frame
+from core.mock_store import MockStore
+from core.qc import QcQuery, qc_summary, query_qc_rows
+from core.qc_columnar import query_qc_frame, rows_to_arrow, summarize_qc_frame
+from core.qc_engine import HammingIndex, duplicate_score, image_hash
+from core.uploads import PutJob, PutResult, filelike_size, hash_file
+
+_random = random.Random(settings.mock_seed)
 
 _request_counter = itertools.count(1001)
 _task_counter = itertools.count(5001)
 
-_requests: list[dict[str, Any]] = []
-_tasks: list[dict[str, Any]] = []
+_store = MockStore()  # requests + tasks, id-keyed and indexed
 _labels_store: dict[tuple[str, str], list[str]] = {}  # (task_id, image_id) -> labels
-_uploads_store: dict[str, list[dict[str, Any]]] = {}  # request_id -> uploaded items
+_label_seq: dict[tuple[str, str, str], int] = {}  # (client_id, task_id, image_id) -> last applied seq
+_labeled_counts: dict[str, int] = {}  # task_id -> images with non-empty labels
+_progress_versions: dict[str, int] = {}  # task_id -> bumped on every label change
+
+_cfg = SyntheticConfig.from_settings()  # size of the generated data set (MOCK_* settings)
+_uploads_store: dict[str, MutableSequence[dict[str, Any]]] = {}  # request_id -> uploaded items
+_multipart_store: dict[str, dict[str, Any]] = {}  # upload_id -> {"request_id", "key", "parts"}
+_upload_id_counter = itertools.count(1)
+_object_counter = itertools.count(1)
+_object_phash: dict[str, str | None] = {}  # storage key -> perceptual hash of PUT content (presigned)
+_qc_store: dict[str, list[dict[str, Any]] | pd.DataFrame] = {}  # request_id -> QC rows (DataFrame if synthetic)
+_qc_index: dict[str, HammingIndex] = {}  # request_id -> perceptual-hash index of the scored uploads
+_qc_runs: dict[str, int] = {}  # request_id -> id of the latest QC run
+_qc_jobs: dict[str, dict[str, Any]] = {}  # job_id -> {"request_id", "started", "duration", "keys", "run_id"}
+_qc_job_counter = itertools.count(1)
 
 
 def _now_iso() -> str:
@@ -23,56 +48,53 @@ def _now_iso() -> str:
 
 
 def _ensure_seed_data() -> None:
-    if _requests:
-        return
+    with _store.lock:
+        if len(_store):
+            return
+        _seed()
 
-    r1 = {
-        "id": "req-1001",
-        "title": "Road images: City A -> City B",
-        "description": "Mock request",
-        "classes": ["pothole", "crosswalk", "traffic_light", "road_sign"],
-        "status": "new",
-    }
-    r2 = {
-        "id": "req-1002",
-        "title": "Winter roads: City C -> City D",
-        "description": "Mock request",
-        "classes": ["snow", "ice", "lane_marking"],
-        "status": "in_progress",
-    }
-    _requests.extend([r1, r2])
-
-    t1 = {
-        "id": "task-5001",
-        "title": "Label req-1001",
-        "status": "assigned",
-        "request_id": "req-1001",
-        "assignee": "labeler1",
-    }
-    t2 = {
-        "id": "task-5002",
-        "title": "Label req-1002",
-        "status": "open",
-        "request_id": "req-1002",
-        "assignee": None,
-    }
-    _tasks.extend([t1, t2])
+
+def _seed() -> None:
+    # generated one record at a time (deterministic from MOCK_SEED); images, uploads and
+    # QC rows are produced later, per task / request, when first asked for
+    global _request_counter, _task_counter
+    for req in iter_requests(_cfg):
+        _store.add_request(req)
+    for task in iter_tasks(_cfg):
+        _store.add_task(task)
+    _request_counter = itertools.count(1001 + _cfg.requests)
+    _task_counter = itertools.count(5001 + _cfg.tasks)
 
 
 # ---------- Auth ----------
-def mock_login(username: str, password: str) -> dict[str, Any]:
-    users = {
-        "customer1": {"password": "pass", "role": "customer"},
-        "labeler1": {"password": "pass", "role": "labeler"},
-        "admin1": {"password": "pass", "role": "admin"},
-        "universal1": {"password": "pass", "role": "universal"},
-    }
+_USERS = {
+    "customer1": {"password": "pass", "role": "customer"},
+    "labeler1": {"password": "pass", "role": "labeler"},
+    "admin1": {"password": "pass", "role": "admin"},
+    "universal1": {"password": "pass", "role": "universal"},
+}
+_TOKEN_PREFIX = "mock-token-"
 
-    u = users.get(username)
+
+def mock_login(username: str, password: str) -> dict[str, Any]:
+    u = _USERS.get(username)
     if not u or u["password"] != password:
         raise ApiError(status_code=401, message="Invalid credentials (mock)")
 
-    return {"access_token": f"mock-token-{username}", "role": u["role"]}
+    return {"access_token": f"{_TOKEN_PREFIX}{username}", "role": u["role"]}
+
+
+def mock_token_user(token: str) -> tuple[str, str]:
+    """(username, role) of a token issued by mock_login."""
+    username = token[len(_TOKEN_PREFIX) :] if token.startswith(_TOKEN_PREFIX) else ""
+    u = _USERS.get(username)
+    if not u:
+        raise ApiError(status_code=401, message="Invalid token (mock)")
+    return username, u["role"]
+
+
+def mock_list_users() -> list[dict[str, Any]]:
+    return [{"username": name, "role": u["role"], "is_active": True} for name, u in _USERS.items()]
 
 
 # ---------- Requests ----------
@@ -86,48 +108,185 @@ def mock_create_request(title: str, description: str, classes: list[str]) -> dic
         "classes": classes or [],
         "status": "new",
     }
-    _requests.append(req)
-    return req
+    return _store.add_request(req)
+
+
+def _require_request(request_id: str) -> None:
+    if _store.get_request(str(request_id)) is None:
+        raise ApiError(status_code=404, message=f"Request not found (mock): {request_id}")
 
 
-def mock_list_requests() -> list[dict[str, Any]]:
+def mock_list_requests(status: str | None = None) -> Sequence[dict[str, Any]]:
+    """Shared read-only snapshot (no copy per call)."""
     _ensure_seed_data()
-    return list(_requests)
+    return _store.list_requests(status)
 
 
 # ---------- QC ----------
-def mock_qc_results(request_id: str) -> list[dict[str, Any]]:
-    _ensure_seed_data()
-    rows: list[dict[str, Any]] = []
-    for i in range(1, 26):
-        rows.append(
-            {
-                "request_id": request_id,
-                "image_id": f"{request_id}_img_{i:03d}",
-                "duplicate_score": round(_random.random(), 4),
-                "ai_generated_score": round(_random.random(), 4),
-            }
-        )
+def _ai_score(content_hash: str | None) -> float:
+    # AI-generated detection is not simulated: stable pseudo-random score per content
+    if not content_hash:
+        return round(_random.random(), 4)
+    return round(int(content_hash[:8], 16) / 0xFFFFFFFF, 4)
+
+
+def _engine_row(request_id: str, u: dict[str, Any], index: HammingIndex, *, is_new: bool = False) -> dict[str, Any]:
+    nearest, distance = index.nearest(u["key"]) if u["key"] in index else (None, None)
+    return {
+        "request_id": request_id,
+        "image_id": u["key"],
+        "filename": u.get("filename"),
+        "duplicate_score": duplicate_score(distance),
+        "ai_generated_score": _ai_score(u.get("content_hash")),
+        "nearest_image_id": nearest,
+        "hamming_distance": distance,
+        "source_url": u.get("preview_url"),
+        "is_new": is_new,
+    }
+
+
+def _engine_rows(request_id: str, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """duplicate_score from nearest neighbours of the perceptual hashes of uploaded images."""
+    # one row per key (the latest upload wins if a key was reused)
+    items = list({u["key"]: u for u in items}.values())
+    index = HammingIndex()
+    index.add_many((u["key"], int(u["phash"], 16)) for u in items if u.get("phash"))
+    _qc_index[request_id] = index
+    return [_engine_row(request_id, u, index) for u in items]
+
+
+def _qc_rows(request_id: str) -> list[dict[str, Any]] | pd.DataFrame:
+    # computed once per QC run: pages/summary of the same request must agree
+    rows = _qc_store.get(request_id)
+    if rows is not None:
+        return rows
+    uploads = _uploads(request_id)
+    _qc_index.pop(request_id, None)
+    if isinstance(uploads, SyntheticUploads) and not uploads.extra:
+        # generated uploads only: generated scores, one row per upload
+        rows = synthetic_qc_frame(_cfg, request_id, [uploads.key(i) for i in range(len(uploads))])
+    elif uploads:
+        rows = _engine_rows(request_id, list(uploads))
+    else:
+        # nothing uploaded: MOCK_QC_ROWS generated rows
+        rows = synthetic_qc_frame(_cfg, request_id)
+    _qc_store[request_id] = rows
     return rows
 
 
+def _score_incremental(request_id: str, keys: list[str]) -> None:
+    """Adds only the given uploads to the request's index and merges their rows into the results."""
+    rows = _qc_rows(request_id)
+    index = _qc_index.get(request_id)
+    if index is None:
+        # previous results were synthetic: full run
+        _qc_store.pop(request_id, None)
+        _qc_rows(request_id)
+        return
+
+    scored = {r["image_id"] for r in rows}
+    by_key = {u["key"]: u for u in _uploads(request_id)}
+    new = [by_key[k] for k in dict.fromkeys(keys) if k in by_key and k not in scored]
+    changed = index.add_many((u["key"], int(u["phash"], 16)) for u in new if u.get("phash"))
+
+    merged = []
+    for r in rows:
+        if r["image_id"] in changed:
+            # an old image got a closer neighbour among the new ones
+            r = _engine_row(request_id, by_key[r["image_id"]], index)
+        merged.append({**r, "is_new": False})
+    merged.extend(_engine_row(request_id, u, index, is_new=True) for u in new)
+    _qc_store[request_id] = merged
+
+
+def mock_run_qc(request_id: str, keys: list[str] | None = None) -> dict[str, Any]:
+    # simulated long-running job; results of the previous run are served until it is done.
+    # keys = incremental run: only these (newly uploaded) images are scored
+    _ensure_seed_data()
+    _require_request(request_id)
+    job_id = f"qcjob-{next(_qc_job_counter)}"
+    total = max(len(_uploads(request_id)), 1)
+    share = 1.0 if keys is None else min(max(len(keys) / total, 0.1), 1.0)
+    _qc_jobs[job_id] = {
+        "request_id": request_id,
+        "started": time.monotonic(),
+        "duration": max(settings.mock_qc_job_s * share, 0.001),
+        "keys": None if keys is None else list(keys),
+        "run_id": None,
+    }
+    return {"request_id": request_id, "status": "queued", "job_id": job_id, "incremental": keys is not None}
+
+
+def mock_qc_job(request_id: str, job_id: str) -> dict[str, Any]:
+    job = _qc_jobs.get(job_id)
+    if job is None or job["request_id"] != request_id:
+        raise ApiError(status_code=404, message="QC job not found")
+    elapsed = time.monotonic() - job["started"]
+    duration = job["duration"]
+    if elapsed < duration * 0.1:
+        return {"job_id": job_id, "request_id": request_id, "status": "queued", "progress": 0.0}
+    if elapsed < duration:
+        return {"job_id": job_id, "request_id": request_id, "status": "running", "progress": round(elapsed / duration, 3)}
+    if job["run_id"] is None:
+        # new run: cached result sets of the previous run become stale
+        if job["keys"] is None:
+            # snapshot of the uploads at the end of the run
+            _qc_store.pop(request_id, None)
+            _qc_rows(request_id)
+        else:
+            _score_incremental(request_id, job["keys"])
+        _qc_runs[request_id] = _qc_runs.get(request_id, 1) + 1
+        job["run_id"] = str(_qc_runs[request_id])
+    return {"job_id": job_id, "request_id": request_id, "status": "done", "progress": 1.0, "run_id": job["run_id"]}
+
+
+def mock_qc_results(request_id: str, query: QcQuery | None = None) -> dict[str, Any]:
+    _ensure_seed_data()
+    rows = _qc_rows(request_id)
+    if isinstance(rows, pd.DataFrame):
+        page = query_qc_frame(rows, query or QcQuery())
+        return {**page, "items": page["items"].to_dict("records")}
+    return query_qc_rows(rows, query or QcQuery())
+
+
+def mock_qc_results_columnar(request_id: str, if_run: str | None = None) -> bytes | None:
+    """Arrow IPC stream of the full result set; None if `if_run` is still the latest run (304)."""
+    _ensure_seed_data()
+    run_id = str(_qc_runs.setdefault(request_id, 1))
+    if if_run == run_id:
+        return None
+    return rows_to_arrow(_qc_rows(request_id), run_id)
+
+
+def mock_qc_summary(request_id: str, dup_thr: float, ai_thr: float) -> dict[str, Any]:
+    _ensure_seed_data()
+    rows = _qc_rows(request_id)
+    if isinstance(rows, pd.DataFrame):
+        return {"request_id": request_id, **summarize_qc_frame(rows, dup_thr, ai_thr)}
+    return {"request_id": request_id, **qc_summary(rows, dup_thr, ai_thr)}
+
+
 # ---------- Tasks ----------
-def mock_list_tasks() -> list[dict[str, Any]]:
+def mock_list_tasks(assignee: str | None = None, request_id: str | None = None) -> Sequence[dict[str, Any]]:
+    """Shared read-only snapshot (no copy per call); filters use the store indexes."""
     _ensure_seed_data()
-    return list(_tasks)
+    return _store.list_tasks(assignee=assignee, request_id=request_id)
 
 
 def mock_get_task(task_id: str) -> dict[str, Any]:
     _ensure_seed_data()
-    t = next((x for x in _tasks if str(x.get("id")) == str(task_id)), None)
+    t = _store.get_task(task_id)
     if not t:
         raise ApiError(status_code=404, message=f"Task not found (mock): {task_id}")
 
     request_id = str(t.get("request_id"))
-    req = next((r for r in _requests if str(r.get("id")) == request_id), None)
+    req = _store.get_request(request_id)
     classes = (req.get("classes") if req else None) or ["pothole", "crosswalk", "traffic_light", "road_sign"]
 
-    images = [{"image_id": f"{task_id}_img_{i:03d}", "url": None} for i in range(1, 11)]
+    images = [
+        {"image_id": image_id, "url": None, "labels": _labels_store.get((str(task_id), image_id), [])}
+        for image_id in image_ids(_cfg, str(task_id))
+    ]
     return {
         "id": t["id"],
         "title": t.get("title", f"Task {task_id}"),
@@ -138,61 +297,244 @@ def mock_get_task(task_id: str) -> dict[str, Any]:
     }
 
 
+def _set_labels(task_id: str, image_id: str, labels: list[str]) -> None:
+    # keeps per-task labeled counters so progress is O(1)
+    key = (str(task_id), str(image_id))
+    with _store.lock:
+        before = bool(_labels_store.get(key))
+        _labels_store[key] = list(labels)
+        after = bool(labels)
+        if before != after:
+            _labeled_counts[key[0]] = _labeled_counts.get(key[0], 0) + (1 if after else -1)
+        _progress_versions[key[0]] = _progress_versions.get(key[0], 0) + 1
+
+
 def mock_save_labels(task_id: str, image_id: str, labels: list[str]) -> dict[str, Any]:
     _ensure_seed_data()
-    _labels_store[(str(task_id), str(image_id))] = list(labels)
-    return {"status": "ok", "task_id": task_id, "image_id": image_id, "labels": labels}
+    if _store.get_task(task_id) is None:
+        raise ApiError(status_code=404, message=f"Task not found (mock): {task_id}")
+    _set_labels(task_id, image_id, labels)
+    return {"status": "saved", "task_id": task_id, "image_id": image_id, "labels": labels}
+
+
+def mock_save_labels_batch(
+    task_id: str, items: list[dict[str, Any]], client_id: str | None = None
+) -> dict[str, Any]:
+    _ensure_seed_data()
+    if _store.get_task(task_id) is None:
+        raise ApiError(status_code=404, message=f"Task not found (mock): {task_id}")
+
+    applied = 0
+    duplicates = 0
+    with _store.lock:
+        for it in items:
+            key = (str(task_id), str(it.get("image_id")))
+            seq = it.get("seq")
+            if client_id and seq is not None:
+                # replayed / out-of-order entries from the same client are ignored
+                last = _label_seq.get((str(client_id),) + key)
+                if last is not None and int(seq) <= last:
+                    duplicates += 1
+                    continue
+                _label_seq[(str(client_id),) + key] = int(seq)
+            _set_labels(key[0], key[1], list(it.get("labels") or []))
+            applied += 1
+    return {"task_id": str(task_id), "saved": applied, "duplicates": duplicates, "status": "saved"}
 
 
 # ---------- Uploads: MVP (mock) ----------
-def mock_upload_files_mvp(request_id: str, packed_files: list[tuple[str, bytes, str]]) -> dict[str, Any]:
+def _uploads(rid: str) -> MutableSequence[dict[str, Any]]:
+    _ensure_seed_data()
+    with _store.lock:
+        items = _uploads_store.get(rid)
+        if items is None:
+            # generated requests start with MOCK_UPLOADS_PER_REQUEST synthetic uploads (computed on access)
+            synthetic = _cfg.uploads_per_request and _store.get_request(rid) is not None
+            items = _uploads_store[rid] = SyntheticUploads(_cfg, rid) if synthetic else []
+        return items
+
+
+def _stored_hashes(rid: str) -> set[str]:
+    items = _uploads(rid)
+    if isinstance(items, SyntheticUploads):
+        # generated hashes never match real content: only uploads made in the UI are checked
+        items = items.extra
+    return {str(u["content_hash"]) for u in items if u.get("content_hash")}
+
+
+def _object_key(rid: str, filename: str, content_hash: str | None = None) -> str:
+    # one object per key: same-named uploads (different content, later waves) must not share one
+    prefix = str(content_hash)[:16] if content_hash else f"obj-{next(_object_counter)}"
+    return f"mock/{rid}/{prefix}/{filename}"
+
+
+def _perceptual_hash(content: UploadContent) -> str | None:
+    """Hex perceptual hash of an uploaded image (QC engine input); None for non-images."""
+    if isinstance(content, (bytes, bytearray)):
+        data = bytes(content)
+    else:
+        content.seek(0)
+        data = content.read()
+        content.seek(0)
+    h = image_hash(data)
+    return f"{h:016x}" if h is not None else None
+
+
+def mock_upload_files_mvp(request_id: str, packed_files: list[tuple[str, UploadContent, str]]) -> dict[str, Any]:
     _ensure_seed_data()
     rid = str(request_id)
-    items = _uploads_store.setdefault(rid, [])
+    _require_request(rid)
+    items = _uploads(rid)
+    known = _stored_hashes(rid)
+    uploaded = 0
+    skipped = 0
 
     for (fname, content, mime) in packed_files:
-        items.append(
-            {
-                "filename": fname,
-                "key": f"mock/{rid}/{fname}",
-                "etag": None,
-                "content_type": mime,
-                "size_bytes": len(content),
-                "created_at": _now_iso(),
-                "preview_url": None,
-            }
-        )
+        if isinstance(content, (bytes, bytearray)):
+            content_hash = hashlib.sha256(content).hexdigest()
+        else:
+            content_hash = hash_file(content)
+        item = {
+            "filename": fname,
+            "key": _object_key(rid, fname, content_hash),
+            "etag": None,
+            "content_type": mime,
+            "size_bytes": filelike_size(content),
+            "content_hash": content_hash,
+            "phash": _perceptual_hash(content),
+            "created_at": _now_iso(),
+            "preview_url": None,
+        }
+        # backend-side dedupe: exact duplicates are skipped
+        with _store.lock:
+            if content_hash in known:
+                skipped += 1
+                continue
+            known.add(content_hash)
+            items.append(item)
+        uploaded += 1
 
-    return {"status": "ok", "request_id": rid, "count": len(packed_files)}
+    return {
+        "status": "ok",
+        "request_id": rid,
+        "uploaded": uploaded,
+        "skipped": skipped,
+        "errors": [],
+        "count": uploaded,
+    }
 
 
 def mock_list_uploads(request_id: str) -> list[dict[str, Any]]:
     _ensure_seed_data()
-    return list(_uploads_store.get(str(request_id), []))
+    return list(_uploads(str(request_id)))
 
 
 # ---------- Uploads: presigned (mock) ----------
-def mock_presign_uploads(request_id: str, files: list[dict[str, Any]]) -> dict[str, Any]:
+def mock_presign_uploads(
+    request_id: str, files: list[dict[str, Any]], storage_url: str = "https://example.com/mock-presigned-url"
+) -> dict[str, Any]:
+    """`storage_url`: base of the PUT targets (the stand-in server passes its own /storage endpoint)."""
+    known = _stored_hashes(str(request_id))
     uploads = []
     for f in files:
         fn = f.get("filename") or "file.bin"
         ct = f.get("content_type") or "application/octet-stream"
-        uploads.append(
-            {
-                "filename": fn,
-                "url": "https://example.com/mock-presigned-url",
-                "method": "PUT",
-                "headers": {"Content-Type": ct},
-                "key": f"mock/{request_id}/{fn}",
+        size = int(f.get("size_bytes") or 0)
+        key = _object_key(str(request_id), fn, f.get("content_hash"))
+        rec: dict[str, Any] = {
+            "filename": fn,
+            "url": f"{storage_url}/{quote(key)}",
+            "method": "PUT",
+            "headers": {"Content-Type": ct},
+            "key": key,
+        }
+
+        if f.get("content_hash") and f["content_hash"] in known:
+            # backend-side dedupe: object with the same content already stored
+            rec["url"] = None
+            rec["exists"] = True
+        elif size >= settings.multipart_threshold_bytes:
+            part_size = settings.multipart_part_size
+            n_parts = max(1, -(-size // part_size))
+            # resume: UI sends back the upload_id of an unfinished multipart upload
+            upload_id = str(f.get("upload_id") or "")
+            if upload_id not in _multipart_store:
+                upload_id = f"mock-upload-{next(_upload_id_counter)}"
+            _multipart_store[upload_id] = {"request_id": str(request_id), "key": key, "parts": n_parts}
+            rec["url"] = None
+            rec["multipart"] = {
+                "upload_id": upload_id,
+                "part_size": part_size,
+                "parts": [
+                    {"part_number": n, "url": f"{storage_url}/{quote(key)}?uploadId={upload_id}&partNumber={n}"}
+                    for n in range(1, n_parts + 1)
+                ],
             }
-        )
+
+        uploads.append(rec)
     return {"uploads": uploads}
 
 
+def mock_put_object(key: str, data: bytes, upload_id: str | None = None, part_number: int | None = None) -> str:
+    """Storage side of one presigned PUT (whole object or one multipart part); returns its ETag."""
+    if upload_id is not None:
+        mp = _multipart_store.get(str(upload_id))
+        if not mp or mp["key"] != key:
+            raise ApiError(status_code=404, message=f"No such upload (mock): {upload_id}")
+        if not 1 <= int(part_number or 0) <= mp["parts"]:
+            raise ApiError(status_code=400, message=f"Invalid part number (mock): {part_number}")
+    else:
+        # "storage" keeps the perceptual hash for QC (multipart objects are not hashed)
+        _object_phash[key] = _perceptual_hash(data)
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+
+def mock_put_presigned(
+    jobs: list[PutJob],
+    *,
+    on_progress: Callable[[int, int], None] | None = None,
+    on_result: Callable[[PutResult], None] | None = None,
+    **_: Any,
+) -> list[PutResult]:
+    """Storage stand-in for put_presigned(): nothing is sent, content goes straight to mock_put_object()."""
+    results = []
+    for i, j in enumerate(jobs, start=1):
+        try:
+            etag = mock_put_object(j.key, b"".join(j.open_content()), j.upload_id, j.part_number)
+            r = PutResult(j.filename, j.key, etag=etag, part_number=j.part_number, upload_id=j.upload_id)
+        except ApiError as e:
+            r = PutResult(j.filename, j.key, error=str(e), part_number=j.part_number, upload_id=j.upload_id)
+        results.append(r)
+        if on_result:
+            on_result(r)
+        if on_progress:
+            on_progress(i, len(jobs))
+    return results
+
+
+def _check_multipart(rid: str, u: dict[str, Any]) -> None:
+    upload_id = str(u.get("upload_id"))
+    mp = _multipart_store.get(upload_id)
+    if not mp or mp["request_id"] != rid or mp["key"] != u.get("key"):
+        raise ApiError(status_code=400, message=f"Unknown multipart upload (mock): {upload_id}")
+
+    numbers = [p.get("part_number") for p in u.get("parts") or []]
+    if numbers != list(range(1, mp["parts"] + 1)):
+        raise ApiError(status_code=400, message=f"Parts must be 1..{mp['parts']} in order (mock): {upload_id}")
+    if any(not p.get("etag") for p in u["parts"]):
+        raise ApiError(status_code=400, message=f"Every part needs an etag (mock): {upload_id}")
+
+
 def mock_complete_uploads(request_id: str, uploaded: list[dict[str, Any]]) -> dict[str, Any]:
     rid = str(request_id)
-    items = _uploads_store.setdefault(rid, [])
     for u in uploaded:
+        if u.get("upload_id"):
+            _check_multipart(rid, u)
+
+    items = _uploads(rid)
+    for u in uploaded:
+        if u.get("upload_id"):
+            _multipart_store.pop(str(u["upload_id"]), None)
         items.append(
             {
                 "filename": u.get("filename"),
@@ -200,32 +542,51 @@ def mock_complete_uploads(request_id: str, uploaded: list[dict[str, Any]]) -> di
                 "etag": u.get("etag"),
                 "content_type": None,
                 "size_bytes": None,
+                "content_hash": u.get("content_hash"),
+                "phash": _object_phash.pop(str(u.get("key")), None),
                 "created_at": _now_iso(),
                 "preview_url": None,
             }
         )
     return {"status": "ok", "request_id": rid, "uploaded": uploaded}
 
-def mock_task_progress(task_id: str) -> dict[str, Any]:
+def mock_task_progress(task_id: str, if_version: int | None = None) -> dict[str, Any] | None:
+    """O(1): served from counters. With if_version: None when unchanged (like 304)."""
     _ensure_seed_data()
+    tid = str(task_id)
+    if _store.get_task(tid) is None:
+        raise ApiError(status_code=404, message=f"Task not found (mock): {task_id}")
 
-    task = mock_get_task(task_id)
-    images = task.get("images", [])
-    total = len(images)
-
-    labeled = 0
-    for img in images:
-        image_id = str(img.get("image_id"))
-        if _labels_store.get((str(task_id), image_id)):
-            labeled += 1
-
-    return {"task_id": str(task_id), "total_images": total, "labeled_images": labeled}
+    version = _progress_versions.get(tid, 0)
+    if if_version is not None and int(if_version) == version:
+        return None
+    return {
+        "task_id": tid,
+        "total_images": _cfg.images_per_task,
+        "labeled_images": _labeled_counts.get(tid, 0),
+        "version": version,
+    }
 
 
 def mock_complete_task(task_id: str) -> dict[str, Any]:
     _ensure_seed_data()
-    t = next((x for x in _tasks if str(x.get("id")) == str(task_id)), None)
-    if not t:
+    if _store.update_task(task_id, status="done") is None:
         raise ApiError(status_code=404, message=f"Task not found (mock): {task_id}")
-    t["status"] = "done"
     return {"status": "ok", "task_id": str(task_id)}
+
+
+def mock_assign_task(request_id: str, labeler_username: str) -> dict[str, Any]:
+    """Assigns the open task of the request to the labeler (creates one if there is none)."""
+    _ensure_seed_data()
+    rid = str(request_id)
+    _require_request(rid)
+    if labeler_username not in _USERS:
+        raise ApiError(status_code=400, message=f"Unknown labeler (mock): {labeler_username}")
+    with _store.lock:
+        task = next((t for t in _store.list_tasks(request_id=rid) if t.get("status") != "done"), None)
+        if task is None:
+            task = _store.add_task(
+                {"id": f"task-{next(_task_counter)}", "title": f"Label {rid}", "status": "open", "request_id": rid}
+            )
+        _store.update_task(task["id"], assignee=labeler_username, status="assigned")
+    return {"status": "assigned", "task_id": task["id"]}
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Iterator, Sequence, overload
+
+import numpy as np
+import pandas as pd
+
+from core.config import settings
+
+_TITLES = [
+    "Road images: City A -> City B",
+    "Winter roads: City C -> City D",
+    "Night traffic: City E",
+    "Highway signs: Route F",
+]
+_CLASSES = [
+    ["pothole", "crosswalk", "traffic_light", "road_sign"],
+    ["snow", "ice", "lane_marking"],
+    ["car", "truck", "pedestrian", "cyclist"],
+    ["speed_limit", "stop", "yield", "no_entry"],
+]
+_REQUEST_STATUSES = ["new", "in_progress", "qc", "done"]
+_LABELERS = 3
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    """
+    Size of the mock data set. Everything is derived from `seed` and the record
+    index, so the same config always yields the same data (defaults = the small
+    hand-made seed the UI always had).
+    """
+
+    seed: int = 42
+    requests: int = 2
+    tasks: int = 2
+    images_per_task: int = 10
+    uploads_per_request: int = 0
+    qc_rows: int = 25
+
+    @classmethod
+    def from_settings(cls) -> "SyntheticConfig":
+        return cls(
+            seed=settings.mock_seed,
+            requests=settings.mock_requests,
+            tasks=settings.mock_tasks,
+            images_per_task=settings.mock_images_per_task,
+            uploads_per_request=settings.mock_uploads_per_request,
+            qc_rows=settings.mock_qc_rows,
+        )
+
+
+def _sub_seed(cfg: SyntheticConfig, *parts: object) -> int:
+    # independent, stable stream per entity: no need to generate what comes before it
+    raw = "\n".join([str(cfg.seed), *map(str, parts)]).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "big")
+
+
+def request_id(i: int) -> str:
+    return f"req-{1001 + i}"
+
+
+def task_id(i: int) -> str:
+    return f"task-{5001 + i}"
+
+
+def iter_requests(cfg: SyntheticConfig) -> Iterator[dict[str, Any]]:
+    for i in range(cfg.requests):
+        yield {
+            "id": request_id(i),
+            "title": _TITLES[i % len(_TITLES)] if i < len(_TITLES) else f"{_TITLES[i % len(_TITLES)]} #{i + 1}",
+            "description": "Mock request",
+            "classes": list(_CLASSES[i % len(_CLASSES)]),
+            "status": _REQUEST_STATUSES[i % len(_REQUEST_STATUSES)],
+        }
+
+
+def iter_tasks(cfg: SyntheticConfig) -> Iterator[dict[str, Any]]:
+    for i in range(cfg.tasks):
+        rid = request_id(i % max(cfg.requests, 1))
+        assignee = f"labeler{(i // 2) % _LABELERS + 1}" if i % 2 == 0 else None
+        yield {
+            "id": task_id(i),
+            "title": f"Label {rid}",
+            "status": "assigned" if assignee else "open",
+            "request_id": rid,
+            "assignee": assignee,
+        }
+
+
+def image_ids(cfg: SyntheticConfig, owner_id: str) -> list[str]:
+    width = max(3, len(str(cfg.images_per_task)))
+    return [f"{owner_id}_img_{i:0{width}d}" for i in range(1, cfg.images_per_task + 1)]
+
+
+class SyntheticUploads(Sequence[dict[str, Any]]):
+    """
+    Upload records of one request computed on access (nothing is stored per item);
+    real uploads made in the UI are appended after them.
+    """
+
+    def __init__(self, cfg: SyntheticConfig, rid: str) -> None:
+        self.cfg = cfg
+        self.request_id = rid
+        self.extra: list[dict[str, Any]] = []
+        self._width = max(3, len(str(cfg.uploads_per_request)))
+
+    def __len__(self) -> int:
+        return self.cfg.uploads_per_request + len(self.extra)
+
+    def key(self, i: int) -> str:
+        return f"mock/{self.request_id}/img_{i + 1:0{self._width}d}.jpg"
+
+    def _item(self, i: int) -> dict[str, Any]:
+        seed = _sub_seed(self.cfg, self.request_id, "upload", i)
+        name = self.key(i).rsplit("/", 1)[-1]
+        return {
+            "filename": name,
+            "key": self.key(i),
+            "etag": None,
+            "content_type": "image/jpeg",
+            "size_bytes": 50_000 + seed % 2_000_000,
+            "content_hash": f"{seed:016x}".ljust(64, "0"),
+            "created_at": "2024-01-01T00:00:00+00:00",
+            "preview_url": None,
+        }
+
+    @overload
+    def __getitem__(self, i: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        n = self.cfg.uploads_per_request
+        return self._item(i) if i < n else self.extra[i - n]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for i in range(self.cfg.uploads_per_request):
+            yield self._item(i)
+        yield from list(self.extra)
+
+    def append(self, item: dict[str, Any]) -> None:
+        self.extra.append(item)
+
+
+def synthetic_qc_frame(cfg: SyntheticConfig, rid: str, keys: Sequence[str] | None = None) -> pd.DataFrame:
+    """
+    QC result set generated column-wise with numpy (1M rows in well under a second).
+    Scores are mostly low with a tail of near-duplicates / AI-generated images.
+    """
+    if keys is None:
+        width = max(3, len(str(cfg.qc_rows)))
+        keys = [f"{rid}_img_{i:0{width}d}" for i in range(1, cfg.qc_rows + 1)]
+    rng = np.random.default_rng(_sub_seed(cfg, rid, "qc"))
+    n = len(keys)
+    return pd.DataFrame(
+        {
+            "request_id": rid,
+            "image_id": pd.array(keys, dtype="string"),
+            "duplicate_score": rng.beta(0.6, 2.5, n).round(4),
+            "ai_generated_score": rng.beta(0.5, 3.0, n).round(4),
+        }
+    )
@@ -0,0 +1,502 @@
+"""
+Local HTTP stand-in for the backend (every endpoint of API_CONTRACT.md) on top of core/mock_backend.py,
+including the presigned PUT targets (/storage/...). The UI then runs with USE_MOCK=0 and talks to it
+through the real ApiClient (serialization, error mapping, timeouts, connection pool):
+
+    python -m core.mock_server --port 8000 --latency-ms 20 --jitter-ms 30 --error-rate 0.01
+    USE_MOCK=0 BACKEND_URL=http://127.0.0.1:8000 python -m streamlit run app.py
+
+Latency and error injection default to MOCK_SERVER_* settings. Standard library only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import email.parser
+import email.policy
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+
+from core import mock_backend
+from core.api_client import ApiError
+from core.config import settings
+from core.qc import ARROW_STREAM, QcQuery
+from core.qc_columnar import columnar_available
+from core.qc_export import EXPORT_FORMATS, export_formats, page_chunks, spooled_file, write_export
+
+_STREAM_CHUNK = 64 * 1024
+
+
+@dataclass
+class Faults:
+    """Latency and error injection, applied to every request before it is handled."""
+
+    latency_ms: float = field(default_factory=lambda: settings.mock_server_latency_ms)
+    jitter_ms: float = field(default_factory=lambda: settings.mock_server_jitter_ms)
+    error_rate: float = field(default_factory=lambda: settings.mock_server_error_rate)
+    error_statuses: tuple[int, ...] = field(
+        default_factory=lambda: tuple(int(s) for s in settings.mock_server_error_statuses.split(",") if s.strip())
+    )
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def delay_s(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms > 0 else 0.0
+        return max(self.latency_ms + jitter, 0.0) / 1000
+
+    def error_status(self) -> Optional[int]:
+        if self.error_rate <= 0 or not self.error_statuses:
+            return None
+        with self._lock:
+            if self._random.random() >= self.error_rate:
+                return None
+            return self._random.choice(self.error_statuses)
+
+
+@dataclass
+class Response:
+    status: int = 200
+    body: Any = None  # JSON value, bytes, or a binary file object (sent chunked, then closed)
+    content_type: str = "application/json"
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+Handler = Callable[["_Handler", re.Match], Response]
+_ROUTES: list[tuple[str, re.Pattern, str, Handler]] = []  # (method, path, auth: "" | "user" | "admin", handler)
+
+
+def route(method: str, pattern: str, auth: str = "user") -> Callable[[Handler], Handler]:
+    def register(fn: Handler) -> Handler:
+        _ROUTES.append((method, re.compile(f"^{pattern}$"), auth, fn))
+        return fn
+
+    return register
+
+
+def _json_default(value: Any) -> Any:
+    # pandas/numpy scalars from the synthetic QC frames
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _etag_value(header: Optional[str]) -> Optional[str]:
+    if not header:
+        return None
+    value = header.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    return value.strip('"')
+
+
+# ---------- Auth ----------
+@route("POST", "/auth/login", auth="")
+def login(h: "_Handler", m: re.Match) -> Response:
+    body = h.json_body()
+    return Response(body=mock_backend.mock_login(str(body.get("username") or ""), str(body.get("password") or "")))
+
+
+# ---------- Requests ----------
+@route("POST", "/requests")
+def create_request(h: "_Handler", m: re.Match) -> Response:
+    body = h.json_body()
+    req = mock_backend.mock_create_request(
+        str(body.get("title") or ""), str(body.get("description") or ""), list(body.get("classes") or [])
+    )
+    return Response(status=201, body=req)
+
+
+@route("GET", "/requests")
+def list_requests(h: "_Handler", m: re.Match) -> Response:
+    return Response(body=list(mock_backend.mock_list_requests()))
+
+
+@route("GET", "/admin/requests", auth="admin")
+def admin_list_requests(h: "_Handler", m: re.Match) -> Response:
+    return Response(body=list(mock_backend.mock_list_requests()))
+
+
+# ---------- Uploads ----------
+@route("POST", r"/requests/(?P<rid>[^/]+)/uploads")
+def upload_files(h: "_Handler", m: re.Match) -> Response:
+    content_type = h.headers.get("Content-Type", "")
+    if not content_type.startswith("multipart/form-data"):
+        raise ApiError(status_code=400, message="Expected multipart/form-data")
+    msg = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + h.body()
+    )
+    packed = [
+        (part.get_filename() or "file.bin", part.get_payload(decode=True) or b"", part.get_content_type())
+        for part in msg.iter_parts()
+        if part.get_param("name", header="content-disposition") == "files"
+    ]
+    return Response(body=mock_backend.mock_upload_files_mvp(m["rid"], packed))
+
+
+@route("GET", r"/requests/(?P<rid>[^/]+)/uploads")
+def list_uploads(h: "_Handler", m: re.Match) -> Response:
+    return Response(body=mock_backend.mock_list_uploads(m["rid"]))
+
+
+@route("POST", "/uploads/presign")
+def presign(h: "_Handler", m: re.Match) -> Response:
+    body = h.json_body()
+    storage_url = f"http://{h.headers.get('Host') or '%s:%s' % h.server.server_address[:2]}/storage"
+    return Response(body=mock_backend.mock_presign_uploads(str(body.get("request_id")), list(body.get("files") or []), storage_url))
+
+
+@route("PUT", r"/storage/(?P<key>.+)", auth="")
+def put_object(h: "_Handler", m: re.Match) -> Response:
+    # presigned target: the URL itself is the credential, no Authorization header
+    upload_id = h.query.get("uploadId")
+    part_number = int(h.query["partNumber"]) if "partNumber" in h.query else None
+    etag = mock_backend.mock_put_object(unquote(m["key"]), h.body(), upload_id, part_number)
+    return Response(body=b"", content_type="application/octet-stream", headers={"ETag": etag})
+
+
+@route("POST", "/uploads/complete")
+def complete_uploads(h: "_Handler", m: re.Match) -> Response:
+    body = h.json_body()
+    return Response(body=mock_backend.mock_complete_uploads(str(body.get("request_id")), list(body.get("uploaded") or [])))
+
+
+# ---------- QC ----------
+@route("POST", r"/requests/(?P<rid>[^/]+)/qc/run")
+def run_qc(h: "_Handler", m: re.Match) -> Response:
+    body = h.json_body() if h.content_length() else {}
+    keys = body.get("keys") if isinstance(body, dict) else None
+    return Response(body=mock_backend.mock_run_qc(m["rid"], keys=None if keys is None else [str(k) for k in keys]))
+
+
+@route("GET", r"/requests/(?P<rid>[^/]+)/qc/jobs/(?P<job_id>[^/]+)")
+def qc_job(h: "_Handler", m: re.Match) -> Response:
+    return Response(body=mock_backend.mock_qc_job(m["rid"], m["job_id"]))
+
+
+@route("GET", r"/requests/(?P<rid>[^/]+)/qc/results")
+def qc_results(h: "_Handler", m: re.Match) -> Response:
+    wants_arrow = h.query.get("format") == "arrow" or ARROW_STREAM in h.headers.get("Accept", "")
+    if wants_arrow and columnar_available():
+        data = mock_backend.mock_qc_results_columnar(m["rid"], if_run=_etag_value(h.headers.get("If-None-Match")))
+        if data is None:
+            return Response(status=304)
+        return Response(body=data, content_type=ARROW_STREAM)
+    return Response(body=mock_backend.mock_qc_results(m["rid"], h.qc_query()))
+
+
+@route("GET", r"/requests/(?P<rid>[^/]+)/qc/export")
+def qc_export(h: "_Handler", m: re.Match) -> Response:
+    fmt = h.query.get("format", "csv")
+    if fmt not in export_formats():
+        raise ApiError(status_code=400, message=f"Unsupported export format: {fmt}")
+    rid = m["rid"]
+    f = spooled_file()
+    try:
+        write_export(page_chunks(lambda q: mock_backend.mock_qc_results(rid, q), h.qc_query()), fmt, f)
+    except Exception:
+        f.close()
+        raise
+    f.seek(0)
+    ext, mime = EXPORT_FORMATS[fmt]
+    return Response(body=f, content_type=mime, headers={"Content-Disposition": f'attachment; filename="qc_{rid}.{ext}"'})
+
+
+@route("GET", r"/requests/(?P<rid>[^/]+)/qc/summary")
+def qc_summary(h: "_Handler", m: re.Match) -> Response:
+    query = h.qc_query()
+    return Response(body=mock_backend.mock_qc_summary(m["rid"], query.dup_thr, query.ai_thr))
+
+
+# ---------- Tasks ----------
+@route("GET", "/tasks")
+def list_tasks(h: "_Handler", m: re.Match) -> Response:
+    # labelers see their own tasks, admin/universal see all
+    assignee = h.user if h.role == "labeler" else None
+    return Response(body=list(mock_backend.mock_list_tasks(assignee=assignee)))
+
+
+@route("GET", "/admin/tasks", auth="admin")
+def admin_list_tasks(h: "_Handler", m: re.Match) -> Response:
+    return Response(body=list(mock_backend.mock_list_tasks()))
+
+
+@route("GET", r"/tasks/(?P<tid>[^/]+)")
+def get_task(h: "_Handler", m: re.Match) -> Response:
+    return Response(body=mock_backend.mock_get_task(m["tid"]))
+
+
+@route("POST", r"/tasks/(?P<tid>[^/]+)/labels")
+def save_labels(h: "_Handler", m: re.Match) -> Response:
+    body = h.json_body()
+    labels = body.get("labels")
+    if not body.get("image_id") or not isinstance(labels, list):
+        raise ApiError(status_code=400, message="image_id and labels are required")
+    return Response(body=mock_backend.mock_save_labels(m["tid"], str(body["image_id"]), [str(x) for x in labels]))
+
+
+@route("POST", r"/tasks/(?P<tid>[^/]+)/labels:batch")
+def save_labels_batch(h: "_Handler", m: re.Match) -> Response:
+    body = h.json_body()
+    return Response(body=mock_backend.mock_save_labels_batch(m["tid"], list(body.get("items") or []), body.get("client_id")))
+
+
+@route("GET", r"/tasks/(?P<tid>[^/]+)/progress")
+def task_progress(h: "_Handler", m: re.Match) -> Response:
+    if_version = _etag_value(h.headers.get("If-None-Match"))
+    try:
+        version = int(if_version) if if_version is not None else None
+    except ValueError:
+        version = None
+    data = mock_backend.mock_task_progress(m["tid"], if_version=version)
+    if data is None:
+        return Response(status=304, headers={"ETag": f'"{version}"'})
+    return Response(body=data, headers={"ETag": f'"{data["version"]}"'})
+
+
+@route("POST", r"/tasks/(?P<tid>[^/]+)/complete")
+def complete_task(h: "_Handler", m: re.Match) -> Response:
+    return Response(body=mock_backend.mock_complete_task(m["tid"]))
+
+
+# ---------- Admin ----------
+@route("GET", "/admin/users", auth="admin")
+def admin_list_users(h: "_Handler", m: re.Match) -> Response:
+    return Response(body=mock_backend.mock_list_users())
+
+
+@route("POST", "/admin/assign", auth="admin")
+def admin_assign(h: "_Handler", m: re.Match) -> Response:
+    body = h.json_body()
+    return Response(
+        body=mock_backend.mock_assign_task(str(body.get("request_id")), str(body.get("labeler_username") or ""))
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: the UI reuses pooled connections
+    # headers and body go out in separate writes: without this, Nagle + delayed ACK add ~40 ms per response
+    disable_nagle_algorithm = True
+    server: "MockServer"
+
+    user: str = ""
+    role: str = ""
+
+    # ---------- request helpers ----------
+    def content_length(self) -> int:
+        return int(self.headers.get("Content-Length") or 0)
+
+    def body(self) -> bytes:
+        if getattr(self, "_body", None) is None:
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                self._body = self._read_chunked()
+            else:
+                n = self.content_length()
+                if n > self.server.max_body_bytes:
+                    raise ApiError(status_code=413, message="Payload too large (mock)")
+                self._body = self.rfile.read(n)
+        return self._body
+
+    def _read_chunked(self) -> bytes:
+        parts: list[bytes] = []
+        size = 0
+        while True:
+            n = int(self.rfile.readline().split(b";", 1)[0].strip() or b"0", 16)
+            if n == 0:
+                # trailers up to the empty line
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(parts)
+            size += n
+            if size > self.server.max_body_bytes:
+                raise ApiError(status_code=413, message="Payload too large (mock)")
+            parts.append(self.rfile.read(n))
+            self.rfile.readline()
+
+    def json_body(self) -> Any:
+        raw = self.body()
+        if not raw:
+            return {}
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise ApiError(status_code=400, message=f"Invalid JSON: {e}") from e
+        return data if data is not None else {}
+
+    def qc_query(self) -> QcQuery:
+        try:
+            return QcQuery.from_params(self.query)
+        except ValueError as e:
+            raise ApiError(status_code=400, message=f"Invalid QC query: {e}") from e
+
+    # ---------- dispatch ----------
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def _dispatch(self, method: str) -> None:
+        self._body = None
+        url = urlsplit(self.path)
+        self.query = dict(parse_qsl(url.query))
+        try:
+            resp = self._handle(method, url.path)
+        except ApiError as e:
+            resp = Response(status=e.status_code or 500, body={"detail": e.message})
+        except Exception as e:
+            self.log_error("%s %s failed: %r", method, url.path, e)
+            resp = Response(status=500, body={"detail": f"Internal error (mock): {e}"})
+        if method != "GET" and self._body is None:
+            # unread body would be taken for the next request on this connection
+            self._drain()
+        self._send(resp)
+
+    def _handle(self, method: str, path: str) -> Response:
+        faults = self.server.faults
+        delay = faults.delay_s()
+        if delay:
+            time.sleep(delay)
+        status = faults.error_status()
+        if status is not None:
+            return Response(status=status, body={"detail": f"Injected error (mock server): {status}"})
+
+        path_matched = False
+        for route_method, pattern, auth, fn in _ROUTES:
+            m = pattern.match(path)
+            if m is None:
+                continue
+            path_matched = True
+            if route_method != method:
+                continue
+            if auth:
+                self._authenticate(admin=auth == "admin")
+            return fn(self, m)
+        if path_matched:
+            return Response(status=405, body={"detail": "Method not allowed"})
+        return Response(status=404, body={"detail": "Not found"})
+
+    def _authenticate(self, admin: bool) -> None:
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            raise ApiError(status_code=401, message="Not authenticated")
+        self.user, self.role = mock_backend.mock_token_user(header[len("Bearer ") :].strip())
+        if admin and self.role not in ("admin", "universal"):
+            raise ApiError(status_code=403, message="Admin role required")
+
+    def _drain(self) -> None:
+        try:
+            self.body()
+        except ApiError:
+            # too large to read: do not reuse the connection
+            self.close_connection = True
+
+    def _send(self, resp: Response) -> None:
+        self.send_response(resp.status)
+        for k, v in resp.headers.items():
+            self.send_header(k, v)
+        if resp.status == 304:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_header("Content-Type", resp.content_type)
+        if hasattr(resp.body, "read"):
+            # file body: streamed chunk by chunk
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            with resp.body as f:
+                while chunk := f.read(_STREAM_CHUNK):
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        if isinstance(resp.body, (bytes, bytearray)):
+            data = bytes(resp.body)
+        else:
+            data = json.dumps(resp.body, default=_json_default).encode("utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class MockServer(ThreadingHTTPServer):
+    """Threaded HTTP server (one thread per connection) serving the mock backend."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 8000),
+        *,
+        faults: Optional[Faults] = None,
+        max_body_mb: Optional[int] = None,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.faults = faults or Faults()
+        self.max_body_bytes = int(max_body_mb or settings.mock_server_max_body_mb) * 1024 * 1024
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        """Serves in a daemon thread (e.g. inside a benchmark / load test); stop with shutdown()."""
+        threading.Thread(target=self.serve_forever, name="mock-server", daemon=True).start()
+        return self
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    p = argparse.ArgumentParser(description="Local HTTP stand-in backend (API_CONTRACT.md on top of the mock backend)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument("--latency-ms", type=float, default=settings.mock_server_latency_ms)
+    p.add_argument("--jitter-ms", type=float, default=settings.mock_server_jitter_ms)
+    p.add_argument("--error-rate", type=float, default=settings.mock_server_error_rate)
+    p.add_argument("--error-statuses", default=settings.mock_server_error_statuses, help="comma separated, e.g. 500,503")
+    p.add_argument("--seed", type=int, default=None, help="seed of the latency/error injection")
+    p.add_argument("--max-body-mb", type=int, default=settings.mock_server_max_body_mb)
+    p.add_argument("--quiet", action="store_true", help="no access log")
+    args = p.parse_args(argv)
+
+    faults = Faults(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(s) for s in args.error_statuses.split(",") if s.strip()),
+        seed=args.seed,
+    )
+    server = MockServer((args.host, args.port), faults=faults, max_body_mb=args.max_body_mb, verbose=not args.quiet)
+    print(f"Mock backend on {server.url} (latency {faults.latency_ms}+{faults.jitter_ms} ms, errors {faults.error_rate:.1%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional
+
+Record = dict[str, Any]
+
+
+class _Table:
+    """
+    Records by id plus secondary indexes (field value -> ids, in insertion order).
+    Records are replaced on update, never mutated, so snapshots can be shared.
+    """
+
+    def __init__(self, indexed: tuple[str, ...]) -> None:
+        self._rows: dict[str, Record] = {}
+        self._indexes: dict[str, dict[Any, dict[str, None]]] = {field: {} for field in indexed}
+        self._snapshot: Optional[tuple[Record, ...]] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, rid: str) -> Optional[Record]:
+        return self._rows.get(rid)
+
+    def put(self, row: Record) -> Record:
+        rid = str(row["id"])
+        old = self._rows.get(rid)
+        for field, index in self._indexes.items():
+            if old is not None:
+                ids = index.get(old.get(field))
+                if ids is not None:
+                    ids.pop(rid, None)
+                    if not ids:
+                        del index[old.get(field)]
+            index.setdefault(row.get(field), {})[rid] = None
+        self._rows[rid] = row
+        self._snapshot = None
+        return row
+
+    def all(self) -> tuple[Record, ...]:
+        # rebuilt only after a write; readers share the same tuple
+        if self._snapshot is None:
+            self._snapshot = tuple(self._rows.values())
+        return self._snapshot
+
+    def by(self, field: str, value: Any) -> tuple[Record, ...]:
+        return tuple(self._rows[rid] for rid in self._indexes[field].get(value, ()))
+
+
+class MockStore:
+    """
+    Requests and tasks of the mock backend keyed by id, with secondary indexes
+    (tasks by assignee / request_id, requests by status). One lock for all
+    operations: Streamlit runs sessions in parallel threads.
+
+    Returned records and lists are shared snapshots: treat them as read-only and
+    change records through update_*().
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self._requests = _Table(("status",))
+        self._tasks = _Table(("assignee", "request_id"))
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._requests) + len(self._tasks)
+
+    # ---------- Requests ----------
+    def add_request(self, req: Record) -> Record:
+        with self.lock:
+            return self._requests.put(dict(req))
+
+    def get_request(self, request_id: str) -> Optional[Record]:
+        with self.lock:
+            return self._requests.get(str(request_id))
+
+    def update_request(self, request_id: str, **fields: Any) -> Optional[Record]:
+        with self.lock:
+            req = self._requests.get(str(request_id))
+            return self._requests.put({**req, **fields}) if req is not None else None
+
+    def list_requests(self, status: Optional[str] = None) -> tuple[Record, ...]:
+        with self.lock:
+            return self._requests.all() if status is None else self._requests.by("status", status)
+
+    # ---------- Tasks ----------
+    def add_task(self, task: Record) -> Record:
+        with self.lock:
+            return self._tasks.put(dict(task))
+
+    def get_task(self, task_id: str) -> Optional[Record]:
+        with self.lock:
+            return self._tasks.get(str(task_id))
+
+    def update_task(self, task_id: str, **fields: Any) -> Optional[Record]:
+        with self.lock:
+            task = self._tasks.get(str(task_id))
+            return self._tasks.put({**task, **fields}) if task is not None else None
+
+    def list_tasks(self, *, assignee: Optional[str] = None, request_id: Optional[str] = None) -> tuple[Record, ...]:
+        with self.lock:
+            if assignee is not None:
+                rows = self._tasks.by("assignee", assignee)
+                return tuple(t for t in rows if request_id is None or t.get("request_id") == request_id)
+            if request_id is not None:
+                return self._tasks.by("request_id", request_id)
+            return self._tasks.all()
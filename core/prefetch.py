@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from core.config import settings
+from core.thumbnails import get_preview_cache, thumbnails_for_urls, url_key
+
+# shared by all sessions; each session has its own ImagePrefetcher (cache) on top
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="image-prefetch")
+
+
+class ImagePrefetcher:
+    """
+    Downloads and decodes (downscales to `size`) the next images of a task in the
+    background and keeps the ready-to-show bytes in a bounded in-memory LRU.
+    Keep one per session (st.session_state) so it survives reruns; switching the
+    task drops the cache and cancels pending work.
+    """
+
+    def __init__(self, max_items: int | None = None, size: int | None = None) -> None:
+        self.max_items = int(max_items or settings.prefetch_cache_items)
+        self.size = int(size or settings.preview_max_side)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._task_id: Optional[str] = None
+        self._generation = 0
+
+    def set_task(self, task_id: str) -> None:
+        with self._lock:
+            if task_id == self._task_id:
+                return
+            self._task_id = task_id
+            self._generation += 1
+            for fut in self._inflight.values():
+                fut.cancel()
+            self._inflight.clear()
+            self._cache.clear()
+
+    def _load(self, url: str, generation: int) -> Optional[bytes]:
+        key = url_key(url)
+        try:
+            data = thumbnails_for_urls([(key, url)], size=self.size, cache=get_preview_cache()).get(key)
+        except Exception:
+            data = None
+        with self._lock:
+            self._inflight.pop(url, None)
+            # results for a previous task are dropped
+            if data is not None and generation == self._generation:
+                self._cache[url] = data
+                self._cache.move_to_end(url)
+                while len(self._cache) > self.max_items:
+                    self._cache.popitem(last=False)
+        return data
+
+    def prefetch(self, urls: list[Optional[str]]) -> None:
+        with self._lock:
+            generation = self._generation
+            for url in urls:
+                if url and url not in self._cache and url not in self._inflight:
+                    self._inflight[url] = _executor.submit(self._load, url, generation)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Ready bytes for url: from cache, by waiting for an in-flight prefetch, or loaded now."""
+        with self._lock:
+            data = self._cache.get(url)
+            if data is not None:
+                self._cache.move_to_end(url)
+                return data
+            fut = self._inflight.get(url)
+            generation = self._generation
+
+        if fut is None:
+            return self._load(url, generation)
+        try:
+            return fut.result(timeout=settings.request_timeout_s)
+        except Exception:
+            return None
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+from core.config import settings
+
+
+class ProgressTracker:
+    """
+    Task progress computed locally from the labels saved in this session.
+    Seeded from per-image `labels` in the task payload (when backend sends them) and
+    reconciled with GET /tasks/{id}/progress only every PROGRESS_SYNC_INTERVAL_S,
+    as a conditional request on the last seen `version`.
+    """
+
+    def __init__(self, task_id: str, images: list[dict[str, Any]]) -> None:
+        self.task_id = str(task_id)
+        self.total = len(images)
+        self.version: Optional[int] = None
+        self._labeled: set[str] = {str(img.get("image_id")) for img in images if img.get("labels")}
+        # server count minus what we can see locally (images labeled elsewhere / unknown to us)
+        self._offset = 0
+        self._last_sync = 0.0
+
+    @property
+    def labeled(self) -> int:
+        return max(0, min(self.total, len(self._labeled) + self._offset))
+
+    @property
+    def remaining(self) -> int:
+        return max(self.total - self.labeled, 0)
+
+    def record(self, image_id: str, labels: list[str]) -> None:
+        if labels:
+            self._labeled.add(str(image_id))
+        else:
+            self._labeled.discard(str(image_id))
+
+    def sync_due(self) -> bool:
+        return not self._last_sync or time.monotonic() - self._last_sync >= settings.progress_sync_interval_s
+
+    def reconcile(self, progress: Optional[dict[str, Any]], *, pending: int = 0) -> None:
+        """
+        Apply a server progress response. None = not modified since `version`.
+        While labels are still queued locally the server count lags, so the
+        counts are left alone and only the sync time moves.
+        """
+        self._last_sync = time.monotonic()
+        if progress is None or pending:
+            return
+        if progress.get("total_images") is not None:
+            self.total = int(progress["total_images"])
+        if progress.get("labeled_images") is not None:
+            self._offset = int(progress["labeled_images"]) - len(self._labeled)
+        if progress.get("version") is not None:
+            self.version = int(progress["version"])
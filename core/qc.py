@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+QC_SORT_KEYS = ("duplicate_score", "ai_generated_score", "image_id")
+# columnar QC transport (full result set as Arrow IPC stream, see core/qc_columnar.py)
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+@dataclass(frozen=True)
+class QcQuery:
+    """Filter/sort/page of GET /requests/{id}/qc/results (evaluated by backend)."""
+
+    dup_thr: float = 0.85
+    ai_thr: float = 0.80
+    only_flagged: bool = False
+    only_duplicates: bool = False
+    only_ai: bool = False
+    # rows scored by the latest incremental QC run
+    only_new: bool = False
+    sort_by: str = "duplicate_score"
+    sort_desc: bool = True
+    limit: int = 200
+    cursor: Optional[str] = None
+
+    def params(self) -> dict[str, Any]:
+        params: dict[str, Any] = {
+            "dup_thr": self.dup_thr,
+            "ai_thr": self.ai_thr,
+            "sort": self.sort_by,
+            "order": "desc" if self.sort_desc else "asc",
+            "limit": self.limit,
+        }
+        if self.only_flagged:
+            params["flagged"] = "true"
+        if self.only_duplicates:
+            params["duplicates"] = "true"
+        if self.only_ai:
+            params["ai"] = "true"
+        if self.only_new:
+            params["new"] = "true"
+        if self.cursor:
+            params["cursor"] = self.cursor
+        return params
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, str]) -> "QcQuery":
+        """Inverse of params() (backend side, e.g. core/mock_server.py); ValueError on bad numbers."""
+        default = cls()
+        return cls(
+            dup_thr=float(params.get("dup_thr", default.dup_thr)),
+            ai_thr=float(params.get("ai_thr", default.ai_thr)),
+            only_flagged=params.get("flagged") == "true",
+            only_duplicates=params.get("duplicates") == "true",
+            only_ai=params.get("ai") == "true",
+            only_new=params.get("new") == "true",
+            sort_by=params.get("sort", default.sort_by),
+            sort_desc=params.get("order", "desc") != "asc",
+            limit=int(params.get("limit", default.limit)),
+            cursor=params.get("cursor") or None,
+        )
+
+
+def _score(row: dict[str, Any], key: str) -> float:
+    try:
+        return float(row.get(key) or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def qc_flags(row: dict[str, Any], dup_thr: float, ai_thr: float) -> tuple[bool, bool]:
+    """(is_duplicate, is_ai) of one QC row."""
+    return _score(row, "duplicate_score") >= dup_thr, _score(row, "ai_generated_score") >= ai_thr
+
+
+def qc_summary(rows: list[dict[str, Any]], dup_thr: float, ai_thr: float) -> dict[str, int]:
+    """Aggregate counts of GET /requests/{id}/qc/summary."""
+    total = flagged = duplicates = ai = 0
+    for row in rows:
+        is_dup, is_ai = qc_flags(row, dup_thr, ai_thr)
+        total += 1
+        duplicates += is_dup
+        ai += is_ai
+        flagged += is_dup or is_ai
+    return {"total": total, "flagged": flagged, "duplicates": duplicates, "ai_generated": ai}
+
+
+def query_qc_rows(rows: list[dict[str, Any]], query: QcQuery) -> dict[str, Any]:
+    """
+    Reference semantics of the QC results query (mock backend, legacy backends returning a plain list).
+    Cursor is an opaque string; here it is the offset of the next page.
+    """
+    matched: list[dict[str, Any]] = []
+    for row in rows:
+        is_dup, is_ai = qc_flags(row, query.dup_thr, query.ai_thr)
+        if query.only_flagged and not (is_dup or is_ai):
+            continue
+        if query.only_duplicates and not is_dup:
+            continue
+        if query.only_ai and not is_ai:
+            continue
+        if query.only_new and not row.get("is_new"):
+            continue
+        matched.append({**row, "is_duplicate": is_dup, "is_ai": is_ai, "is_flagged": is_dup or is_ai})
+
+    sort_by = query.sort_by if query.sort_by in QC_SORT_KEYS else "duplicate_score"
+    if sort_by == "image_id":
+        matched.sort(key=lambda r: str(r.get("image_id", "")), reverse=query.sort_desc)
+    else:
+        # image_id as tie-breaker keeps pages stable
+        matched.sort(key=lambda r: str(r.get("image_id", "")))
+        matched.sort(key=lambda r: _score(r, sort_by), reverse=query.sort_desc)
+
+    try:
+        offset = max(int(query.cursor or 0), 0)
+    except ValueError:
+        offset = 0
+    limit = max(int(query.limit), 1)
+    items = matched[offset : offset + limit]
+    next_cursor = str(offset + limit) if offset + limit < len(matched) else None
+    return {"items": items, "next_cursor": next_cursor, "total": len(matched)}
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import pandas as pd
+
+from core.config import settings
+from core.qc import QC_SORT_KEYS, QcQuery
+
+# QC run id travels in the Arrow schema metadata
+RUN_ID_KEY = b"qc_run_id"
+
+
+def columnar_available() -> bool:
+    # Arrow support needs the optional `pyarrow` package
+    if not settings.qc_columnar:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def rows_to_arrow(rows: list[dict[str, Any]] | pd.DataFrame, run_id: str) -> bytes:
+    import pyarrow as pa
+
+    if isinstance(rows, pd.DataFrame):
+        table = pa.Table.from_pandas(rows, preserve_index=False)
+    else:
+        table = pa.Table.from_pylist(rows)
+    table = table.replace_schema_metadata({RUN_ID_KEY: str(run_id).encode("utf-8")})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def arrow_to_frame(data: bytes) -> tuple[Optional[str], pd.DataFrame]:
+    """(run_id, frame) of an Arrow IPC stream; score columns are float, image_id string."""
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+    meta = table.schema.metadata or {}
+    run_id = meta[RUN_ID_KEY].decode("utf-8") if RUN_ID_KEY in meta else None
+    df = table.to_pandas()
+    if "image_id" not in df.columns:
+        df["image_id"] = df.index.astype(str)
+    df["image_id"] = df["image_id"].astype(str)
+    for col in ("duplicate_score", "ai_generated_score"):
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0) if col in df.columns else 0.0
+    return run_id, df
+
+
+class QcColumnCache:
+    """
+    QC result sets in Arrow IPC format on disk, one file per request_id (latest QC run only).
+    Threshold/filter changes are evaluated on the cached columns, without network.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, request_id: str) -> str:
+        return os.path.join(self.root, hashlib.sha256(request_id.encode("utf-8")).hexdigest()[:32] + ".arrow")
+
+    def get(self, request_id: str) -> Optional[tuple[Optional[str], pd.DataFrame]]:
+        path = self._path(request_id)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            return arrow_to_frame(data)
+        except Exception:
+            # corrupted/partial file: drop it, next load refetches
+            self.invalidate(request_id)
+            return None
+
+    def put(self, request_id: str, data: bytes) -> None:
+        path = self._path(request_id)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+    def invalidate(self, request_id: str) -> None:
+        try:
+            os.remove(self._path(request_id))
+        except FileNotFoundError:
+            pass
+
+
+_cache: Optional[QcColumnCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_qc_cache() -> QcColumnCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = QcColumnCache(settings.qc_cache_dir)
+        return _cache
+
+
+class QcFrameMemo:
+    """
+    Parsed QC frames in memory, shared by sessions: bounded LRU with TTL.
+    Within the TTL a rerun (slider move, paging) uses the frame as is, without
+    disk read or revalidation request; Run QC drops the entry explicitly.
+    """
+
+    def __init__(self, max_items: int | None = None, ttl_s: float | None = None) -> None:
+        self.max_items = int(max_items or settings.qc_frame_cache_items)
+        self.ttl_s = float(settings.qc_frame_ttl_s if ttl_s is None else ttl_s)
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, tuple[float, Optional[str], pd.DataFrame]]" = OrderedDict()
+
+    def get(self, request_id: str) -> Optional[tuple[Optional[str], pd.DataFrame]]:
+        """(run_id, frame) if cached and fresh."""
+        with self._lock:
+            item = self._items.get(request_id)
+            if item is None:
+                return None
+            stored_at, run_id, df = item
+            if time.monotonic() - stored_at > self.ttl_s:
+                return None
+            self._items.move_to_end(request_id)
+            return run_id, df
+
+    def peek(self, request_id: str) -> Optional[tuple[Optional[str], pd.DataFrame]]:
+        """(run_id, frame) even if expired (to revalidate instead of reparsing)."""
+        with self._lock:
+            item = self._items.get(request_id)
+            return (item[1], item[2]) if item is not None else None
+
+    def put(self, request_id: str, run_id: Optional[str], df: pd.DataFrame) -> None:
+        with self._lock:
+            self._items[request_id] = (time.monotonic(), run_id, df)
+            self._items.move_to_end(request_id)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidate(self, request_id: str) -> None:
+        with self._lock:
+            self._items.pop(request_id, None)
+
+
+_memo: Optional[QcFrameMemo] = None
+
+
+def get_qc_memo() -> QcFrameMemo:
+    global _memo
+    with _cache_lock:
+        if _memo is None:
+            _memo = QcFrameMemo()
+        return _memo
+
+
+def qc_frame_flags(df: pd.DataFrame, dup_thr: float, ai_thr: float) -> tuple[pd.Series, pd.Series]:
+    return df["duplicate_score"] >= dup_thr, df["ai_generated_score"] >= ai_thr
+
+
+def summarize_qc_frame(df: pd.DataFrame, dup_thr: float, ai_thr: float) -> dict[str, int]:
+    is_dup, is_ai = qc_frame_flags(df, dup_thr, ai_thr)
+    return {
+        "total": len(df),
+        "flagged": int((is_dup | is_ai).sum()),
+        "duplicates": int(is_dup.sum()),
+        "ai_generated": int(is_ai.sum()),
+    }
+
+
+def filter_qc_frame(df: pd.DataFrame, query: QcQuery) -> pd.DataFrame:
+    """Full filtered and sorted set with flag columns (cursor/limit ignored), e.g. for export."""
+    is_dup, is_ai = qc_frame_flags(df, query.dup_thr, query.ai_thr)
+    is_flagged = is_dup | is_ai
+    mask = pd.Series(True, index=df.index)
+    if query.only_flagged:
+        mask &= is_flagged
+    if query.only_duplicates:
+        mask &= is_dup
+    if query.only_ai:
+        mask &= is_ai
+    if query.only_new:
+        mask &= df["is_new"].fillna(False).astype(bool) if "is_new" in df.columns else False
+    out = df[mask].assign(is_duplicate=is_dup[mask], is_ai=is_ai[mask], is_flagged=is_flagged[mask])
+    sort_by = query.sort_by if query.sort_by in QC_SORT_KEYS else "duplicate_score"
+    if sort_by == "image_id":
+        return out.sort_values("image_id", ascending=not query.sort_desc, kind="stable")
+    return out.sort_values([sort_by, "image_id"], ascending=[not query.sort_desc, True], kind="stable")
+
+
+def query_qc_frame(df: pd.DataFrame, query: QcQuery) -> dict[str, Any]:
+    """Vectorized equivalent of core.qc.query_qc_rows on a cached frame (items is a DataFrame)."""
+    is_dup, is_ai = qc_frame_flags(df, query.dup_thr, query.ai_thr)
+    is_flagged = is_dup | is_ai
+    mask = pd.Series(True, index=df.index)
+    if query.only_flagged:
+        mask &= is_flagged
+    if query.only_duplicates:
+        mask &= is_dup
+    if query.only_ai:
+        mask &= is_ai
+    if query.only_new:
+        mask &= df["is_new"].fillna(False).astype(bool) if "is_new" in df.columns else False
+
+    out = df[mask]
+    try:
+        offset = max(int(query.cursor or 0), 0)
+    except ValueError:
+        offset = 0
+    limit = max(int(query.limit), 1)
+
+    sort_by = query.sort_by if query.sort_by in QC_SORT_KEYS else "duplicate_score"
+    if sort_by == "image_id":
+        ordered = out.sort_values("image_id", ascending=not query.sort_desc, kind="stable")
+    else:
+        # partial sort: only the rows up to the end of this page (keep="all" keeps ties at the
+        # boundary), then image_id as tie-breaker keeps pages stable
+        n = offset + limit
+        top = out.nlargest(n, sort_by, keep="all") if query.sort_desc else out.nsmallest(n, sort_by, keep="all")
+        ordered = top.sort_values([sort_by, "image_id"], ascending=[not query.sort_desc, True], kind="stable")
+
+    items = ordered.iloc[offset : offset + limit]
+    items = items.assign(
+        is_duplicate=is_dup[items.index], is_ai=is_ai[items.index], is_flagged=is_flagged[items.index]
+    )
+    next_cursor = str(offset + limit) if offset + limit < len(out) else None
+    return {"items": items, "next_cursor": next_cursor, "total": len(out)}
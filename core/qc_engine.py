@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import io
+from itertools import combinations
+from typing import Iterable, Optional
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from core.config import settings
+
+HASH_BITS = 64
+
+
+# ---------- Perceptual hashes (64 bit) ----------
+def _gray(data: bytes, size: tuple[int, int]) -> Optional[np.ndarray]:
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            # JPEG: decode at reduced scale, the hash only needs a few pixels
+            img.draft("L", (size[0] * 4, size[1] * 4))
+            img = ImageOps.exif_transpose(img).convert("L").resize(size, Image.Resampling.LANCZOS)
+            return np.asarray(img, dtype=np.float64)
+    except Exception:
+        # not an image / truncated
+        return None
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    value = 0
+    for bit in bits.ravel():
+        value = (value << 1) | int(bit)
+    return value
+
+
+def dhash(data: bytes) -> Optional[int]:
+    """Difference hash: sign of horizontal gradients on a 9x8 grayscale thumbnail."""
+    px = _gray(data, (9, 8))
+    if px is None:
+        return None
+    return _bits_to_int(px[:, 1:] > px[:, :-1])
+
+
+_DCT_N = 32
+_DCT = np.cos(np.pi * np.outer(np.arange(_DCT_N), 2 * np.arange(_DCT_N) + 1) / (2 * _DCT_N))
+
+
+def phash(data: bytes) -> Optional[int]:
+    """DCT hash: low 8x8 frequencies of a 32x32 grayscale thumbnail compared to their median."""
+    px = _gray(data, (_DCT_N, _DCT_N))
+    if px is None:
+        return None
+    low = (_DCT @ px @ _DCT.T)[:8, :8].ravel()
+    # DC term is excluded from the median (it dominates)
+    return _bits_to_int(low > np.median(low[1:]))
+
+
+def image_hash(data: bytes, kind: str | None = None) -> Optional[int]:
+    kind = (kind or settings.qc_hash).lower()
+    return phash(data) if kind == "phash" else dhash(data)
+
+
+def duplicate_score(distance: Optional[int]) -> float:
+    """1.0 = identical hashes; 0.0 = no neighbour within the index radius."""
+    if distance is None:
+        return 0.0
+    return round(max(0.0, 1.0 - distance / (HASH_BITS / 2)), 4)
+
+
+# ---------- Hamming-distance index ----------
+class HammingIndex:
+    """
+    Multi-index hashing over 64-bit hashes: the hash is split into m chunks and every chunk
+    value has its own bucket. Two hashes within `radius` bits differ in at most radius // m
+    bits in at least one chunk (pigeonhole), so only the buckets of chunk values within that
+    distance are looked up and compared. radius <= 4: m = radius + 1 (exact chunk match,
+    ~2 s for 100k items), larger radius: m = 4 with flipped chunk lookups (slower).
+
+    Items are added incrementally; for every item the nearest neighbour within `radius`
+    is kept up to date, also for the items added before it.
+    """
+
+    def __init__(self, radius: int | None = None) -> None:
+        self.radius = int(settings.qc_dup_radius if radius is None else radius)
+        if not 0 <= self.radius < HASH_BITS:
+            raise ValueError(f"radius must be 0..{HASH_BITS - 1}")
+        chunks = self.radius + 1 if self.radius <= 4 else 4
+        sub_radius = self.radius // chunks
+        widths = [HASH_BITS // chunks + (1 if i < HASH_BITS % chunks else 0) for i in range(chunks)]
+        self._chunks: list[tuple[int, int, list[int]]] = []  # (shift, mask, flips within sub_radius)
+        shift = HASH_BITS
+        for w in widths:
+            shift -= w
+            flips = [sum(1 << b for b in bits) for r in range(sub_radius + 1) for bits in combinations(range(w), r)]
+            self._chunks.append((shift, (1 << w) - 1, flips))
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in self._chunks]
+        self._keys: list[str] = []
+        self._hashes: list[int] = []
+        self._nn_dist: list[Optional[int]] = []
+        self._nn: list[Optional[int]] = []
+        self._pos: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._pos
+
+    def _candidates(self, h: int) -> set[int]:
+        found: set[int] = set()
+        for (shift, mask, flips), buckets in zip(self._chunks, self._buckets):
+            value = (h >> shift) & mask
+            for flip in flips:
+                ids = buckets.get(value ^ flip)
+                if ids:
+                    found.update(ids)
+        return found
+
+    def query(self, h: int) -> list[tuple[str, int]]:
+        """(key, distance) of all items within radius, nearest first."""
+        out = []
+        for i in self._candidates(h):
+            d = (h ^ self._hashes[i]).bit_count()
+            if d <= self.radius:
+                out.append((self._keys[i], d))
+        out.sort(key=lambda x: x[1])
+        return out
+
+    def add(self, key: str, h: int) -> list[str]:
+        """
+        Indexes one item; returns the keys of older items whose nearest neighbour is now this one.
+        A key that is already indexed is skipped (its first hash is kept).
+        """
+        if key in self._pos:
+            return []
+        idx = len(self._keys)
+        best: Optional[int] = None
+        best_i: Optional[int] = None
+        changed: list[str] = []
+        for i in self._candidates(h):
+            d = (h ^ self._hashes[i]).bit_count()
+            if d > self.radius:
+                continue
+            if best is None or d < best:
+                best, best_i = d, i
+            # the new item may be the nearest neighbour of an older one
+            cur = self._nn_dist[i]
+            if cur is None or d < cur:
+                self._nn_dist[i] = d
+                self._nn[i] = idx
+                changed.append(self._keys[i])
+
+        self._keys.append(key)
+        self._hashes.append(h)
+        self._nn_dist.append(best)
+        self._nn.append(best_i)
+        self._pos[key] = idx
+        for (shift, mask, _), buckets in zip(self._chunks, self._buckets):
+            buckets.setdefault((h >> shift) & mask, []).append(idx)
+        return changed
+
+    def add_many(self, items: Iterable[tuple[str, int]]) -> set[str]:
+        changed: set[str] = set()
+        for key, h in items:
+            changed.update(self.add(key, h))
+        return changed
+
+    def nearest(self, key: str) -> tuple[Optional[str], Optional[int]]:
+        """(neighbour key, distance) of the nearest item within radius, (None, None) if there is none."""
+        i = self._pos[key]
+        j = self._nn[i]
+        return (self._keys[j] if j is not None else None), self._nn_dist[i]
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gzip
+import io
+import tempfile
+from dataclasses import replace
+from typing import IO, Any, Callable, Iterable, Iterator
+
+import pandas as pd
+
+from core.config import settings
+from core.qc import QcQuery
+
+# format -> (file extension, mime)
+EXPORT_FORMATS: dict[str, tuple[str, str]] = {
+    "csv": ("csv", "text/csv"),
+    "csv.gz": ("csv.gz", "application/gzip"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def export_formats() -> list[str]:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return ["csv", "csv.gz"]
+    return list(EXPORT_FORMATS)
+
+
+def spooled_file() -> IO[bytes]:
+    # in memory up to QC_EXPORT_SPOOL_MB, then rolled over to a temp file on disk
+    return tempfile.SpooledTemporaryFile(max_size=settings.qc_export_spool_mb * 1024 * 1024, mode="w+b")
+
+
+def export_tempfile(fmt: str) -> IO[bytes]:
+    """Named temp file on disk for a UI download (deleted by the caller: delete=False)."""
+    ext, _ = EXPORT_FORMATS[fmt]
+    return tempfile.NamedTemporaryFile(prefix="qc_export_", suffix=f".{ext}", delete=False)
+
+
+def frame_chunks(df: pd.DataFrame, chunk_rows: int | None = None) -> Iterator[pd.DataFrame]:
+    step = int(chunk_rows or settings.qc_export_chunk_rows)
+    for start in range(0, len(df), step):
+        yield df.iloc[start : start + step]
+
+
+def page_chunks(load_page: Callable[[QcQuery], dict[str, Any]], query: QcQuery) -> Iterator[pd.DataFrame]:
+    """Walks all pages of a QC query (cursor by cursor), one DataFrame per page."""
+    query = replace(query, cursor=None, limit=settings.qc_export_chunk_rows)
+    while True:
+        page = load_page(query)
+        items = page.get("items")
+        if items is not None and len(items):
+            yield items if isinstance(items, pd.DataFrame) else pd.DataFrame(items)
+        if not page.get("next_cursor"):
+            return
+        query = replace(query, cursor=page["next_cursor"])
+
+
+def write_export(chunks: Iterable[pd.DataFrame], fmt: str, out: IO[bytes]) -> int:
+    """Writes chunks one by one to `out` (csv | csv.gz | parquet); returns rows written."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet":
+        return _write_parquet(chunks, out)
+
+    rows = 0
+    raw = gzip.GzipFile(fileobj=out, mode="wb") if fmt == "csv.gz" else out
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    try:
+        for chunk in chunks:
+            chunk.to_csv(text, header=rows == 0, index=False)
+            rows += len(chunk)
+        text.flush()
+    finally:
+        # leave `out` open for the caller
+        text.detach()
+        if raw is not out:
+            raw.close()
+    return rows
+
+
+def _write_parquet(chunks: Iterable[pd.DataFrame], out: IO[bytes]) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Optional
+
+from core import mock_backend
+from core.api_client import ApiClient, ApiError
+from core.config import settings
+
+TERMINAL_STATUSES = ("done", "failed", "unknown")
+
+
+@dataclass(frozen=True)
+class QcJobState:
+    job_id: str
+    status: str = "queued"  # queued | running | done | failed | unknown (backend reports no status)
+    progress: float = 0.0  # 0..1
+    run_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+def job_status_fetcher(request_id: str, job_id: str, token: Optional[str]) -> Callable[[], dict[str, Any]]:
+    """fetch_status for QcJobPoller (GET /requests/{id}/qc/jobs/{job_id}, or the mock backend)."""
+
+    def fetch_status() -> dict[str, Any]:
+        if settings.use_mock:
+            return mock_backend.mock_qc_job(request_id, job_id)
+        try:
+            return ApiClient(settings.backend_url, token=token).qc_job(request_id, job_id)
+        except ApiError as e:
+            # backend not implemented yet: job status is unknown
+            if e.status_code in (404, 405, 501):
+                return {"status": "unknown"}
+            raise
+
+    return fetch_status
+
+
+class QcJobPoller:
+    """
+    Polls the status of a QC job in a background thread until it is done or failed.
+    The interval grows while the job runs (QC_POLL_INTERVAL_S up to QC_POLL_MAX_INTERVAL_S)
+    and on errors, with jitter (never above the max). The job is reported as failed after
+    QC_POLL_MAX_FAILURES status checks failing in a row or QC_POLL_TIMEOUT_S without a result.
+    `fetch_status` runs in that thread: it must not touch st.session_state (capture token etc.
+    when creating it).
+    """
+
+    def __init__(
+        self,
+        fetch_status: Callable[[], dict[str, Any]],
+        *,
+        request_id: str,
+        job_id: str,
+        interval_s: float | None = None,
+        max_interval_s: float | None = None,
+        max_failures: int | None = None,
+        timeout_s: float | None = None,
+    ) -> None:
+        self.request_id = request_id
+        self.interval_s = float(interval_s or settings.qc_poll_interval_s)
+        self.max_interval_s = float(max_interval_s or settings.qc_poll_max_interval_s)
+        self.max_failures = max(1, int(max_failures or settings.qc_poll_max_failures))
+        self.timeout_s = float(timeout_s or settings.qc_poll_timeout_s)
+        self.last_error: Optional[str] = None
+        self._fetch_status = fetch_status
+        self._state = QcJobState(job_id=job_id)
+        self._changed = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"qc-job-{job_id}", daemon=True)
+        self._thread.start()
+
+    @property
+    def state(self) -> QcJobState:
+        with self._changed:
+            return self._state
+
+    @property
+    def done(self) -> bool:
+        return self.state.done
+
+    def wait(self, timeout_s: float) -> QcJobState:
+        """Blocks until the state changes (or timeout); returns the current state."""
+        with self._changed:
+            if not self._state.done:
+                self._changed.wait(timeout=timeout_s)
+            return self._state
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._changed:
+            self._changed.notify_all()
+
+    def _update(self, state: QcJobState) -> None:
+        with self._changed:
+            self._state = state
+            self._changed.notify_all()
+
+    def _fail(self, error: str) -> None:
+        self._update(replace(self.state, status="failed", error=error))
+
+    def _run(self) -> None:
+        started = time.monotonic()
+        polls = 0
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                data = self._fetch_status() or {}
+            except Exception as e:
+                failures += 1
+                self.last_error = str(e)
+                if failures >= self.max_failures:
+                    self._fail(f"Status check failed {failures} times in a row: {e}")
+                    return
+            else:
+                failures = 0
+                self.last_error = None
+                state = self.state
+                self._update(
+                    replace(
+                        state,
+                        status=str(data.get("status") or state.status),
+                        progress=float(data.get("progress") or 0.0),
+                        run_id=data.get("run_id") or state.run_id,
+                        error=data.get("error"),
+                    )
+                )
+                if self.state.done:
+                    return
+
+            remaining = self.timeout_s - (time.monotonic() - started)
+            if remaining <= 0:
+                # UI stops waiting; the job itself may still finish on the backend
+                self._fail(f"No result after {self.timeout_s:.0f} s (last status: {self.state.status})")
+                return
+            polls += 1
+            delay = self.interval_s * (1.5 ** min(polls, 20)) * (2 ** min(failures, 10))
+            # jitter first, then the cap: QC_POLL_MAX_INTERVAL_S is never exceeded
+            delay = min(self.max_interval_s, delay * (0.5 + random.random()))
+            self._stopped.wait(timeout=min(delay, remaining))
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Optional
+
+from PIL import Image, ImageOps
+
+from core.config import settings
+from core.http_pool import shared_client
+
+log = logging.getLogger(__name__)
+
+def make_thumbnail(data: bytes, max_side: int) -> bytes:
+    """Downscale image bytes to fit max_side x max_side, JPEG. Runs in a worker process."""
+    with Image.open(io.BytesIO(data)) as img:
+        # JPEG: let the decoder skip detail we throw away anyway (much faster for big photos)
+        img.draft("RGB", (max_side, max_side))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((max_side, max_side))
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=85, optimize=True)
+        return out.getvalue()
+
+
+def url_key(url: str) -> str:
+    # remote images without a known content hash are cached by URL
+    return "url-" + hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class ThumbnailCache:
+    """
+    On-disk thumbnail cache: one JPEG per (key, size), key = content hash.
+    Size-bounded with LRU eviction (recency kept in memory, seeded from file mtimes).
+    """
+
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, int]" = OrderedDict()  # path -> size, oldest first
+        self._total = 0
+        os.makedirs(root, exist_ok=True)
+        self._scan()
+
+    def _scan(self) -> None:
+        entries = []
+        for dirpath, _, names in os.walk(self.root):
+            for n in names:
+                if not n.endswith(".jpg"):
+                    continue
+                p = os.path.join(dirpath, n)
+                try:
+                    st_ = os.stat(p)
+                except OSError:
+                    continue
+                entries.append((st_.st_mtime, p, st_.st_size))
+        for _, p, size in sorted(entries):
+            self._lru[p] = size
+            self._total += size
+
+    def _path(self, key: str, size: int) -> str:
+        return os.path.join(self.root, key[-2:], f"{key}_{int(size)}.jpg")
+
+    def get(self, key: str, size: int) -> Optional[bytes]:
+        p = self._path(key, size)
+        with self._lock:
+            if p not in self._lru:
+                return None
+            self._lru.move_to_end(p)
+        try:
+            with open(p, "rb") as fh:
+                return fh.read()
+        except OSError:
+            with self._lock:
+                self._total -= self._lru.pop(p, 0)
+            return None
+
+    def put(self, key: str, size: int, data: bytes) -> None:
+        p = self._path(key, size)
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        tmp = f"{p}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, p)
+
+        with self._lock:
+            self._total -= self._lru.pop(p, 0)
+            self._lru[p] = len(data)
+            self._total += len(data)
+            evict = []
+            while self._total > self.max_bytes and len(self._lru) > 1:
+                old, old_size = self._lru.popitem(last=False)
+                self._total -= old_size
+                evict.append(old)
+
+        for old in evict:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+_lock = threading.Lock()
+_cache: Optional[ThumbnailCache] = None
+_preview_cache: Optional[ThumbnailCache] = None
+_pool: Optional[Executor] = None
+
+
+def get_cache() -> ThumbnailCache:
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = ThumbnailCache(settings.thumbnail_dir, settings.thumbnail_cache_max_mb * 1024 * 1024)
+        return _cache
+
+
+def get_preview_cache() -> ThumbnailCache:
+    """Large annotate previews (PREVIEW_MAX_SIDE): own directory and size limit, so they never evict thumbnails."""
+    global _preview_cache
+    with _lock:
+        if _preview_cache is None:
+            _preview_cache = ThumbnailCache(settings.preview_dir, settings.preview_cache_max_mb * 1024 * 1024)
+        return _preview_cache
+
+
+def _get_pool() -> Executor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            workers = settings.thumbnail_workers
+            # THUMBNAIL_WORKERS=0 -> threads (e.g. where worker processes are not allowed)
+            _pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else ThreadPoolExecutor(max_workers=2)
+        return _pool
+
+
+def _discard_pool(pool: Executor) -> None:
+    # a worker died (OOM kill, decoder crash): the pool is unusable, the next _get_pool() starts a new one
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _shutdown_pool() -> None:
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(_shutdown_pool)
+
+
+def _render_missing(
+    sources: dict[str, Callable[[], Optional[bytes]]], size: int, cache: ThumbnailCache
+) -> dict[str, bytes]:
+    """
+    sources: key -> loader of the image bytes; downscale in the process pool and store in cache.
+    At most THUMBNAIL_MAX_INFLIGHT jobs are submitted at a time and a loader runs only when its
+    job is submitted, so only that many images are held in memory. Jobs lost with a broken pool
+    are retried once on a new pool.
+    """
+    if not sources:
+        return {}
+    limit = max(1, settings.thumbnail_max_inflight)
+    pending = deque((k, 0) for k in sources)  # (key, attempt)
+    inflight: dict[Future, tuple[str, int, Executor]] = {}
+    out: dict[str, bytes] = {}
+
+    def broken(key: str, attempt: int, pool: Executor) -> None:
+        _discard_pool(pool)
+        if attempt == 0:
+            pending.append((key, 1))
+        else:
+            log.warning("thumbnail %s: worker pool broke twice, skipped", key)
+
+    while pending or inflight:
+        while pending and len(inflight) < limit:
+            key, attempt = pending.popleft()
+            try:
+                data = sources[key]()
+            except Exception as e:
+                log.warning("thumbnail %s: cannot read source: %s", key, e)
+                continue
+            if not data:
+                continue
+            pool = _get_pool()
+            try:
+                inflight[pool.submit(make_thumbnail, data, size)] = (key, attempt, pool)
+            except BrokenExecutor:
+                broken(key, attempt, pool)
+
+        if not inflight:
+            continue
+        done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+        for fut in done:
+            key, attempt, pool = inflight.pop(fut)
+            try:
+                data = fut.result()
+            except BrokenExecutor:
+                broken(key, attempt, pool)
+                continue
+            except Exception as e:
+                # not an image / unsupported format: no thumbnail, gallery shows a placeholder
+                log.warning("thumbnail %s: %s", key, e)
+                continue
+            cache.put(key, size, data)
+            out[key] = data
+    return out
+
+
+def thumbnails_for_files(files: list[Any], hashes: dict[int, str], size: int | None = None) -> dict[str, bytes]:
+    """
+    Thumbnails for local files (UploadedFile), keyed by content hash. Cached ones are not re-rendered.
+    `hashes` as returned by core.uploads.hash_files() ({id(file): sha256}). Pass only the files
+    that are shown: each miss reads its whole file.
+    """
+    size = int(size or settings.thumbnail_size)
+    cache = get_cache()
+    out: dict[str, bytes] = {}
+    missing: dict[str, Callable[[], Optional[bytes]]] = {}
+    for f in files:
+        key = hashes[id(f)]
+        hit = cache.get(key, size)
+        if hit is not None:
+            out[key] = hit
+        elif key not in missing:
+            missing[key] = f.getvalue
+    out.update(_render_missing(missing, size, cache))
+    return out
+
+
+def thumbnails_for_urls(
+    items: list[tuple[str, str]], size: int | None = None, cache: ThumbnailCache | None = None
+) -> dict[str, bytes]:
+    """
+    Thumbnails for remote images: items are (cache_key, url).
+    Misses are downloaded in parallel over the shared HTTP pool, then downscaled.
+    `cache` defaults to the gallery thumbnail cache (get_preview_cache() for annotate previews).
+    """
+    size = int(size or settings.thumbnail_size)
+    cache = cache or get_cache()
+    out: dict[str, bytes] = {}
+    to_fetch: dict[str, str] = {}
+    for key, url in items:
+        hit = cache.get(key, size)
+        if hit is not None:
+            out[key] = hit
+        elif url:
+            to_fetch.setdefault(key, url)
+
+    def fetch(url: str) -> Optional[bytes]:
+        try:
+            resp = shared_client().get(url, follow_redirects=True)
+        except Exception as e:
+            log.warning("thumbnail download %s: %s", url, e)
+            return None
+        if not 200 <= resp.status_code < 300:
+            log.warning("thumbnail download %s: HTTP %s", url, resp.status_code)
+            return None
+        return resp.content
+
+    if to_fetch:
+        with ThreadPoolExecutor(max_workers=min(8, len(to_fetch)), thread_name_prefix="thumb-fetch") as pool:
+            raw = dict(zip(to_fetch, pool.map(fetch, to_fetch.values())))
+        out.update(_render_missing({k: (lambda v=v: v) for k, v in raw.items() if v}, size, cache))
+    return out
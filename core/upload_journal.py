@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from core.config import settings
+
+# status: "stored" = object (or all parts) is in storage, complete not sent yet
+#         "completed" = backend acknowledged /uploads/complete
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    request_id   TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    filename     TEXT NOT NULL,
+    key          TEXT,
+    upload_id    TEXT,
+    etag         TEXT,
+    status       TEXT NOT NULL DEFAULT 'pending',
+    updated_at   TEXT NOT NULL,
+    PRIMARY KEY (request_id, content_hash)
+);
+CREATE TABLE IF NOT EXISTS parts (
+    request_id   TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    part_number  INTEGER NOT NULL,
+    etag         TEXT,
+    PRIMARY KEY (request_id, content_hash, part_number)
+);
+"""
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class UploadJournal:
+    """
+    Durable record of presigned upload progress, keyed by (request_id, content_hash).
+    Lives in SQLite outside st.session_state, so reruns/reloads can resume:
+    only files/parts not yet in storage are sent again, then complete is called once.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def get(self, request_id: str, content_hash: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM uploads WHERE request_id = ? AND content_hash = ?",
+                (request_id, content_hash),
+            ).fetchone()
+            if row is None:
+                return None
+            parts = self._conn.execute(
+                "SELECT part_number, etag FROM parts WHERE request_id = ? AND content_hash = ? ORDER BY part_number",
+                (request_id, content_hash),
+            ).fetchall()
+        entry = dict(row)
+        entry["parts"] = {int(p["part_number"]): p["etag"] for p in parts}
+        return entry
+
+    def start(self, request_id: str, content_hash: str, filename: str, key: str, upload_id: Optional[str]) -> None:
+        """Record a presigned target. A new upload_id invalidates previously stored parts."""
+        with self._lock:
+            prev = self._conn.execute(
+                "SELECT upload_id FROM uploads WHERE request_id = ? AND content_hash = ?",
+                (request_id, content_hash),
+            ).fetchone()
+            if prev is not None and prev["upload_id"] != upload_id:
+                self._conn.execute(
+                    "DELETE FROM parts WHERE request_id = ? AND content_hash = ?",
+                    (request_id, content_hash),
+                )
+            self._conn.execute(
+                """
+                INSERT INTO uploads (request_id, content_hash, filename, key, upload_id, status, updated_at)
+                VALUES (?, ?, ?, ?, ?, 'pending', ?)
+                ON CONFLICT (request_id, content_hash) DO UPDATE SET
+                    filename = excluded.filename, key = excluded.key, upload_id = excluded.upload_id,
+                    status = 'pending', updated_at = excluded.updated_at
+                """,
+                (request_id, content_hash, filename, key, upload_id, _now_iso()),
+            )
+
+    def mark_part(self, request_id: str, content_hash: str, part_number: int, etag: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parts (request_id, content_hash, part_number, etag) VALUES (?, ?, ?, ?)",
+                (request_id, content_hash, int(part_number), etag),
+            )
+
+    def mark_stored(self, request_id: str, content_hash: str, etag: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE uploads SET status = 'stored', etag = ?, updated_at = ? WHERE request_id = ? AND content_hash = ?",
+                (etag, _now_iso(), request_id, content_hash),
+            )
+
+    def mark_completed(self, request_id: str, content_hashes: list[str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE uploads SET status = 'completed', updated_at = ? WHERE request_id = ? AND content_hash = ?",
+                [(_now_iso(), request_id, h) for h in content_hashes],
+            )
+            self._conn.executemany(
+                "DELETE FROM parts WHERE request_id = ? AND content_hash = ?",
+                [(request_id, h) for h in content_hashes],
+            )
+
+    def forget(self, request_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM uploads WHERE request_id = ?", (request_id,))
+            self._conn.execute("DELETE FROM parts WHERE request_id = ?", (request_id,))
+
+    def pending(self, request_id: str) -> list[dict[str, Any]]:
+        """Entries not yet acknowledged by /uploads/complete (for the resume banner)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM uploads WHERE request_id = ? AND status != 'completed' ORDER BY filename",
+                (request_id,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_journal: Optional[UploadJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_journal() -> UploadJournal:
+    """Process-wide journal at UPLOAD_JOURNAL_PATH (shared by all sessions)."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = UploadJournal(settings.upload_journal_path)
+        return _journal
@@ -0,0 +1,574 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+import httpx
+
+from core.config import settings
+from core.http_pool import shared_client
+
+if TYPE_CHECKING:
+    from core.upload_journal import UploadJournal
+
+
+def filelike_size(fileobj: IO[bytes] | bytes) -> int:
+    """Size in bytes without reading the content (seek to end and back)."""
+    if isinstance(fileobj, (bytes, bytearray)):
+        return len(fileobj)
+    size = getattr(fileobj, "size", None)
+    if isinstance(size, int):
+        return size
+    pos = fileobj.tell()
+    try:
+        return fileobj.seek(0, os.SEEK_END)
+    finally:
+        fileobj.seek(pos)
+
+
+def iter_chunks(fileobj: IO[bytes], chunk_size: int | None = None) -> Iterator[bytes]:
+    """Read a file-like object from the start in bounded chunks (peak memory = one chunk)."""
+    size = int(chunk_size or settings.upload_chunk_size)
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def hash_file(fileobj: IO[bytes]) -> str:
+    """sha256 hex digest of the whole file, read in bounded chunks."""
+    h = hashlib.sha256()
+    for chunk in iter_chunks(fileobj):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_files(files: list[Any], *, max_workers: int | None = None) -> dict[int, str]:
+    """
+    Hash files in parallel (hashlib releases the GIL on large updates).
+    Returns {id(file object): sha256 hex}: names are not unique (same name, different folders).
+    """
+    if not files:
+        return {}
+    workers = max(1, min(int(max_workers or settings.hash_workers), len(files)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash") as pool:
+        digests = list(pool.map(hash_file, files))
+    return {id(f): h for f, h in zip(files, digests)}
+
+
+def dedupe_files(
+    files: list[Any],
+    hashes: dict[int, str],
+    existing_hashes: set[str],
+) -> tuple[list[Any], list[dict[str, Any]]]:
+    """
+    Drop exact duplicates (by content hash) inside the selection and files already
+    uploaded to the request. Returns (files_to_upload, skipped).
+    """
+    keep: list[Any] = []
+    skipped: list[dict[str, Any]] = []
+    seen: dict[str, str] = {}
+    for f in files:
+        h = hashes[id(f)]
+        if h in existing_hashes:
+            skipped.append({"filename": f.name, "reason": "already uploaded"})
+        elif h in seen:
+            skipped.append({"filename": f.name, "reason": f"duplicate of {seen[h]}"})
+        else:
+            seen[h] = f.name
+            keep.append(f)
+    return keep, skipped
+
+
+def unique_names(files: list[Any]) -> list[str]:
+    """
+    Upload names of `files`, in order: a repeated name gets a " (2)", " (3)"... suffix,
+    so presign records, storage keys and the journal never mix up two different files.
+    """
+    taken = {f.name for f in files}
+    used: set[str] = set()
+    names: list[str] = []
+    for f in files:
+        name = f.name
+        if name in used:
+            stem, ext = os.path.splitext(f.name)
+            n = 2
+            while (name := f"{stem} ({n}){ext}") in used or name in taken:
+                n += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+class _Renamed:
+    # a selected file under its upload name (everything else is the original file object)
+    def __init__(self, fileobj: Any, name: str) -> None:
+        self._fileobj = fileobj
+        self.name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._fileobj, attr)
+
+
+def iter_range(
+    fileobj: IO[bytes],
+    start: int,
+    length: int,
+    lock: threading.Lock,
+    chunk_size: int | None = None,
+) -> Iterator[bytes]:
+    """
+    Read bytes [start, start + length) in bounded chunks. Several parts of one file are
+    PUT concurrently, so every seek+read happens under the file's lock.
+    """
+    size = int(chunk_size or settings.upload_chunk_size)
+    pos, end = start, start + length
+    while pos < end:
+        with lock:
+            fileobj.seek(pos)
+            chunk = fileobj.read(min(size, end - pos))
+        if not chunk:
+            break
+        pos += len(chunk)
+        yield chunk
+
+
+@dataclass
+class PutJob:
+    filename: str
+    key: str
+    url: str
+    # called inside the worker; returns anything httpx accepts as `content=`
+    open_content: Callable[[], Any]
+    headers: dict[str, str] = field(default_factory=dict)
+    # set for S3-style multipart uploads (one job per part)
+    part_number: Optional[int] = None
+    upload_id: Optional[str] = None
+
+
+@dataclass
+class PutResult:
+    filename: str
+    key: str
+    etag: Optional[str] = None
+    error: Optional[str] = None
+    part_number: Optional[int] = None
+    upload_id: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _put_one(job: PutJob, timeout: httpx.Timeout, retries: int, backoff_s: float) -> PutResult:
+    def result(**kw: Any) -> PutResult:
+        return PutResult(job.filename, job.key, part_number=job.part_number, upload_id=job.upload_id, **kw)
+
+    attempt = 0
+    while True:
+        status = 0
+        try:
+            # content is re-opened for every attempt: the previous one may have consumed it
+            resp = shared_client().put(
+                job.url,
+                content=job.open_content(),
+                headers=job.headers,
+                timeout=timeout,
+                follow_redirects=True,
+            )
+        except httpx.RequestError as e:
+            error = f"Network error: {e!s}"
+        except Exception as e:
+            return result(error=str(e))
+        else:
+            if 200 <= resp.status_code < 300:
+                return result(etag=resp.headers.get("ETag") or resp.headers.get("etag"))
+            status = resp.status_code
+            error = f"{resp.status_code} {(resp.text or '')[:200]}".strip()
+
+        if status not in _RETRYABLE_STATUS or attempt >= retries:
+            return result(error=error)
+        attempt += 1
+        time.sleep(backoff_s * 2 ** (attempt - 1))
+
+
+def put_presigned(
+    jobs: list[PutJob],
+    *,
+    max_workers: int | None = None,
+    timeout_s: float = 120.0,
+    retries: int | None = None,
+    backoff_s: float = 0.5,
+    on_progress: Callable[[int, int], None] | None = None,
+    on_result: Callable[[PutResult], None] | None = None,
+) -> list[PutResult]:
+    """
+    PUT files to presigned storage URLs with at most `max_workers` in flight.
+    Network errors and retryable statuses (408, 429, 5xx) are retried `retries` times
+    (UPLOAD_RETRIES) with exponential backoff. A failed file does not abort the batch:
+    its PutResult carries `error`. on_progress(done, total) and on_result(result) are
+    called from the calling thread (safe for st.progress). Results keep the order of `jobs`.
+    """
+    total = len(jobs)
+    results: list[Optional[PutResult]] = [None] * total
+    if not jobs:
+        return []
+
+    timeout = httpx.Timeout(timeout_s, connect=10.0)
+    workers = max(1, min(int(max_workers or settings.upload_concurrency), total))
+    retries = settings.upload_retries if retries is None else int(retries)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="presigned-put") as pool:
+        futures = {pool.submit(_put_one, job, timeout, retries, backoff_s): i for i, job in enumerate(jobs)}
+        for done, fut in enumerate(as_completed(futures), start=1):
+            results[futures[fut]] = fut.result()
+            if on_result:
+                on_result(results[futures[fut]])
+            if on_progress:
+                on_progress(done, total)
+
+    return [r for r in results if r is not None]
+
+
+def build_put_jobs(files: list[Any], rec_by_name: dict[str, dict[str, Any]]) -> tuple[list[PutJob], list[dict[str, Any]]]:
+    """
+    Turn presign records into PUT jobs: one per file, or one per part when the
+    record has a `multipart` block. Files that cannot be sent are returned as failed.
+    `files` are file objects with `.name` (Streamlit UploadedFile).
+    """
+    jobs: list[PutJob] = []
+    failed: list[dict[str, Any]] = []
+
+    for f in files:
+        rec = rec_by_name.get(f.name)
+        if not rec:
+            failed.append({"filename": f.name, "error": "No presigned entry for file"})
+            continue
+
+        method = (rec.get("method") or "PUT").upper()
+        if method != "PUT":
+            failed.append({"filename": f.name, "error": f"Only PUT presigned is supported in UI now. Got method={method}"})
+            continue
+
+        key = rec.get("key") or rec.get("object_key") or f.name
+        size = filelike_size(f)
+        mp = rec.get("multipart")
+
+        if not mp:
+            url = rec.get("url")
+            if not url:
+                failed.append({"filename": f.name, "error": "Presigned entry missing url"})
+                continue
+            jobs.append(
+                PutJob(
+                    filename=f.name,
+                    key=key,
+                    url=url,
+                    open_content=lambda f=f: iter_chunks(f),
+                    # explicit length: storage (S3/MinIO) rejects chunked transfer-encoding
+                    headers={**(rec.get("headers") or {}), "Content-Length": str(size)},
+                )
+            )
+            continue
+
+        part_size = int(mp.get("part_size") or 0)
+        parts = mp.get("parts") or []
+        if part_size <= 0 or not parts or any(not p.get("url") for p in parts):
+            failed.append({"filename": f.name, "error": "Multipart presign entry missing part_size/parts/url"})
+            continue
+
+        lock = threading.Lock()
+        for p in parts:
+            n = int(p["part_number"])
+            start = (n - 1) * part_size
+            length = max(0, min(part_size, size - start))
+            jobs.append(
+                PutJob(
+                    filename=f.name,
+                    key=key,
+                    url=p["url"],
+                    open_content=lambda f=f, start=start, length=length, lock=lock: iter_range(f, start, length, lock),
+                    headers={**(p.get("headers") or {}), "Content-Length": str(length)},
+                    part_number=n,
+                    upload_id=mp.get("upload_id"),
+                )
+            )
+
+    return jobs, failed
+
+
+def collect_report(results: list[PutResult]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Build the /uploads/complete `uploaded` list from PUT results.
+    A multipart file is complete only if every part succeeded; its entry lists the parts.
+    """
+    uploaded: list[dict[str, Any]] = []
+    failed: list[dict[str, Any]] = []
+    parts_by_file: dict[str, list[PutResult]] = {}
+
+    for r in results:
+        if r.part_number is not None:
+            parts_by_file.setdefault(r.filename, []).append(r)
+        elif r.ok:
+            uploaded.append({"filename": r.filename, "key": r.key, "etag": r.etag})
+        else:
+            failed.append({"filename": r.filename, "error": r.error})
+
+    for name, parts in parts_by_file.items():
+        bad = [p for p in parts if not p.ok]
+        if bad:
+            failed.append({"filename": name, "error": f"{len(bad)} of {len(parts)} parts failed: {bad[0].error}"})
+            continue
+        parts.sort(key=lambda p: p.part_number or 0)
+        uploaded.append(
+            {
+                "filename": name,
+                "key": parts[0].key,
+                "etag": None,
+                "upload_id": parts[0].upload_id,
+                "parts": [{"part_number": p.part_number, "etag": p.etag} for p in parts],
+            }
+        )
+
+    return uploaded, failed
+
+
+def _journal_results(entry: dict[str, Any], filename: str) -> list[PutResult]:
+    # what the journal says is already in storage, as if it was just PUT
+    # (under the current upload name: the journal is keyed by content, not by name)
+    if entry.get("upload_id"):
+        return [
+            PutResult(filename, entry["key"], etag=etag, part_number=n, upload_id=entry["upload_id"])
+            for n, etag in sorted(entry["parts"].items())
+        ]
+    if entry.get("status") == "stored":
+        return [PutResult(filename, entry["key"], etag=entry.get("etag"))]
+    return []
+
+
+def upload_presigned(
+    files: list[Any],
+    *,
+    request_id: str,
+    presign: Callable[[list[dict[str, Any]]], dict[str, Any]],
+    complete: Callable[[list[dict[str, Any]]], dict[str, Any]],
+    put: Callable[..., list[PutResult]] = put_presigned,
+    journal: Optional["UploadJournal"] = None,
+    hashes: dict[int, str] | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> dict[str, Any]:
+    """
+    presign -> parallel PUT -> complete, resumable through `journal`.
+    Files are identified by content hash (computed if `hashes` is not given) and the hash
+    is sent in presign/complete. Files already completed are skipped, files/parts already
+    in storage are not PUT again (a pending multipart upload_id is sent back to presign so
+    the backend can re-issue part URLs), and complete is called once at the end.
+    Presign records with `"exists": true` (backend dedupe) are not uploaded.
+    `hashes` are keyed by id(file object) as returned by hash_files(); files that share
+    a name are sent under unique_names().
+    """
+    rid = str(request_id)
+    hashes = hashes if hashes is not None else hash_files(files)
+    names = unique_names(files)
+    by_name = {name: hashes[id(f)] for f, name in zip(files, names)}
+    files = [f if f.name == name else _Renamed(f, name) for f, name in zip(files, names)]
+    known = {name: journal.get(rid, h) for name, h in by_name.items()} if journal else {}
+
+    already_completed = [f.name for f in files if (known.get(f.name) or {}).get("status") == "completed"]
+    stored = [f for f in files if (known.get(f.name) or {}).get("status") == "stored"]
+    to_send = [f for f in files if f.name not in already_completed and f not in stored]
+
+    exists: list[str] = []
+    resumed: list[PutResult] = []
+    for f in stored:
+        resumed.extend(_journal_results(known[f.name], f.name))
+
+    jobs: list[PutJob] = []
+    failed: list[dict[str, Any]] = []
+    if to_send:
+        payload = []
+        for f in to_send:
+            item = {
+                "filename": f.name,
+                "content_type": (f.type or "application/octet-stream"),
+                "size_bytes": filelike_size(f),
+                "content_hash": by_name[f.name],
+            }
+            prev_upload_id = (known.get(f.name) or {}).get("upload_id")
+            if prev_upload_id:
+                item["upload_id"] = prev_upload_id
+            payload.append(item)
+
+        uploads = (presign(payload) or {}).get("uploads") or []
+        if not uploads:
+            raise RuntimeError("Presign returned empty uploads list")
+
+        rec_by_name = {u.get("filename"): u for u in uploads if u.get("filename")}
+        exists = [f.name for f in to_send if (rec_by_name.get(f.name) or {}).get("exists")]
+        to_send = [f for f in to_send if f.name not in exists]
+        jobs, failed = build_put_jobs(to_send, rec_by_name)
+
+        if journal:
+            for f in to_send:
+                rec = rec_by_name.get(f.name)
+                if not rec:
+                    continue
+                key = rec.get("key") or rec.get("object_key") or f.name
+                journal.start(rid, by_name[f.name], f.name, key, (rec.get("multipart") or {}).get("upload_id"))
+                resumed.extend(_journal_results(journal.get(rid, by_name[f.name]) or {}, f.name))
+            skip = {(r.filename, r.part_number) for r in resumed}
+            jobs = [j for j in jobs if (j.filename, j.part_number) not in skip]
+
+    def on_result(r: PutResult) -> None:
+        if not journal or not r.ok:
+            return
+        if r.part_number is None:
+            journal.mark_stored(rid, by_name[r.filename], r.etag)
+        else:
+            journal.mark_part(rid, by_name[r.filename], r.part_number, r.etag)
+
+    results = put(jobs, on_progress=on_progress, on_result=on_result) if jobs else []
+
+    uploaded_report, put_failed = collect_report(resumed + results)
+    failed.extend(put_failed)
+    for u in uploaded_report:
+        u["content_hash"] = by_name[u["filename"]]
+
+    if journal:
+        for u in uploaded_report:
+            if u.get("upload_id"):
+                journal.mark_stored(rid, by_name[u["filename"]])
+
+    summary: dict[str, Any] = {
+        "uploaded": len(uploaded_report),
+        "resumed": len({r.filename for r in resumed}),
+        "already_completed": already_completed,
+        "skipped": len(exists),
+        "skipped_files": [{"filename": name, "reason": "exists in storage"} for name in exists],
+        "failed": failed,
+    }
+    if not uploaded_report:
+        if (already_completed or exists) and not failed:
+            return {"complete": None, **summary}
+        raise RuntimeError(f"Storage upload failed for all files: {failed[:5]}")
+
+    resp = complete(uploaded_report)
+    if journal:
+        journal.mark_completed(rid, [by_name[u["filename"]] for u in uploaded_report])
+    return {"complete": resp, **summary}
+
+
+# ---------- MVP multipart: batching ----------
+# 0 = network error; 413 is handled by splitting the batch instead
+_RETRYABLE_STATUS = {0, 408, 429, 500, 502, 503, 504}
+
+Packed = tuple[str, Any, str]  # (filename, bytes | file object, content_type)
+
+
+def plan_batches(sizes: list[int], *, max_bytes: int, max_files: int) -> list[list[int]]:
+    """
+    Split files (given by size, in order) into batches capped by total bytes and file count.
+    Returns lists of indexes. A single file larger than max_bytes gets a batch of its own.
+    """
+    batches: list[list[int]] = []
+    cur: list[int] = []
+    cur_bytes = 0
+    for i, size in enumerate(sizes):
+        if cur and (len(cur) >= max_files or cur_bytes + size > max_bytes):
+            batches.append(cur)
+            cur, cur_bytes = [], 0
+        cur.append(i)
+        cur_bytes += size
+    if cur:
+        batches.append(cur)
+    return batches
+
+
+def _send_with_retry(
+    send: Callable[[list[Packed]], dict[str, Any]],
+    batch: list[Packed],
+    retries: int,
+    backoff_s: float,
+) -> list[tuple[list[Packed], Optional[dict[str, Any]], Optional[Exception]]]:
+    # local import: core.mock_backend imports this module and core.api_client
+    from core.api_client import ApiError
+
+    attempt = 0
+    while True:
+        try:
+            return [(batch, send(batch), None)]
+        except ApiError as e:
+            if e.status_code == 413 and len(batch) > 1:
+                mid = len(batch) // 2
+                return _send_with_retry(send, batch[:mid], retries, backoff_s) + _send_with_retry(
+                    send, batch[mid:], retries, backoff_s
+                )
+            if e.status_code in _RETRYABLE_STATUS and attempt < retries:
+                attempt += 1
+                time.sleep(backoff_s * 2 ** (attempt - 1))
+                continue
+            return [(batch, None, e)]
+        except Exception as e:
+            return [(batch, None, e)]
+
+
+def upload_mvp_batched(
+    send: Callable[[list[Packed]], dict[str, Any]],
+    packed: list[Packed],
+    *,
+    max_bytes: int | None = None,
+    max_files: int | None = None,
+    max_workers: int | None = None,
+    retries: int | None = None,
+    backoff_s: float = 0.5,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Upload `packed` files through the MVP multipart endpoint in several requests.
+    `send(batch)` performs one POST (ApiClient.upload_files_mvp or the mock).
+    Batches run `max_workers` at a time; only failed batches are retried, and a 413
+    splits the batch in half. Responses are merged into one contract-shaped dict
+    with the files of batches that still failed listed in `failed_files`.
+    """
+    max_bytes = int(max_bytes or settings.mvp_batch_max_bytes)
+    max_files = int(max_files or settings.mvp_batch_max_files)
+    max_workers = int(max_workers or settings.mvp_batch_concurrency)
+    retries = settings.upload_retries if retries is None else int(retries)
+
+    plan = plan_batches([filelike_size(content) for _, content, _ in packed], max_bytes=max_bytes, max_files=max_files)
+    batches = [[packed[i] for i in idxs] for idxs in plan]
+
+    merged: dict[str, Any] = {"uploaded": 0, "skipped": 0, "errors": [], "batches": 0, "failed_files": []}
+    total_files = len(packed)
+    done_files = 0
+    if not batches:
+        return merged
+
+    workers = max(1, min(max_workers, len(batches)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mvp-upload") as pool:
+        futures = [pool.submit(_send_with_retry, send, b, retries, backoff_s) for b in batches]
+        for fut in as_completed(futures):
+            for batch, resp, err in fut.result():
+                merged["batches"] += 1
+                if err is not None:
+                    names = [name for name, _, _ in batch]
+                    merged["failed_files"].extend(names)
+                    merged["errors"].append({"files": names, "error": str(err)})
+                else:
+                    resp = resp or {}
+                    merged.setdefault("request_id", resp.get("request_id"))
+                    merged["uploaded"] += int(resp.get("uploaded", resp.get("count", len(batch))) or 0)
+                    merged["skipped"] += int(resp.get("skipped") or 0)
+                    merged["errors"].extend(resp.get("errors") or [])
+                done_files += len(batch)
+            if on_progress:
+                on_progress(done_files, total_files)
+
+    return merged
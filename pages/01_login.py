@@ -16,6 +16,7 @@ if st.session_state.get("token") and st.session_state.get("role"):
     if st.button("Logout"):
         st.session_state.pop("token", None)
         st.session_state.pop("role", None)
+        st.session_state.pop("username", None)
         st.session_state.pop("selected_request_id", None)
         st.session_state.pop("selected_task_id", None)
         st.rerun()
@@ -45,6 +46,7 @@ if st.button("Login", type="primary", disabled=not (username and password)):
 
     st.session_state["token"] = token
     st.session_state["role"] = role
+    st.session_state["username"] = username
 
     # Important: do NOT st.switch_page here.
     # We rerun so app.py rebuilds navigation with the new role.
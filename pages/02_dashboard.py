@@ -3,6 +3,7 @@ import httpx
 
 from core.auth import require_role
 from core.config import settings
+from core.http_pool import shared_client
 from core.ui import header
 
 # Доступен всем залогиненным ролям
@@ -42,7 +43,7 @@ def try_health() -> tuple[bool, str]:
     for ep in endpoints:
         url = base + ep
         try:
-            r = httpx.get(url, timeout=timeout, headers={"Accept": "application/json"})
+            r = shared_client().get(url, timeout=timeout, headers={"Accept": "application/json"})
             if 200 <= r.status_code < 300:
                 # if JSON - show short info
                 ct = r.headers.get("content-type", "")
@@ -1,9 +1,12 @@
 import streamlit as st
-import httpx
 
 from core.auth import require_role
 from core.config import settings
-from core.api_client import ApiClient
+from core.api_client import ApiClient, ApiError
+from core.qc_jobs import QcJobPoller, job_status_fetcher
+from core.thumbnails import thumbnails_for_files, thumbnails_for_urls, url_key
+from core.upload_journal import get_journal
+from core.uploads import dedupe_files, hash_files, put_presigned, unique_names, upload_mvp_batched, upload_presigned
 from core.ui import header
 from core.ui_helpers import api_call
 from core import mock_backend
@@ -26,83 +29,110 @@ mode_default = getattr(settings, "upload_mode", "mvp")
 upload_mode = st.selectbox("Upload mode", ["mvp", "presigned"], index=0 if mode_default != "presigned" else 1)
 
 st.caption("mvp = backend принимает файлы; presigned = UI грузит в storage по URL, затем сообщает backend complete.")
+skip_duplicates = st.checkbox(
+    "Skip duplicates",
+    value=True,
+    help="Файлы хэшируются локально (sha256): точные дубликаты в выборке и уже загруженные в заявку не отправляются.",
+)
+
+if upload_mode == "presigned" and request_id:
+    unfinished = get_journal().pending(request_id)
+    if unfinished:
+        st.info(
+            f"Unfinished presigned upload: {len(unfinished)} file(s). "
+            "Select the same files and press Upload — only missing files/parts will be sent."
+        )
+        if st.button("Forget unfinished uploads"):
+            get_journal().forget(request_id)
+            st.rerun()
+
+def select_new_files():
+    """Hash the selection in parallel and drop exact duplicates / files already in the request."""
+    with st.spinner("Hashing files..."):
+        hashes = hash_files(files)
+    # the gallery renders thumbnails of still-selected files locally (only for the page it shows)
+    st.session_state["selection_hashes"] = {f.file_id: hashes[id(f)] for f in files}
+    if not skip_duplicates:
+        return list(files), hashes, []
+
+    existing: set[str] = set()
+    try:
+        rows = do_list_uploads()
+        existing = {str(r["content_hash"]) for r in rows or [] if r.get("content_hash")}
+    except ApiError:
+        # listing is optional here: without it only in-selection duplicates are skipped
+        pass
+
+    keep, skipped = dedupe_files(files, hashes, existing)
+    return keep, hashes, skipped
 
 def do_upload_mvp():
+    new_files, _, skipped = select_new_files()
+    if not new_files:
+        return {"uploaded": 0, "skipped": len(skipped), "skipped_files": skipped, "failed": []}
+
+    # pass file objects, not f.getvalue(): httpx streams them in chunks
+    # same-named files (different folders) get a " (2)" suffix instead of overwriting each other
     packed = []
-    for f in files:
-        packed.append((f.name, f.getvalue(), f.type or "application/octet-stream"))
+    for f, name in zip(new_files, unique_names(new_files)):
+        packed.append((name, f, f.type or "application/octet-stream"))
 
-    if settings.use_mock:
-        return mock_backend.mock_upload_files_mvp(request_id, packed)
+    # created here: send() runs on upload_mvp_batched's worker threads, which have no Streamlit context / session_state
+    api = client()
 
-    return client().upload_files_mvp(request_id, packed)
+    def send(batch):
+        if settings.use_mock:
+            return mock_backend.mock_upload_files_mvp(request_id, batch)
+        return api.upload_files_mvp(request_id, batch)
 
-def do_upload_presigned():
-    presign_payload = [{"filename": f.name, "content_type": (f.type or "application/octet-stream")} for f in files]
+    progress = st.progress(0, text=f"0 / {len(packed)} files")
 
-    # 1) presign
-    if settings.use_mock:
-        presigned = mock_backend.mock_presign_uploads(request_id, presign_payload)
-    else:
-        presigned = client().presign_uploads(request_id, presign_payload)
+    def on_progress(done: int, total: int) -> None:
+        progress.progress(int(done * 100 / total), text=f"{done} / {total} files")
 
-    uploads = presigned.get("uploads") or []
-    if not uploads:
-        raise RuntimeError("Presign returned empty uploads list")
+    # several multipart POSTs (capped by MVP_BATCH_MAX_BYTES / MVP_BATCH_MAX_FILES), failed batches retried
+    resp = upload_mvp_batched(send, packed, on_progress=on_progress)
+    if resp["failed_files"] and not resp["uploaded"]:
+        raise RuntimeError(f"Upload failed for all batches: {resp['errors'][:3]}")
+    resp["failed"] = [{"filename": name} for name in resp["failed_files"]]
+    resp["skipped"] += len(skipped)
+    resp["skipped_files"] = skipped
+    return resp
 
-    rec_by_name = {u.get("filename"): u for u in uploads if u.get("filename")}
-
-    # Mock: не делаем PUT, только complete
-    if settings.use_mock:
-        uploaded_report = []
-        for f in files:
-            rec = rec_by_name.get(f.name)
-            if not rec:
-                raise RuntimeError(f"No presigned entry for file: {f.name}")
-            uploaded_report.append({"filename": f.name, "key": rec.get("key") or f.name, "etag": None})
-        return mock_backend.mock_complete_uploads(request_id, uploaded_report)
-
-    # 2) upload each file to storage (PUT)
-    uploaded_report = []
-    progress = st.progress(0)
-    total = len(files)
-
-    timeout = httpx.Timeout(120.0, connect=10.0)
-    with httpx.Client(timeout=timeout, follow_redirects=True) as h:
-        for i, f in enumerate(files, start=1):
-            rec = rec_by_name.get(f.name)
-            if not rec:
-                raise RuntimeError(f"No presigned entry for file: {f.name}")
-
-            url = rec.get("url")
-            method = (rec.get("method") or "PUT").upper()
-            headers = rec.get("headers") or {}
-
-            if not url:
-                raise RuntimeError(f"Presigned entry missing url for file: {f.name}")
-            if method != "PUT":
-                raise RuntimeError(f"Only PUT presigned is supported in UI now. Got method={method}")
-
-            content = f.getvalue()
-            resp = h.put(url, content=content, headers=headers)
-
-            if resp.status_code < 200 or resp.status_code >= 300:
-                text = (resp.text or "")[:200]
-                raise RuntimeError(f"Storage upload failed for {f.name}: {resp.status_code} {text}")
-
-            etag = resp.headers.get("ETag") or resp.headers.get("etag")
-            uploaded_report.append(
-                {
-                    "filename": f.name,
-                    "key": rec.get("key") or rec.get("object_key") or f.name,
-                    "etag": etag,
-                }
-            )
-
-            progress.progress(int(i * 100 / total))
-
-    # 3) complete
-    return client().complete_uploads(request_id, uploaded_report)
+def do_upload_presigned():
+    new_files, hashes, skipped = select_new_files()
+    if not new_files:
+        return {"uploaded": 0, "skipped": len(skipped), "skipped_files": skipped, "failed": []}
+
+    def presign(payload):
+        if settings.use_mock:
+            return mock_backend.mock_presign_uploads(request_id, payload)
+        return client().presign_uploads(request_id, payload)
+
+    def complete(uploaded_report):
+        if settings.use_mock:
+            return mock_backend.mock_complete_uploads(request_id, uploaded_report)
+        return client().complete_uploads(request_id, uploaded_report)
+
+    progress = st.progress(0, text="Hashing / presigning...")
+
+    def on_progress(done: int, total: int) -> None:
+        progress.progress(int(done * 100 / total), text=f"{done} / {total} PUTs")
+
+    # Mock: не делаем PUT (storage stand-in), presign/complete идут в mock backend
+    resp = upload_presigned(
+        new_files,
+        request_id=request_id,
+        presign=presign,
+        complete=complete,
+        put=mock_backend.mock_put_presigned if settings.use_mock else put_presigned,
+        journal=get_journal(),
+        hashes=hashes,
+        on_progress=on_progress,
+    )
+    resp["skipped_files"] = skipped + resp["skipped_files"]
+    resp["skipped"] = len(resp["skipped_files"])
+    return resp
 
 def do_list_uploads():
     if settings.use_mock:
@@ -111,7 +141,7 @@ def do_list_uploads():
 
 def do_run_qc():
     if settings.use_mock:
-        return {"status": "mocked"}
+        return mock_backend.mock_run_qc(request_id)
     return client().run_qc(request_id)
 
 st.divider()
@@ -127,7 +157,15 @@ with col1:
             resp = api_call("Upload files (Presigned)", do_upload_presigned, spinner="Uploading (presigned)...", show_payload=True)
 
         if resp is not None:
-            st.success("Upload completed.")
+            failed = (resp.get("failed") or []) if isinstance(resp, dict) else []
+            if failed:
+                st.warning(f"Upload completed with {len(failed)} failed file(s). Re-select them and upload again.")
+                st.dataframe(failed, use_container_width=True)
+            else:
+                st.success("Upload completed.")
+            skipped_files = (resp.get("skipped_files") or []) if isinstance(resp, dict) else []
+            if skipped_files:
+                st.caption(f"Skipped {len(skipped_files)} duplicate file(s) (not sent).")
             st.json(resp)
 
 with col2:
@@ -140,7 +178,17 @@ with col3:
     if st.button("Run QC", disabled=not request_id):
         resp = api_call("Run QC", do_run_qc, spinner="Starting QC...", show_payload=True)
         if resp is not None:
-            st.success("QC started (or mocked).")
+            job_id = resp.get("job_id")
+            if job_id:
+                # polled in background; QC Review shows its progress and loads the results when done
+                prev = st.session_state.pop("qc_job", None)
+                if prev is not None:
+                    prev.stop()
+                fetch_status = job_status_fetcher(request_id, str(job_id), st.session_state.get("token"))
+                st.session_state["qc_job"] = QcJobPoller(fetch_status, request_id=request_id, job_id=str(job_id))
+                st.success("QC started. Open QC Review to follow its progress.")
+            else:
+                st.success("QC started.")
 
 with col4:
     if st.button("Open QC Review", disabled=not request_id):
@@ -164,11 +212,28 @@ else:
     # Table view
     st.dataframe(rows, use_container_width=True)
 
-    # Optional gallery if preview_url exists (backend can provide thumbnail URLs later)
-    previewable = [r for r in rows if r.get("preview_url")]
-    if previewable and st.checkbox("Show gallery previews", value=False):
-        st.caption("Preview URLs are optional; backend/storage should provide them.")
-        cols = st.columns(4)
-        for i, r in enumerate(previewable):
-            with cols[i % 4]:
-                st.image(r["preview_url"], caption=r.get("filename") or r.get("key"), use_container_width=True)
+    # Gallery: thumbnails from the local cache (content_hash), or downscaled once from preview_url
+    gallery_rows = [r for r in rows if r.get("content_hash") or r.get("preview_url")]
+    if gallery_rows and st.checkbox("Show gallery previews", value=False):
+        st.caption("Thumbnails are cached on disk; previews without a local copy need preview_url from backend/storage.")
+        per_page = 48
+        n_pages = max(1, -(-len(gallery_rows) // per_page))
+        page = int(st.number_input("Gallery page", min_value=1, max_value=n_pages, value=1, step=1))
+        chunk = gallery_rows[(page - 1) * per_page : page * per_page]
+
+        items = [(r.get("content_hash") or url_key(r["preview_url"]), r.get("preview_url") or "") for r in chunk]
+        # files still selected in the uploader are downscaled from local bytes, the rest from cache/preview_url
+        selection_hashes = st.session_state.get("selection_hashes") or {}
+        local = {selection_hashes[f.file_id]: f for f in files or [] if f.file_id in selection_hashes}
+        shown_local = {key: local[key] for key, _ in items if key in local}
+        thumbs = thumbnails_for_files(list(shown_local.values()), {id(f): key for key, f in shown_local.items()})
+        thumbs.update(thumbnails_for_urls([(key, url) for key, url in items if key not in thumbs]))
+
+        cols = st.columns(6)
+        for i, (r, (key, _)) in enumerate(zip(chunk, items)):
+            with cols[i % 6]:
+                caption = r.get("filename") or r.get("key")
+                if key in thumbs:
+                    st.image(thumbs[key], caption=caption, use_container_width=True)
+                else:
+                    st.caption(f"{caption} (no preview)")
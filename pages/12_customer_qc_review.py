@@ -1,10 +1,27 @@
+import hashlib
+import os
+import time
+from dataclasses import replace
+
 import streamlit as st
 import pandas as pd
 
 from core.auth import require_role
 from core.config import settings
-from core.api_client import ApiClient
+from core.api_client import ApiClient, ApiError, AsyncApiClient, run_concurrently, unwrap
 from core import mock_backend
+from core.qc import QC_SORT_KEYS, QcQuery
+from core.qc_columnar import (
+    arrow_to_frame,
+    columnar_available,
+    filter_qc_frame,
+    get_qc_cache,
+    get_qc_memo,
+    query_qc_frame,
+    summarize_qc_frame,
+)
+from core.qc_export import EXPORT_FORMATS, export_formats, export_tempfile, frame_chunks, page_chunks, write_export
+from core.qc_jobs import QcJobPoller, job_status_fetcher
 from core.ui import header
 from core.ui_helpers import api_call
 
@@ -14,18 +31,24 @@ header("QC Review", "Duplicates + AI-generated: фильтры, сортиров
 def client() -> ApiClient:
     return ApiClient(settings.backend_url, token=st.session_state.get("token"))
 
+def aclient() -> AsyncApiClient:
+    return AsyncApiClient(settings.backend_url, token=st.session_state.get("token"))
+
 default_request_id = str(st.session_state.get("selected_request_id", "")).strip()
 request_id = st.text_input("Request ID", value=default_request_id).strip()
 if request_id:
     st.session_state["selected_request_id"] = request_id
 
+# cached QC data is per user (token) and request
+qc_cache_key = hashlib.sha256(f"{st.session_state.get('token') or ''}\n{request_id}".encode("utf-8")).hexdigest()
+
 c1, c2, c3, c4 = st.columns(4)
 with c1:
     dup_thr = st.slider("Duplicate threshold", 0.0, 1.0, 0.85, 0.01)
 with c2:
     ai_thr = st.slider("AI-generated threshold", 0.0, 1.0, 0.80, 0.01)
 with c3:
-    sort_by = st.selectbox("Sort by", ["duplicate_score", "ai_generated_score", "image_id"], index=0)
+    sort_by = st.selectbox("Sort by", list(QC_SORT_KEYS), index=0)
 with c4:
     sort_desc = st.checkbox("Sort desc", value=True)
 
@@ -37,90 +60,271 @@ with f2:
 with f3:
     only_ai = st.checkbox("Only AI-generated", value=False)
 with f4:
-    top_n = st.number_input("Top N (0 = all)", min_value=0, max_value=5000, value=200, step=50)
+    page_size = st.number_input("Page size", min_value=10, max_value=5000, value=settings.qc_page_size, step=50)
+
+g1, g2 = st.columns(2)
+with g1:
+    only_new = st.checkbox("Only new (last incremental QC)", value=False)
+with g2:
+    incremental = st.checkbox("Incremental QC (new uploads only)", value=True)
+
+def drop_qc_cache():
+    get_qc_memo().invalidate(qc_cache_key)
+    get_qc_cache().invalidate(qc_cache_key)
+
+def scored_image_ids():
+    """image_ids of the current QC results: from the cached columnar set, else walking all qc/results pages."""
+    known = get_qc_memo().peek(qc_cache_key) or get_qc_cache().get(qc_cache_key)
+    if known is not None:
+        return set(known[1]["image_id"].astype(str))
+    if settings.use_mock:
+        load = lambda q: mock_backend.mock_qc_results(request_id, q)
+    else:
+        load = lambda q: client().qc_results(request_id, q)
+    scored = set()
+    for chunk in page_chunks(load, QcQuery(sort_by="image_id", sort_desc=False)):
+        scored.update(chunk["image_id"].astype(str))
+    return scored
+
+def new_upload_keys():
+    """Upload keys without a QC row (image_id == upload key, see API_CONTRACT.md); None = run full QC."""
+    try:
+        scored = scored_image_ids()
+    except ApiError as e:
+        # no results yet / results endpoint not implemented
+        if e.status_code in (404, 405, 501):
+            return None
+        raise
+    if not scored:
+        return None
+    uploads = mock_backend.mock_list_uploads(request_id) if settings.use_mock else client().list_uploads(request_id)
+    return [u["key"] for u in uploads if u.get("key") and str(u["key"]) not in scored]
 
 if st.button("Run QC", type="primary", disabled=not request_id):
+    run = {"keys": None}
+
     def do_run_qc():
+        keys = run["keys"] = new_upload_keys() if incremental else None
+        if keys == []:
+            return {"status": "up_to_date"}
         if settings.use_mock:
-            return {"status": "mocked"}
-        return client().run_qc(request_id)
+            return mock_backend.mock_run_qc(request_id, keys=keys)
+        return client().run_qc(request_id, keys=keys)
 
     resp = api_call("Run QC", do_run_qc, spinner="Starting QC...", show_payload=True)
-    if resp is not None:
-        st.success("QC started (or mocked).")
+    if resp is not None and resp.get("status") == "up_to_date":
+        st.info("No new uploads since the last QC run.")
+    elif resp is not None:
+        if incremental and run["keys"] is None:
+            st.info("No previous QC results to compare uploads with: full QC run (all images are scored).")
+        drop_qc_cache()
+        job_id = resp.get("job_id")
+        if job_id:
+            prev = st.session_state.pop("qc_job", None)
+            if prev is not None:
+                prev.stop()
+            # the token is captured here: the poller thread has no Streamlit context / session_state
+            fetch_status = job_status_fetcher(request_id, str(job_id), st.session_state.get("token"))
+            st.session_state["qc_job"] = QcJobPoller(fetch_status, request_id=request_id, job_id=str(job_id))
+        else:
+            st.success("QC started.")
+
+# QC job in progress: status is polled in background, results load automatically when done
+poller = st.session_state.get("qc_job")
+if poller is not None and poller.request_id == request_id:
+    state = poller.state
+    bar = st.progress(0.0, text="QC queued...")
+    note = st.empty()
+    # one script run waits at most 30 s, then the page reruns (the poller keeps going in the background)
+    deadline = time.monotonic() + 30
+    while not state.done:
+        bar.progress(min(max(state.progress, 0.0), 1.0), text=f"QC {state.status}: {state.progress:.0%}")
+        if poller.last_error:
+            note.caption(f"Status check failed, retrying: {poller.last_error}")
+        else:
+            note.empty()
+        if time.monotonic() >= deadline:
+            st.rerun()
+        state = poller.wait(timeout_s=1.0)
+    st.session_state.pop("qc_job", None)
+    bar.empty()
+    note.empty()
+    if state.status == "done":
+        drop_qc_cache()
+        st.session_state["qc_loaded_request"] = request_id
+        st.success("QC finished.")
+    elif state.status == "failed":
+        st.error(f"QC failed: {state.error or 'unknown error'}")
+    else:
+        st.info("Backend does not report QC job status. Load results when QC is finished.")
 
 if st.button("Load QC results", disabled=not request_id):
-    def do_load():
-        if settings.use_mock:
-            return mock_backend.mock_qc_results(request_id)
-        return client().qc_results(request_id)
+    st.session_state["qc_loaded_request"] = request_id
 
-    rows = api_call("Load QC results", do_load, spinner="Loading QC results...", show_payload=True)
-    if rows is None:
-        st.stop()
+if not request_id or st.session_state.get("qc_loaded_request") != request_id:
+    st.stop()
 
-    df = pd.DataFrame(rows)
+# Filtering, sorting and paging are done by backend: only the visible page is transferred.
+base_query = QcQuery(
+    dup_thr=dup_thr,
+    ai_thr=ai_thr,
+    only_flagged=only_flagged,
+    only_duplicates=only_duplicates,
+    only_ai=only_ai,
+    only_new=only_new,
+    sort_by=sort_by,
+    sort_desc=sort_desc,
+    limit=int(page_size),
+)
+# cursors of the pages visited so far (for "Previous"); reset when the query changes
+if st.session_state.get("qc_query") != (request_id, base_query):
+    st.session_state["qc_query"] = (request_id, base_query)
+    st.session_state["qc_cursors"] = [None]
+cursors: list = st.session_state["qc_cursors"]
+query = replace(base_query, cursor=cursors[-1])
 
-    if df.empty:
-        st.info("No results.")
-        st.stop()
+# Columnar mode: full result set is fetched once per QC run (Arrow IPC, cached on disk) and kept
+# parsed in memory; thresholds/filters/sort/paging are then evaluated locally on the cached columns.
+def load_columnar():
+    memo = get_qc_memo()
+    fresh = memo.get(qc_cache_key)
+    if fresh is not None:
+        return fresh[1]
 
-    # Normalize expected columns
-    if "image_id" not in df.columns:
-        df["image_id"] = df.index.astype(str)
-    if "duplicate_score" not in df.columns:
-        df["duplicate_score"] = 0.0
-    if "ai_generated_score" not in df.columns:
-        df["ai_generated_score"] = 0.0
+    cache = get_qc_cache()
+    known = memo.peek(qc_cache_key) or cache.get(qc_cache_key)
+    if_run = known[0] if known else None
+    if settings.use_mock:
+        data = mock_backend.mock_qc_results_columnar(request_id, if_run=if_run)
+    else:
+        try:
+            data = client().qc_results_columnar(request_id, if_run=if_run)
+        except ApiError as e:
+            if e.status_code not in (404, 405, 406, 501):
+                raise
+            data = {}
+    if data is None and known:
+        memo.put(qc_cache_key, known[0], known[1])
+        return known[1]
+    if not isinstance(data, bytes):
+        # backend has no columnar format: page on backend from now on
+        st.session_state["qc_columnar_unsupported"] = True
+        return None
+    cache.put(qc_cache_key, data)
+    run_id, df = arrow_to_frame(data)
+    memo.put(qc_cache_key, run_id, df)
+    return df
 
-    df["is_duplicate"] = df["duplicate_score"] >= dup_thr
-    df["is_ai"] = df["ai_generated_score"] >= ai_thr
-    df["is_flagged"] = df["is_duplicate"] | df["is_ai"]
+frame = None
+if columnar_available() and not st.session_state.get("qc_columnar_unsupported"):
+    frame = api_call("Load QC results", load_columnar, spinner="Loading QC results...", show_payload=False)
 
-    total = len(df)
-    flagged = int(df["is_flagged"].sum())
-    dup_cnt = int(df["is_duplicate"].sum())
-    ai_cnt = int(df["is_ai"].sum())
+if frame is not None:
+    summary = summarize_qc_frame(frame, dup_thr, ai_thr)
+    page = query_qc_frame(frame, query)
+else:
+    # Summary and page are fetched concurrently.
+    prefetched: list = []
+    if not settings.use_mock:
+        ac = aclient()
+        with st.spinner("Loading QC results..."):
+            prefetched = run_concurrently(
+                ac.qc_summary(request_id, dup_thr, ai_thr), ac.qc_results(request_id, query), return_exceptions=True
+            )
 
-    m1, m2, m3, m4 = st.columns(4)
-    m1.metric("Total", total)
-    m2.metric("Flagged", flagged)
-    m3.metric("Duplicates", dup_cnt)
-    m4.metric("AI-generated", ai_cnt)
+    def do_summary():
+        if settings.use_mock:
+            return mock_backend.mock_qc_summary(request_id, dup_thr, ai_thr)
+        try:
+            return unwrap(prefetched[0])
+        except ApiError as e:
+            # backend not implemented yet: no aggregate counts
+            if e.status_code in (404, 405, 501):
+                return {}
+            raise
 
-    # Filters
-    out = df.copy()
+    def do_load():
+        if settings.use_mock:
+            return mock_backend.mock_qc_results(request_id, query)
+        return unwrap(prefetched[1])
 
-    if only_flagged:
-        out = out[out["is_flagged"]]
+    summary = api_call("Load QC summary", do_summary, show_payload=False)
+    page = api_call("Load QC results", do_load, spinner="Loading QC results...", show_payload=False)
+    if page is None:
+        st.stop()
 
-    if only_duplicates:
-        out = out[out["is_duplicate"]]
+if summary:
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Total", summary.get("total", 0))
+    m2.metric("Flagged", summary.get("flagged", 0))
+    m3.metric("Duplicates", summary.get("duplicates", 0))
+    m4.metric("AI-generated", summary.get("ai_generated", 0))
 
-    if only_ai:
-        out = out[out["is_ai"]]
+st.divider()
+st.subheader("QC Results")
 
-    # Sort
-    if sort_by in out.columns:
-        out = out.sort_values(by=sort_by, ascending=not sort_desc)
+out = page["items"] if isinstance(page["items"], pd.DataFrame) else pd.DataFrame(page["items"])
+if out.empty:
+    st.info("No results.")
+    st.stop()
 
-    # Top N
-    if top_n and top_n > 0:
-        out = out.head(int(top_n))
+page_no = len(cursors)
+matched = page.get("total")
+st.caption(f"Page {page_no}" + (f" · {matched} matching rows" if matched is not None else ""))
+st.dataframe(out, use_container_width=True)
 
-    st.divider()
-    st.subheader("QC Results")
+p1, p2, _ = st.columns([1, 1, 4])
+with p1:
+    if st.button("Previous page", disabled=page_no <= 1):
+        cursors.pop()
+        st.rerun()
+with p2:
+    if st.button("Next page", disabled=not page.get("next_cursor")):
+        cursors.append(page["next_cursor"])
+        st.rerun()
 
-    st.dataframe(out, use_container_width=True)
+st.divider()
+st.subheader("Export")
 
-    st.divider()
-    st.subheader("Export")
+# Full filtered set (not only the visible page), written chunk by chunk to a temp file on disk.
+export_fmt = st.selectbox("Format", export_formats(), format_func=lambda f: {"csv.gz": "CSV (gzip)"}.get(f, f.upper()))
+if st.button("Prepare export", key="qc_export"):
+    def do_export():
+        f = export_tempfile(export_fmt)
+        try:
+            with f:
+                if frame is not None:
+                    write_export(frame_chunks(filter_qc_frame(frame, base_query)), export_fmt, f)
+                elif settings.use_mock:
+                    write_export(page_chunks(lambda q: mock_backend.mock_qc_results(request_id, q), base_query), export_fmt, f)
+                else:
+                    try:
+                        # streamed from backend export endpoint
+                        client().qc_export(request_id, export_fmt, base_query, f)
+                    except ApiError as e:
+                        if e.status_code not in (404, 405, 501):
+                            raise
+                        # backend not implemented yet: walk the pages
+                        f.seek(0)
+                        f.truncate()
+                        write_export(page_chunks(lambda q: client().qc_results(request_id, q), base_query), export_fmt, f)
+        except Exception:
+            os.remove(f.name)
+            raise
+        return f.name
 
-    # Export current view to CSV
-    csv_bytes = out.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        "Download current view as CSV",
-        data=csv_bytes,
-        file_name=f"qc_results_{request_id}.csv",
-        mime="text/csv",
-    )
+    export_path = api_call("Export QC results", do_export, spinner="Preparing export...", show_payload=False)
+    if export_path is not None:
+        ext, mime = EXPORT_FORMATS[export_fmt]
+        try:
+            with open(export_path, "rb") as data:
+                # download_button reads the whole payload into Streamlit's in-memory media storage here
+                # (only building the file is bounded in memory), so the file can be closed and removed after it
+                st.download_button(
+                    f"Download {ext}",
+                    data=data,
+                    file_name=f"qc_results_{request_id}.{ext}",
+                    mime=mime,
+                )
+        finally:
+            os.remove(export_path)
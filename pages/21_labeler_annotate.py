@@ -1,9 +1,15 @@
+import hashlib
+
 import streamlit as st
 
 from core.auth import require_role
 from core.config import settings
-from core.api_client import ApiClient, ApiError
+from core.api_client import ApiClient, ApiError, AsyncApiClient, run_concurrently, unwrap
 from core import mock_backend
+from core.label_journal import get_label_journal
+from core.label_queue import LabelWriteBehind
+from core.prefetch import ImagePrefetcher
+from core.progress import ProgressTracker
 from core.ui import header
 from core.ui_helpers import api_call
 
@@ -17,6 +23,13 @@ def client() -> ApiClient:
         timeout_s=settings.request_timeout_s,
     )
 
+def aclient() -> AsyncApiClient:
+    return AsyncApiClient(
+        settings.backend_url,
+        token=st.session_state.get("token"),
+        timeout_s=settings.request_timeout_s,
+    )
+
 default_task_id = str(st.session_state.get("selected_task_id", "")).strip()
 task_id = st.text_input("Task ID", value=default_task_id, placeholder="Выберите задачу в My Tasks").strip()
 
@@ -28,8 +41,25 @@ else:
         st.switch_page("pages/20_labeler_tasks.py")
     st.stop()
 
+# Progress is tracked locally (core/progress.py); backend is asked only when a sync is due,
+# as a conditional request on the last seen version.
+tracker_key = f"progress_{task_id}"
+tracker = st.session_state.get(tracker_key)
+sync_progress = tracker is None or tracker.sync_due()
+if_version = tracker.version if tracker is not None else None
+
+# Task and progress are fetched concurrently (one round-trip of latency, not two).
+prefetched: list = []
+if not settings.use_mock:
+    ac = aclient()
+    calls = [ac.get_task(task_id)]
+    if sync_progress:
+        calls.append(ac.task_progress(task_id, if_version=if_version))
+    with st.spinner("Loading task..."):
+        prefetched = run_concurrently(*calls, return_exceptions=True)
+
 def do_get_task():
-    return mock_backend.mock_get_task(task_id) if settings.use_mock else client().get_task(task_id)
+    return mock_backend.mock_get_task(task_id) if settings.use_mock else unwrap(prefetched[0])
 
 task = api_call("Load task", do_get_task, spinner="Loading task...", show_payload=True)
 if not task:
@@ -45,26 +75,79 @@ if not images:
 classes = task.get("classes") or st.session_state.get("cached_classes") or ["pothole", "crosswalk", "traffic_light", "road_sign"]
 st.session_state["cached_classes"] = classes
 
+# ---- Labels: write-behind queue (saved locally at once, flushed in batches in background) ----
+def label_owner() -> str:
+    # journal entries are replayed only for the same user
+    username = st.session_state.get("username")
+    if username:
+        return str(username)
+    return hashlib.sha256(str(st.session_state.get("token") or "").encode("utf-8")).hexdigest()[:16]
+
+def make_label_sender(client_id: str):
+    # captured here: the flusher thread has no Streamlit context / session_state
+    token = st.session_state.get("token")
+
+    def send_batch(tid, items):
+        if settings.use_mock:
+            return mock_backend.mock_save_labels_batch(tid, items, client_id=client_id)
+        c = ApiClient(settings.backend_url, token=token, timeout_s=settings.request_timeout_s)
+        try:
+            return c.save_labels_batch(tid, items, client_id=client_id)
+        except ApiError as e:
+            # bulk endpoint not implemented yet: one request per image
+            if e.status_code in (404, 405, 501):
+                for it in items:
+                    c.save_labels(tid, it["image_id"], it["labels"])
+                return {"task_id": tid, "saved": len(items)}
+            raise
+
+    return send_batch
+
+label_queue = st.session_state.get("label_queue")
+if label_queue is None or st.session_state.get("label_queue_token") != st.session_state.get("token"):
+    if label_queue is not None:
+        label_queue.close()
+    # durable journal: unsent decisions of this user (e.g. before a crash/outage) are replayed in order
+    journal = get_label_journal()
+    owner = label_owner()
+    label_queue = LabelWriteBehind(make_label_sender(f"{journal.client_id}:{owner}"), journal=journal, owner=owner)
+    st.session_state["label_queue"] = label_queue
+    st.session_state["label_queue_token"] = st.session_state.get("token")
+
 # ---- Progress ----
-def do_progress():
-    if settings.use_mock:
-        return mock_backend.mock_task_progress(task_id)
+def progress_or_fallback(load):
     try:
-        return client().task_progress(task_id)
+        return load()
     except ApiError as e:
-        # backend not implemented yet: compute local fallback using images and no remote labels
+        # backend not implemented yet: progress stays local
         if e.status_code in (404, 405, 501):
-            return {"task_id": task_id, "total_images": len(images), "labeled_images": 0}
+            return None
         raise
 
-progress = api_call("Load progress", do_progress, spinner="Loading progress...", show_payload=False) or {}
-total_images = int(progress.get("total_images") or len(images))
-labeled_images = int(progress.get("labeled_images") or 0)
+def do_progress(if_version=None):
+    if settings.use_mock:
+        return mock_backend.mock_task_progress(task_id, if_version=if_version)
+    return progress_or_fallback(lambda: client().task_progress(task_id, if_version=if_version))
+
+def do_initial_progress():
+    if settings.use_mock:
+        return do_progress(if_version)
+    return progress_or_fallback(lambda: unwrap(prefetched[1]))
+
+if tracker is None:
+    tracker = ProgressTracker(task_id, images)
+    st.session_state[tracker_key] = tracker
+if sync_progress:
+    # None = not modified (or failed: api_call shows the error); counts stay local
+    tracker.reconcile(
+        api_call("Load progress", do_initial_progress, show_payload=False),
+        pending=label_queue.pending_count(task_id),
+    )
 
 m1, m2, m3 = st.columns(3)
-m1.metric("Total images", total_images)
-m2.metric("Labeled", labeled_images)
-m3.metric("Remaining", max(total_images - labeled_images, 0))
+m1.metric("Total images", tracker.total)
+m2.metric("Labeled", tracker.labeled)
+m3.metric("Remaining", tracker.remaining)
 
 # ---- Image index persisted ----
 idx_key = f"img_idx_{task_id}"
@@ -89,31 +172,46 @@ if not image_id:
 
 st.write(f"Image: **{image_id}**")
 
+# Next images are downloaded + downscaled in background; cache lives across reruns, reset on task change
+prefetcher = st.session_state.get("image_prefetcher")
+if prefetcher is None:
+    prefetcher = ImagePrefetcher()
+    st.session_state["image_prefetcher"] = prefetcher
+prefetcher.set_task(task_id)
+
 if img.get("url"):
-    st.image(img["url"], use_container_width=True)
+    # downscaled to PREVIEW_MAX_SIDE; fall back to the original URL
+    preview = prefetcher.get(img["url"])
+    st.image(preview if preview is not None else img["url"], use_container_width=True)
 else:
     st.info("Mock: нет URL. В проде backend должен отдавать ссылку на превью/объект в storage.")
 
+prefetcher.prefetch([im.get("url") for im in images[int(idx) + 1 : int(idx) + 1 + settings.prefetch_ahead]])
+
 labels_key = f"labels_{task_id}_{image_id}"
+if labels_key not in st.session_state:
+    local = label_queue.local_labels(task_id, image_id)
+    if local is None:
+        local = img.get("labels")
+    if local is not None:
+        st.session_state[labels_key] = [x for x in local if x in classes]
 selected = st.multiselect("Labels", options=classes, key=labels_key)
 
 auto_next = st.checkbox("Auto-next after Save", value=True)
 
-def do_save():
-    if settings.use_mock:
-        return mock_backend.mock_save_labels(task_id, image_id, list(selected))
-    return client().save_labels(task_id, image_id, list(selected))
-
 if st.button("Save labels", type="primary"):
-    resp = api_call("Save labels", do_save, spinner="Saving...", show_payload=True)
-    if resp is not None:
-        st.success("Saved.")
-        # refresh progress
-        api_call("Refresh progress", do_progress, spinner="Refreshing progress...", show_payload=False)
+    label_queue.put(task_id, image_id, list(selected))
+    tracker.record(image_id, list(selected))
+    st.success("Saved.")
+    if auto_next and int(idx) < len(images) - 1:
+        st.session_state[idx_key] = int(idx) + 1
+        st.rerun()
 
-        if auto_next and int(idx) < len(images) - 1:
-            st.session_state[idx_key] = int(idx) + 1
-            st.rerun()
+unsynced = label_queue.pending_count(task_id)
+if label_queue.last_error:
+    st.warning(f"Labels not synced yet ({unsynced} pending), retrying in background: {label_queue.last_error}")
+elif unsynced:
+    st.caption(f"Sync pending: {unsynced} image(s).")
 
 st.divider()
 
@@ -132,11 +230,21 @@ with c2:
         st.session_state[idx_key] = int(idx) + 1
         st.rerun()
 with c3:
-    finish_disabled = labeled_images < total_images
+    finish_disabled = tracker.labeled < tracker.total
     if st.button("Finish task", type="secondary", disabled=finish_disabled, key="finish_task"):
+        with st.spinner("Syncing labels..."):
+            synced = label_queue.flush()
+        if not synced:
+            st.error(f"Labels are not synced yet ({label_queue.pending_count(task_id)} pending). Try again.")
+            st.stop()
+        # confirm with backend before completing (unconditional request)
+        tracker.reconcile(api_call("Refresh progress", do_progress, spinner="Refreshing progress...", show_payload=False))
+        if tracker.labeled < tracker.total:
+            st.error(f"Backend reports {tracker.labeled} of {tracker.total} images labeled.")
+            st.stop()
         resp = api_call("Complete task", do_finish, spinner="Completing task...", show_payload=True)
         if resp is not None:
             st.success("Task completed.")
             st.switch_page("pages/20_labeler_tasks.py")
 
-st.caption("Finish task активируется, когда размечены все изображения (по progress).")
+st.caption("Finish task активируется, когда размечены все изображения (локальный progress, сверяется с backend).")
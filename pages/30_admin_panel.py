@@ -2,10 +2,11 @@ import streamlit as st
 
 from core.auth import require_role
 from core.config import settings
-from core.api_client import ApiClient, ApiError
+from core.api_client import ApiClient, ApiError, AsyncApiClient, run_concurrently, unwrap
 from core import mock_backend
 from core.ui import header
 from core.ui_helpers import api_call
+from core.admin_filters import apply_filters, make_select_labels
 
 require_role(["admin", "universal"])
 header("Admin Panel", "MVP: просмотр Requests/Tasks + быстрые переходы без ручного копирования ID.")
@@ -13,90 +14,47 @@ header("Admin Panel", "MVP: просмотр Requests/Tasks + быстрые п
 def client() -> ApiClient:
     return ApiClient(settings.backend_url, token=st.session_state.get("token"))
 
+def aclient() -> AsyncApiClient:
+    return AsyncApiClient(settings.backend_url, token=st.session_state.get("token"))
+
 # --------------------------
 # Data loaders (with fallback)
 # --------------------------
-def load_requests():
-    if settings.use_mock:
-        return mock_backend.mock_list_requests()
-
+async def fetch_requests(c: AsyncApiClient):
     try:
-        return client().admin_list_requests()
+        return await c.admin_list_requests()
     except ApiError as e:
         # If admin endpoints not implemented yet, fallback
         if e.status_code in (404, 405, 501):
-            return client().list_requests()
+            return await c.list_requests()
         raise
 
-def load_tasks():
-    if settings.use_mock:
-        return mock_backend.mock_list_tasks()
-
+async def fetch_tasks(c: AsyncApiClient):
     try:
-        return client().admin_list_tasks()
+        return await c.admin_list_tasks()
     except ApiError as e:
         if e.status_code in (404, 405, 501):
-            return client().list_tasks()
+            return await c.list_tasks()
         raise
 
+# Requests and tasks are fetched concurrently once per render; errors are kept
+# per call and surfaced by api_call in the matching tab.
+prefetched: list = []
+if not settings.use_mock:
+    ac = aclient()
+    with st.spinner("Loading requests and tasks..."):
+        prefetched = run_concurrently(fetch_requests(ac), fetch_tasks(ac), return_exceptions=True)
+
+def load_requests():
+    if settings.use_mock:
+        return mock_backend.mock_list_requests()
+    return unwrap(prefetched[0])
+
+def load_tasks():
+    if settings.use_mock:
+        return mock_backend.mock_list_tasks()
+    return unwrap(prefetched[1])
 
-# --------------------------
-# UI helpers
-# --------------------------
-def apply_filters(rows: list[dict], search: str, status_filter: list[str], id_key_candidates: list[str], title_key_candidates: list[str]) -> list[dict]:
-    s = (search or "").strip().lower()
-
-    def get_first(d: dict, keys: list[str]) -> str:
-        for k in keys:
-            v = d.get(k)
-            if v is not None and str(v).strip():
-                return str(v)
-        return ""
-
-    out = rows
-
-    if status_filter:
-        out = [r for r in out if str(r.get("status", "")).strip() in status_filter]
-
-    if s:
-        filtered = []
-        for r in out:
-            rid = get_first(r, id_key_candidates)
-            title = get_first(r, title_key_candidates)
-            blob = f"{rid} {title} {str(r.get('status',''))}".lower()
-            if s in blob:
-                filtered.append(r)
-        out = filtered
-
-    return out
-
-def make_select_labels(rows: list[dict], id_keys: list[str], title_keys: list[str]) -> tuple[list[str], dict[str, str]]:
-    labels: list[str] = []
-    label_to_id: dict[str, str] = {}
-
-    for r in rows:
-        rid = ""
-        for k in id_keys:
-            rid = str(r.get(k, "")).strip()
-            if rid:
-                break
-        if not rid:
-            continue
-
-        title = ""
-        for k in title_keys:
-            title = str(r.get(k, "")).strip()
-            if title:
-                break
-
-        status = str(r.get("status", "")).strip()
-        meta = " | ".join([x for x in [title, status] if x])
-        label = f"{rid} — {meta}" if meta else rid
-
-        labels.append(label)
-        label_to_id[label] = rid
-
-    return labels, label_to_id
 
 # --------------------------
 # Top metrics
@@ -192,13 +150,12 @@ with tabs[0]:
             if st.button("Assign task to labeler", type="secondary", disabled=not labeler_username, key="admin_assign_btn"):
                 def do_assign():
                     if settings.use_mock:
-                        # optional mock; if not implemented, return a stub
-                        return {"status": "mocked", "request_id": selected_request_id, "labeler_username": labeler_username}
+                        return mock_backend.mock_assign_task(selected_request_id, labeler_username)
                     return client().admin_assign_task(selected_request_id, labeler_username)
 
                 resp = api_call("Assign", do_assign, spinner="Assigning...", show_payload=True)
                 if resp is not None:
-                    st.success("Assign request to labeler: done (or mocked).")
+                    st.success("Assign request to labeler: done.")
 
 
 # ==========================
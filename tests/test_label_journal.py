@@ -0,0 +1,83 @@
+from core import mock_backend
+from core.label_journal import LabelJournal
+from core.label_queue import LabelWriteBehind
+
+
+class FakeSender:
+    # records every item sent; raises while `fail` is set
+    def __init__(self, fail: bool = False) -> None:
+        self.items: list[tuple[str, str, list[str], int]] = []
+        self.fail = fail
+
+    def __call__(self, task_id, items):
+        if self.fail:
+            raise ConnectionError("backend down")
+        self.items.extend((task_id, it["image_id"], it["labels"], it["seq"]) for it in items)
+        return {"saved": len(items)}
+
+
+def test_journal_ack_supersedes_older_entries():
+    journal = LabelJournal(":memory:")
+    s1 = journal.append("u1", "t1", "a", ["cat"])
+    s2 = journal.append("u1", "t1", "a", ["dog"])
+    s3 = journal.append("u1", "t1", "b", ["cat"])
+    journal.append("u2", "t1", "a", ["bird"])
+    assert s1 < s2 < s3
+
+    journal.mark_sent("u1", "t1", "a", s2)
+    assert [e["seq"] for e in journal.unsent("u1")] == [s3]
+    assert journal.latest("u1", "t1", "a") == ["dog"]
+    assert len(journal.unsent("u2")) == 1
+
+
+def test_unsent_entries_are_replayed_after_sender_failure():
+    journal = LabelJournal(":memory:")
+    down = FakeSender(fail=True)
+    q = LabelWriteBehind(down, journal=journal, owner="u1", batch_size=100, flush_interval_s=0.01)
+    q.put("t1", "a", ["cat"])
+    q.put("t1", "b", ["dog"])
+    q.put("t1", "a", ["bird"])
+    assert not q.flush(timeout_s=0.1)
+    q.close()
+    # the process "restarts": nothing was acknowledged, the journal still has every decision
+    unsent = [(e["image_id"], e["labels"]) for e in journal.unsent("u1")]
+    assert unsent == [("a", ["cat"]), ("b", ["dog"]), ("a", ["bird"])]
+
+    up = FakeSender()
+    q = LabelWriteBehind(up, journal=journal, owner="u1", batch_size=100, flush_interval_s=60)
+    assert q.local_labels("t1", "a") == ["bird"]
+    assert q.flush(timeout_s=2)
+    # replayed in seq order, only the latest decision per image
+    sent = [(t, image_id, labels) for t, image_id, labels, _ in up.items]
+    assert sent == [("t1", "b", ["dog"]), ("t1", "a", ["bird"])]
+    assert journal.unsent("u1") == []
+    q.close()
+
+
+def test_no_duplicate_sends_after_ack():
+    journal = LabelJournal(":memory:")
+    sender = FakeSender()
+    q = LabelWriteBehind(sender, journal=journal, owner="u1", batch_size=100, flush_interval_s=60)
+    q.put("t1", "a", ["cat"])
+    assert q.flush(timeout_s=2)
+    q.close()
+    assert len(sender.items) == 1
+
+    again = FakeSender()
+    q = LabelWriteBehind(again, journal=journal, owner="u1", batch_size=100, flush_interval_s=0.01)
+    assert q.flush(timeout_s=0.5)
+    assert again.items == []
+    q.close()
+
+
+def test_backend_ignores_replayed_seq():
+    tid = mock_backend.mock_list_tasks()[0]["id"]
+    items = [{"image_id": "img-1", "labels": ["cat"], "seq": 5}]
+    assert mock_backend.mock_save_labels_batch(tid, items, client_id="c1")["saved"] == 1
+
+    # the same item again (ack lost) and an older one: both ignored
+    older = {"image_id": "img-1", "labels": ["dog"], "seq": 4}
+    replay = mock_backend.mock_save_labels_batch(tid, items + [older], client_id="c1")
+    assert (replay["saved"], replay["duplicates"]) == (0, 2)
+    # another client has its own sequence
+    assert mock_backend.mock_save_labels_batch(tid, [{**older, "seq": 1}], client_id="c2")["saved"] == 1
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from core.label_queue import LabelWriteBehind
+
+
+class FakeSender:
+    # records every batch; raises while `fail` is set
+    def __init__(self) -> None:
+        self.batches: list[tuple[str, list[dict]]] = []
+        self.fail = False
+        self.sent = threading.Event()
+
+    def __call__(self, task_id, items):
+        if self.fail:
+            raise ConnectionError("backend down")
+        self.batches.append((task_id, [dict(it) for it in items]))
+        self.sent.set()
+        return {"saved": len(items)}
+
+    def items(self) -> list[tuple[str, str, list[str]]]:
+        return [(t, it["image_id"], it["labels"]) for t, batch in self.batches for it in batch]
+
+
+def test_flush_by_batch_size():
+    sender = FakeSender()
+    q = LabelWriteBehind(sender, batch_size=3, flush_interval_s=60)
+    q.put("t1", "a", ["cat"])
+    q.put("t1", "b", ["dog"])
+    time.sleep(0.1)
+    assert sender.batches == []
+
+    q.put("t1", "c", ["cat"])
+    assert sender.sent.wait(2)
+    assert sender.items() == [("t1", "a", ["cat"]), ("t1", "b", ["dog"]), ("t1", "c", ["cat"])]
+    q.close()
+
+
+def test_flush_by_interval():
+    sender = FakeSender()
+    q = LabelWriteBehind(sender, batch_size=100, flush_interval_s=0.05)
+    q.put("t1", "a", ["cat"])
+    assert sender.sent.wait(2)
+    assert sender.items() == [("t1", "a", ["cat"])]
+    assert q.flush(timeout_s=1)
+    assert q.pending_count() == 0
+    q.close()
+
+
+def test_edits_are_coalesced_and_batches_are_per_task():
+    sender = FakeSender()
+    q = LabelWriteBehind(sender, batch_size=100, flush_interval_s=60)
+    q.put("t1", "a", ["cat"])
+    q.put("t2", "x", ["dog"])
+    q.put("t1", "a", ["dog"])
+    assert q.pending_count() == 2
+    assert q.local_labels("t1", "a") == ["dog"]
+
+    assert q.flush(timeout_s=2)
+    assert sorted(sender.items()) == [("t1", "a", ["dog"]), ("t2", "x", ["dog"])]
+    # one bulk request per task
+    assert sorted(t for t, _ in sender.batches) == ["t1", "t2"]
+    assert q.local_labels("t1", "a") == ["dog"]
+    q.close()
+
+
+def test_failed_batch_stays_queued_and_is_retried():
+    sender = FakeSender()
+    sender.fail = True
+    q = LabelWriteBehind(sender, batch_size=100, flush_interval_s=0.01)
+    q.put("t1", "a", ["cat"])
+    assert not q.flush(timeout_s=0.2)
+    assert q.pending_count() == 1
+    assert q.last_error == "backend down"
+
+    sender.fail = False
+    assert q.flush(timeout_s=5)
+    assert sender.items() == [("t1", "a", ["cat"])]
+    assert q.last_error is None
+    q.close()
@@ -0,0 +1,51 @@
+import io
+
+from PIL import Image
+
+from core import mock_backend
+
+
+def png(seed: int) -> bytes:
+    # a different gradient pattern per seed: different content and perceptual hash
+    img = Image.new("L", (64, 64))
+    img.putdata([((x * (seed + 1) + y * (7 - seed)) * 13) % 256 for y in range(64) for x in range(64)])
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+def finish_qc(rid: str, keys=None) -> dict:
+    job = mock_backend.mock_run_qc(rid, keys=keys)
+    # the mock job "runs" for MOCK_QC_JOB_S: pretend it started long ago
+    mock_backend._qc_jobs[job["job_id"]]["started"] -= 3600
+    return mock_backend.mock_qc_job(rid, job["job_id"])
+
+
+def test_same_filename_in_two_upload_waves():
+    rid = mock_backend.mock_create_request("dup names", "", [])["id"]
+    mock_backend.mock_upload_files_mvp(rid, [("IMG_0001.jpg", png(1), "image/png")])
+    assert finish_qc(rid)["status"] == "done"
+
+    # second wave: same name, different bytes
+    resp = mock_backend.mock_upload_files_mvp(rid, [("IMG_0001.jpg", png(2), "image/png")])
+    assert resp["uploaded"] == 1
+    keys = [u["key"] for u in mock_backend.mock_list_uploads(rid)]
+    assert len(set(keys)) == 2
+
+    # incremental run scores the new object, a full run re-scores both
+    assert finish_qc(rid, keys=[keys[1]])["status"] == "done"
+    assert {r["image_id"] for r in mock_backend.mock_qc_results(rid)["items"]} == set(keys)
+    assert finish_qc(rid)["status"] == "done"
+    assert mock_backend.mock_qc_summary(rid, 0.85, 0.8)["total"] == 2
+    assert {r["image_id"] for r in mock_backend.mock_qc_results(rid)["items"]} == set(keys)
+
+
+def test_presigned_same_filename_gets_distinct_keys():
+    rid = mock_backend.mock_create_request("dup names presigned", "", [])["id"]
+    files = [
+        {"filename": "IMG_0001.jpg", "content_type": "image/png", "size_bytes": 10, "content_hash": "a" * 64},
+        {"filename": "IMG_0001.jpg", "content_type": "image/png", "size_bytes": 10, "content_hash": "b" * 64},
+        {"filename": "IMG_0001.jpg", "content_type": "image/png", "size_bytes": 10},
+    ]
+    uploads = mock_backend.mock_presign_uploads(rid, files)["uploads"]
+    assert len({u["key"] for u in uploads}) == 3
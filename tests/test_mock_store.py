@@ -0,0 +1,94 @@
+import random
+import threading
+
+from core import mock_backend
+from core.mock_store import MockStore
+
+
+def run_threads(n: int, target) -> None:
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def ids(rows) -> set[str]:
+    return {str(r["id"]) for r in rows}
+
+
+def test_indexes_match_full_scan_after_concurrent_updates():
+    store = MockStore()
+    for i in range(20):
+        store.add_request({"id": f"r{i}", "status": "new"})
+    for i in range(50):
+        store.add_task({"id": f"t{i}", "request_id": f"r{i % 20}", "assignee": None, "status": "open"})
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for n in range(500):
+            op = rng.random()
+            if op < 0.5:
+                # ids t50..t59 do not exist: updates of unknown tasks must not touch the indexes
+                assignee = rng.choice(["u1", "u2", "u3", None])
+                store.update_task(f"t{rng.randrange(60)}", assignee=assignee, status="assigned")
+            elif op < 0.7:
+                store.update_task(f"t{rng.randrange(50)}", request_id=f"r{rng.randrange(20)}")
+            elif op < 0.8:
+                store.add_task({"id": f"t{seed}-{n}", "request_id": f"r{rng.randrange(20)}", "assignee": "u1"})
+            else:
+                store.update_request(f"r{rng.randrange(20)}", status=rng.choice(["new", "in_progress", "done"]))
+
+    run_threads(8, worker)
+
+    tasks = store.list_tasks()
+    assert len(tasks) == len(ids(tasks))
+    for assignee in ("u1", "u2", "u3"):
+        assert ids(store.list_tasks(assignee=assignee)) == {t["id"] for t in tasks if t.get("assignee") == assignee}
+    for i in range(20):
+        rid = f"r{i}"
+        assert ids(store.list_tasks(request_id=rid)) == {t["id"] for t in tasks if t.get("request_id") == rid}
+        assert ids(store.list_tasks(assignee="u1", request_id=rid)) == {
+            t["id"] for t in tasks if t.get("assignee") == "u1" and t.get("request_id") == rid
+        }
+    requests = store.list_requests()
+    for status in ("new", "in_progress", "done"):
+        assert ids(store.list_requests(status)) == {r["id"] for r in requests if r.get("status") == status}
+    # lookups return the current record, not a stale one
+    for t in tasks:
+        assert store.get_task(t["id"]) is t
+
+
+def test_mock_backend_assign_complete_label_concurrently():
+    request_ids = [mock_backend.mock_create_request(f"store test {i}", "", ["cat", "dog"])["id"] for i in range(4)]
+    users = ["labeler1", "universal1"]
+    lock = threading.Lock()
+    labeled_tasks: set[str] = set()
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for n in range(60):
+            rid = rng.choice(request_ids)
+            task_id = mock_backend.mock_assign_task(rid, rng.choice(users))["task_id"]
+            if rng.random() < 0.3:
+                mock_backend.mock_complete_task(task_id)
+            else:
+                image_id = rng.choice(mock_backend.mock_get_task(task_id)["images"])["image_id"]
+                labels = rng.choice([["cat"], ["dog"], []])
+                mock_backend.mock_save_labels_batch(task_id, [{"image_id": image_id, "labels": labels}])
+                with lock:
+                    labeled_tasks.add(task_id)
+
+    run_threads(6, worker)
+
+    tasks = mock_backend.mock_list_tasks()
+    for user in users:
+        assert ids(mock_backend.mock_list_tasks(assignee=user)) == {t["id"] for t in tasks if t.get("assignee") == user}
+    for rid in request_ids:
+        expected = {t["id"] for t in tasks if t.get("request_id") == rid}
+        assert ids(mock_backend.mock_list_tasks(request_id=rid)) == expected
+    # progress counters vs the labels themselves
+    for task_id in labeled_tasks:
+        images = mock_backend.mock_get_task(task_id)["images"]
+        progress = mock_backend.mock_task_progress(task_id)
+        assert progress["labeled_images"] == sum(1 for im in images if im["labels"])
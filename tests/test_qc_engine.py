@@ -0,0 +1,80 @@
+import random
+
+from core.qc_engine import HASH_BITS, HammingIndex, duplicate_score
+
+
+def flip(h: int, bits: list[int]) -> int:
+    for b in bits:
+        h ^= 1 << b
+    return h
+
+
+def brute_nearest(items: dict[str, int], key: str, radius: int):
+    best = None
+    for other, h in items.items():
+        if other == key:
+            continue
+        d = (items[key] ^ h).bit_count()
+        if d <= radius and (best is None or d < best[1]):
+            best = (other, d)
+    return best
+
+
+def test_query_finds_neighbours_within_radius():
+    index = HammingIndex(radius=4)
+    base = 0x0123456789ABCDEF
+    index.add_many([("same", base), ("near", flip(base, [0, 17, 40])), ("far", flip(base, list(range(10))))])
+
+    assert index.query(base) == [("same", 0), ("near", 3)]
+    assert index.nearest("same") == ("near", 3)
+    assert index.nearest("far") == (None, None)
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(7)
+    for radius in (3, 8):
+        index = HammingIndex(radius=radius)
+        items: dict[str, int] = {}
+        for i in range(300):
+            if items and rng.random() < 0.5:
+                # near-duplicate of an earlier item
+                h = flip(rng.choice(list(items.values())), rng.sample(range(HASH_BITS), rng.randint(0, radius + 2)))
+            else:
+                h = rng.getrandbits(HASH_BITS)
+            items[f"k{i}"] = h
+            index.add(f"k{i}", h)
+
+        for key in items:
+            expected = brute_nearest(items, key, radius)
+            got = index.nearest(key)
+            if expected is None:
+                assert got == (None, None)
+            else:
+                # ties may pick another key at the same distance
+                assert got[1] == expected[1]
+                assert (items[key] ^ items[got[0]]).bit_count() == expected[1]
+
+
+def test_add_reports_older_items_whose_neighbour_changed():
+    index = HammingIndex(radius=4)
+    base = 0xFFFF0000FFFF0000
+    index.add("a", base)
+    index.add("b", flip(base, [1, 2, 3]))
+    assert sorted(index.add("c", flip(base, [1]))) == ["a", "b"]
+    assert index.nearest("a") == ("c", 1)
+    assert index.nearest("b") == ("c", 2)
+
+
+def test_repeated_key_is_skipped():
+    index = HammingIndex(radius=4)
+    index.add("a", 0)
+    index.add("b", 1)
+    assert index.add("a", 2**63) == []
+    assert len(index) == 2
+    assert index.query(0) == [("a", 0), ("b", 1)]
+
+
+def test_duplicate_score():
+    assert duplicate_score(None) == 0.0
+    assert duplicate_score(0) == 1.0
+    assert duplicate_score(HASH_BITS // 2) == 0.0
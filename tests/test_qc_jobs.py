@@ -0,0 +1,66 @@
+import time
+
+from core.qc_jobs import QcJobPoller
+
+
+def wait_done(poller: QcJobPoller, timeout_s: float = 5.0):
+    deadline = time.monotonic() + timeout_s
+    state = poller.state
+    while not state.done and time.monotonic() < deadline:
+        state = poller.wait(timeout_s=0.1)
+    return state
+
+
+def test_done_after_status_reports_done():
+    statuses = iter([{"status": "running", "progress": 0.5}, {"status": "done", "progress": 1.0, "run_id": "7"}])
+    poller = QcJobPoller(lambda: next(statuses), request_id="r1", job_id="j1", interval_s=0.01, max_interval_s=0.02)
+    state = wait_done(poller)
+    assert (state.status, state.progress, state.run_id) == ("done", 1.0, "7")
+
+
+def test_failed_after_consecutive_status_errors():
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        raise ConnectionError("backend down")
+
+    poller = QcJobPoller(fetch, request_id="r1", job_id="j1", interval_s=0.001, max_interval_s=0.005, max_failures=3)
+    state = wait_done(poller)
+    assert state.status == "failed"
+    assert "3 times" in state.error and "backend down" in state.error
+    assert len(calls) == 3
+
+
+def test_error_streak_resets_on_success():
+    results = iter([ConnectionError("x"), ConnectionError("x"), {"status": "running"}, ConnectionError("x"), {"status": "done"}])
+
+    def fetch():
+        r = next(results)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    poller = QcJobPoller(fetch, request_id="r1", job_id="j1", interval_s=0.001, max_interval_s=0.005, max_failures=3)
+    assert wait_done(poller).status == "done"
+
+
+def test_failed_after_timeout():
+    poller = QcJobPoller(
+        lambda: {"status": "running", "progress": 0.1}, request_id="r1", job_id="j1", interval_s=0.01, timeout_s=0.1
+    )
+    state = wait_done(poller)
+    assert state.status == "failed"
+    assert "last status: running" in state.error
+
+
+def test_poll_delay_never_exceeds_max_interval(monkeypatch):
+    delays = []
+    poller = QcJobPoller(
+        lambda: {"status": "running"}, request_id="r1", job_id="j1", interval_s=0.01, max_interval_s=0.02, timeout_s=0.3
+    )
+    # the first wait already happened; check the rest through the stop event
+    real_wait = poller._stopped.wait
+    monkeypatch.setattr(poller._stopped, "wait", lambda timeout=None: delays.append(timeout) or real_wait(timeout))
+    wait_done(poller)
+    assert delays and max(delays) <= 0.02
@@ -0,0 +1,198 @@
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.upload_journal import UploadJournal
+from core.uploads import (
+    PutJob,
+    PutResult,
+    dedupe_files,
+    hash_files,
+    iter_chunks,
+    put_presigned,
+    unique_names,
+    upload_presigned,
+)
+
+
+class FakeUpload(io.BytesIO):
+    # what st.file_uploader returns: a BytesIO with name/type
+    def __init__(self, name: str, data: bytes, type: str = "image/jpeg") -> None:
+        super().__init__(data)
+        self.name = name
+        self.type = type
+
+
+def fake_presign(payload):
+    # storage key by content, as a backend would assign it
+    return {
+        "uploads": [
+            {"filename": p["filename"], "url": f"https://storage/{p['filename']}", "method": "PUT", "key": p["content_hash"]}
+            for p in payload
+        ]
+    }
+
+
+def fake_put(stored):
+    def put(jobs, *, on_progress=None, on_result=None, **_):
+        results = []
+        for j in jobs:
+            stored[j.key] = b"".join(j.open_content())
+            r = PutResult(j.filename, j.key, etag=f"etag-{j.key}")
+            if on_result:
+                on_result(r)
+            results.append(r)
+        return results
+
+    return put
+
+
+def test_same_name_different_bytes_are_both_kept():
+    a = FakeUpload("IMG_0001.jpg", b"first camera")
+    b = FakeUpload("IMG_0001.jpg", b"second camera")
+    hashes = hash_files([a, b])
+    assert hashes[id(a)] != hashes[id(b)]
+
+    keep, skipped = dedupe_files([a, b], hashes, set())
+    assert keep == [a, b]
+    assert skipped == []
+
+
+def test_same_content_is_skipped_regardless_of_name():
+    a = FakeUpload("a.jpg", b"same")
+    b = FakeUpload("b.jpg", b"same")
+    c = FakeUpload("c.jpg", b"other")
+    hashes = hash_files([a, b, c])
+
+    keep, skipped = dedupe_files([a, b, c], hashes, {hashes[id(c)]})
+    assert keep == [a]
+    assert skipped == [
+        {"filename": "b.jpg", "reason": "duplicate of a.jpg"},
+        {"filename": "c.jpg", "reason": "already uploaded"},
+    ]
+
+
+def test_unique_names():
+    files = [FakeUpload(n, b"") for n in ("x.jpg", "x.jpg", "x (2).jpg", "x.jpg", "y")]
+    assert unique_names(files) == ["x.jpg", "x (3).jpg", "x (2).jpg", "x (4).jpg", "y"]
+
+
+def test_upload_presigned_same_name_different_bytes():
+    a = FakeUpload("IMG_0001.jpg", b"first camera")
+    b = FakeUpload("IMG_0001.jpg", b"second camera")
+    hashes = hash_files([a, b])
+    stored: dict[str, bytes] = {}
+    completed = []
+    journal = UploadJournal(":memory:")
+
+    resp = upload_presigned(
+        [a, b],
+        request_id="r1",
+        presign=fake_presign,
+        complete=lambda report: completed.extend(report) or {"ok": True},
+        put=fake_put(stored),
+        journal=journal,
+        hashes=hashes,
+    )
+
+    assert resp["uploaded"] == 2
+    assert stored == {hashes[id(a)]: b"first camera", hashes[id(b)]: b"second camera"}
+    assert [(u["filename"], u["content_hash"]) for u in completed] == [
+        ("IMG_0001.jpg", hashes[id(a)]),
+        ("IMG_0001 (2).jpg", hashes[id(b)]),
+    ]
+    assert journal.get("r1", hashes[id(a)])["status"] == "completed"
+    assert journal.get("r1", hashes[id(b)])["status"] == "completed"
+
+    # re-selecting the same files: both are known by content, nothing is sent again
+    again = upload_presigned(
+        [a, b],
+        request_id="r1",
+        presign=fake_presign,
+        complete=lambda report: {"ok": True},
+        put=fake_put(stored),
+        journal=journal,
+        hashes=hashes,
+    )
+    assert again["already_completed"] == ["IMG_0001.jpg", "IMG_0001 (2).jpg"]
+    assert again["uploaded"] == 0
+
+
+def test_resume_stored_file_under_current_name():
+    a = FakeUpload("IMG_0001.jpg", b"first camera")
+    b = FakeUpload("IMG_0001.jpg", b"second camera")
+    hashes = hash_files([a, b])
+    journal = UploadJournal(":memory:")
+    # b reached storage in an earlier run where it was selected second ("IMG_0001 (2).jpg")
+    journal.start("r1", hashes[id(b)], "IMG_0001 (2).jpg", hashes[id(b)], None)
+    journal.mark_stored("r1", hashes[id(b)], "etag-b")
+    stored: dict[str, bytes] = {hashes[id(b)]: b"second camera"}
+    completed = []
+
+    resp = upload_presigned(
+        [b, a],
+        request_id="r1",
+        presign=fake_presign,
+        complete=lambda report: completed.extend(report) or {"ok": True},
+        put=fake_put(stored),
+        journal=journal,
+        hashes=hashes,
+    )
+
+    assert resp["uploaded"] == 2
+    assert resp["resumed"] == 1
+    assert stored == {hashes[id(b)]: b"second camera", hashes[id(a)]: b"first camera"}
+    by_hash = {u["content_hash"]: u for u in completed}
+    assert by_hash[hashes[id(b)]] == {
+        "filename": "IMG_0001.jpg", "key": hashes[id(b)], "etag": "etag-b", "content_hash": hashes[id(b)]
+    }
+    assert by_hash[hashes[id(a)]]["filename"] == "IMG_0001 (2).jpg"
+
+
+class FlakyStorage(BaseHTTPRequestHandler):
+    # answers `fail` with 503 before accepting a PUT; bodies of all attempts are recorded
+    fail = 0
+    bodies: list[bytes] = []
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).bodies.append(body)
+        if len(self.bodies) <= self.fail:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", '"ok"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def put_to_flaky_storage(fail: int, retries: int) -> tuple[PutResult, list[bytes]]:
+    FlakyStorage.fail, FlakyStorage.bodies = fail, []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyStorage)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        f = FakeUpload("a.jpg", b"x" * 100_000)
+        url = "http://%s:%s/a.jpg" % server.server_address[:2]
+        job = PutJob("a.jpg", "a.jpg", url, open_content=lambda: iter_chunks(f, 4096), headers={"Content-Length": "100000"})
+        [result] = put_presigned([job], retries=retries, backoff_s=0.01)
+        return result, FlakyStorage.bodies
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_put_presigned_retries_with_fresh_content():
+    result, bodies = put_to_flaky_storage(fail=2, retries=2)
+    assert result.ok and result.etag == '"ok"'
+    assert bodies == [b"x" * 100_000] * 3
+
+
+def test_put_presigned_gives_up_after_retries():
+    result, bodies = put_to_flaky_storage(fail=5, retries=1)
+    assert result.error.startswith("503")
+    assert len(bodies) == 2